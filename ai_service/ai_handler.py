@@ -1,12 +1,118 @@
-from typing import Dict, Any
+import contextvars
+import json
+import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from ai_model import AIModel
+from backend_client import shared_gets
+from config import BATCH_CONCURRENCY, BATCH_MAX_ITEMS, STREAM_CONCURRENCY
+from turn_context import TurnContext, turn_scope
 
 class AIHandler:
-    def __init__(self):
-        self.model = AIModel()
+    def __init__(self, model: Optional[AIModel] = None):
+        self.logger = logging.getLogger(__name__)
+        self.model = model or AIModel()
+        # Sessions of a /chat/batch request are processed on this pool
+        self._batch_pool = ThreadPoolExecutor(max_workers=BATCH_CONCURRENCY, thread_name_prefix='chat-batch')
+        # Streamed turns run here while the request thread relays their events
+        self._stream_pool = ThreadPoolExecutor(max_workers=STREAM_CONCURRENCY, thread_name_prefix='chat-stream')
 
-    def process_text(self, text: str, session_id: str = "default", token: str = "") -> Dict[str, Any]:
+    def process_text(self, text: str, session_id: str = "default", token: str = "",
+                     page_size: Optional[int] = None, cursor: Optional[str] = None,
+                     profile: bool = False) -> Dict[str, Any]:
         """
         Process user input text using the AI model with session context.
+        `page_size` and `cursor` page through slot listings; `profile` adds a timing breakdown.
         """
-        return self.model.get_ai_response(session_id, text, token)
+        return self.model.get_ai_response(session_id, text, token, page_size, cursor, profile)
+
+    async def process_text_async(self, text: str, session_id: str = "default", token: str = "",
+                                 page_size: Optional[int] = None, cursor: Optional[str] = None,
+                                 profile: bool = False) -> Dict[str, Any]:
+        """process_text on the event loop, for the async execution mode."""
+        return await self.model.get_ai_response_async(session_id, text, token, page_size, cursor, profile)
+
+    def process_batch(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Process a list of {session_id, text, token, page_size, cursor} items.
+        Different sessions run in parallel, items of one session run in order.
+        Station lists are fetched once for the whole batch (see RequestMemo).
+        Results are returned in the order of the items.
+        """
+        if len(items) > BATCH_MAX_ITEMS:
+            return {'status': 'error', 'message': f"Batch too large: {len(items)} items (max {BATCH_MAX_ITEMS})"}
+
+        by_session: Dict[str, List[int]] = {}
+        for index, item in enumerate(items):
+            by_session.setdefault(item.get('session_id') or "default", []).append(index)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+
+        def process_session(indices: List[int]):
+            for index in indices:
+                item = items[index]
+                try:
+                    results[index] = self.process_text(item['text'], item.get('session_id') or "default",
+                                                       item.get('token', ""), item.get('page_size'),
+                                                       item.get('cursor'))
+                except Exception as e:
+                    self.logger.error(f"Batch item {index} failed: {e}")
+                    results[index] = {'status': 'error', 'message': f"Failed to process item: {str(e)}"}
+
+        with shared_gets() as memo:
+            futures = [self._batch_pool.submit(contextvars.copy_context().run, process_session, indices)
+                       for indices in by_session.values()]
+            for future in futures:
+                future.result()
+
+        return {
+            'status': 'success',
+            'results': results,
+            'sessions': len(by_session),
+            'backend_requests': memo.sent,
+            'deduplicated_requests': memo.reused,
+        }
+
+    def stream_text(self, text: str, session_id: str = "default", token: str = "",
+                    page_size: Optional[int] = None, cursor: Optional[str] = None,
+                    profile: bool = False) -> Iterator[Tuple[str, str]]:
+        """
+        Process user input like process_text, yielding (event, JSON payload) pairs as the turn progresses:
+        - intent: intent, response text, entities, action and screen, before backend data is fetched
+        - slots: one batch of slots per station, as each station's fetch completes (or all at once),
+          at most a page of them with the station's free slot count as `total`
+        - followup: the follow-up question appended to the response
+        - done: the complete result, the same as process_text returns
+        """
+        events: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+        # Payloads are serialized when emitted, so later changes to the turn's objects don't leak in
+        turn = TurnContext(sink=lambda event, data: events.put((event, json.dumps(data, default=str))))
+
+        def run():
+            with turn_scope(turn):
+                try:
+                    result = self.process_text(text, session_id, token, page_size, cursor, profile)
+                except Exception as e:
+                    self.logger.error(f"Streamed turn failed: {e}")
+                    result = {'status': 'error', 'message': f"Failed to process text: {str(e)}"}
+            events.put(('done', result))
+
+        self._stream_pool.submit(contextvars.copy_context().run, run)
+
+        sent = set()
+        while True:
+            event, payload = events.get()
+            if event != 'done':
+                sent.add(event)
+                yield event, payload
+                continue
+            result = payload
+            # Turns answered without reaching the backend still get the intent and slot events
+            if 'intent' not in sent and 'intent' in result:
+                yield 'intent', json.dumps({'intent': result['intent'], 'response': result.get('response'),
+                                            'entities': result.get('entities', {}), 'action': result.get('action'),
+                                            'screen': result.get('screen')}, default=str)
+            if 'slots' not in sent and result.get('screen') == 'slots' and result.get('data'):
+                yield 'slots', json.dumps({'stationId': None, 'stationName': None, 'slots': result['data']}, default=str)
+            yield 'done', json.dumps(result, default=str)
+            return
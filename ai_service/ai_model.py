@@ -1,16 +1,31 @@
 
 
-import re
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from intents import INTENTS, ENTITY_RULES, RESPONSE_TEMPLATES, CITY_CORRECTIONS
-from typing import Dict, List, Any
+from intents import INTENTS, RESPONSE_TEMPLATES
+from typing import Dict, Generator, List, Any, Optional, Tuple
 import requests
-from config import BACKEND_URL
+from backend_client import BackendClient, get_backend_client
+from config import (BACKEND_URL, BACKEND_FANOUT_CONCURRENCY, TYPING_DELAY_MS, TOKENIZER,
+                    TURN_DEADLINE_SECONDS)
+from text_utils import STOP_WORDS, tokenize_words
+from station_directory import StationDirectory
+from slot_index import SlotIndex, SlotRecord
+from slot_cache import StationSlotCache
+from occupancy import OccupancyMap
+from session_store import SessionBackend, SessionLoadError, create_session_backend
+from intent_scorer import IntentScorer
+from entity_extractor import EntityExtractor
+from nlu_cache import NLUCache, NLUResult
+from turn_context import TurnContext, current_turn, turn_scope, emit, mark_branch, degrade, time_left
+from slot_listing import SlotListing, clamp_page_size
+from metrics import TURN_SECONDS, INTENT_TURNS, FALLBACKS, CLARIFICATIONS
+from profiling import ProfileSampler, TurnProfile, stage, timed_stage
+import asyncio
+import functools
 import logging
-import time
 import random
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
+import contextvars
 from datetime import datetime
 
 class SessionContext:
@@ -43,24 +58,63 @@ class SessionContext:
         """Clear all context."""
         self.context = {}
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable state for shared session backends."""
+        return {'c': self.context, 'h': self.history}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SessionContext':
+        """Rebuild a session from to_dict() output."""
+        session = cls()
+        session.context = data.get('c', {})
+        session.history = data.get('h', [])
+        return session
+
 class AIModel:
-    def __init__(self):
+    # Utterances that ask for the next page of the current slot listing
+    NEXT_PAGE_PHRASES = {'more', 'show more', 'more slots', 'show more slots', 'next', 'next page'}
+
+    def __init__(self, backend: Optional[BackendClient] = None, session_backend: Optional[SessionBackend] = None,
+                 async_backend=None):
         # Set up logging first
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
-        try:
-            nltk.download('punkt', quiet=True)
-        except Exception as e:
-            self.logger.warning(f"NLTK punkt download failed (may already exist): {e}")
-        try:
-            nltk.download('stopwords', quiet=True)
-        except Exception as e:
-            self.logger.warning(f"NLTK stopwords download failed (may already exist): {e}")
-        self.stop_words = set(stopwords.words('english'))
-        self.sessions: Dict[str, SessionContext] = {}  # session_id -> SessionContext
+        # Pooled, timeout-aware client shared by all backend proxy calls
+        self.backend = backend or get_backend_client()
+        # AsyncBackendClient for turns answered on the event loop, created on first use
+        self._async_backend = async_backend
+        # Bounded worker pool for per-station slot fetches
+        self._fanout_pool = ThreadPoolExecutor(max_workers=BACKEND_FANOUT_CONCURRENCY,
+                                               thread_name_prefix='station-fanout')
+        # Seconds a turn may take before it is answered with the data fetched so far (0: no limit)
+        self.turn_deadline = TURN_DEADLINE_SECONDS
+        # Cached station list with name/ID indexes
+        self.station_directory = StationDirectory(self.backend)
+        # slotId -> slot summary, fed by per-station slot fetches
+        self.slot_index = SlotIndex()
+        # Short-TTL slot list per station, dropped when one of its slots is booked
+        self.slot_cache = StationSlotCache()
+        # Slot occupancy pushed by the IoT sensors
+        self.occupancy = OccupancyMap()
+        # Bundled stopwords and tokenizer; NLTK is only imported when configured
+        self.stop_words = STOP_WORDS
+        self._tokenize = tokenize_words
+        if TOKENIZER == 'nltk':
+            self._load_nltk()
+        # Keyword table compiled once into an inverted token index
+        self.intent_scorer = IntentScorer(INTENTS)
+        # Entity rules compiled once, scanned in a single pass per utterance
+        self.entity_extractor = EntityExtractor()
+        # Tokens, entities and raw intent scores of recent utterances
+        self.nlu_cache = NLUCache()
+        # Sampled cProfile dumps of get_ai_response (PROFILE_SAMPLE_RATE)
+        self.profile_sampler = ProfileSampler()
+        # Sessions are loaded from / saved to this backend around every turn
+        self.session_backend = session_backend or create_session_backend(SessionContext)
+        self.sessions = self.session_backend.store  # session_id -> SessionContext, bounded with LRU/idle eviction
 
         # Human-like behavior settings
-        self.thinking_delay = 0.3  # seconds to simulate thinking - reduced for better flow
+        self.typing_delay_ms = TYPING_DELAY_MS  # simulated thinking, applied by the client
         self.personality_responses = {
             'greetings': [
                 "Hello! I'm your parking assistant in Bangalore. How can I help you find the perfect spot today?",
@@ -105,11 +159,12 @@ class AIModel:
             ]
         }
 
-    def _simulate_thinking(self) -> None:
+    def _typing_delay_hint(self) -> int:
         """
-        Simulate human-like thinking delay.
+        Human-like thinking delay for the client to show as a typing indicator.
+        Never slept on the server, so request threads stay free.
         """
-        time.sleep(self.thinking_delay)
+        return self.typing_delay_ms
 
     def _get_personality_response(self, response_type: str) -> str:
         """
@@ -217,8 +272,7 @@ class AIModel:
         """
         Handle natural references like 'the first one', 'that slot', etc.
         """
-        context = self.sessions[session_id].context
-        last_slots = context.get('last_slots', [])
+        listing = SlotListing.load(self.sessions[session_id].context)
 
         reference_map = {
             'first': 0, 'second': 1, 'third': 2, 'fourth': 3, 'fifth': 4,
@@ -227,8 +281,9 @@ class AIModel:
 
         for ref, index in reference_map.items():
             if ref in text.lower():
-                if last_slots and abs(index) < len(last_slots):
-                    return last_slots[index]['slotId']
+                # Relative to the page of slots the user is looking at
+                if listing and abs(index) < len(listing.page_ids()):
+                    return listing.on_page(index)
 
         return None
 
@@ -344,9 +399,6 @@ class AIModel:
         """
         Add personality and human-like elements to responses.
         """
-        # Add thinking simulation
-        self._simulate_thinking()
-
         # For greetings, use personality responses
         if intent == 'unknown' and any(word in response.lower() for word in ['hello', 'hi', 'help']):
             return self._get_personality_response('greetings')
@@ -369,7 +421,7 @@ class AIModel:
         context = self.sessions[session_id].context
 
         # If user just viewed slots, offer to help with booking
-        if intent == 'view_slots' and context.get('last_slots'):
+        if intent == 'view_slots' and context.get(SlotListing.CONTEXT_KEY):
             return "I can help you book one of these slots. Which slot number interests you, or would you like me to suggest the best available option?"
 
         # If user is booking but missing info, be more specific
@@ -415,8 +467,8 @@ class AIModel:
             return "Would you like to book a slot at one of these stations?"
 
         # After showing slots, ask about booking
-        if (intent == 'view_slots' or intent == 'view_slots_filtered') and context.get('last_slots'):
-            available_count = len([s for s in context['last_slots'] if s.get('availability') == 'Free'])
+        if (intent == 'view_slots' or intent == 'view_slots_filtered') and context.get(SlotListing.CONTEXT_KEY):
+            available_count = SlotListing.load(context).free
             if available_count > 0:
                 return f"I see there are {available_count} slots available. Would you like to book one of them?"
             else:
@@ -448,37 +500,64 @@ class AIModel:
 
         return ""
 
+    def _load_nltk(self):
+        """
+        Use NLTK's word_tokenize and stopword corpus instead of the bundled ones.
+        """
+        import nltk
+        from nltk.corpus import stopwords
+        from nltk.tokenize import word_tokenize
+        try:
+            nltk.download('punkt', quiet=True)
+        except Exception as e:
+            self.logger.warning(f"NLTK punkt download failed (may already exist): {e}")
+        try:
+            nltk.download('stopwords', quiet=True)
+        except Exception as e:
+            self.logger.warning(f"NLTK stopwords download failed (may already exist): {e}")
+        self.stop_words = set(stopwords.words('english'))
+        self._tokenize = word_tokenize
+
+    @timed_stage('preprocess_text')
     def preprocess_text(self, text: str) -> list:
         """
         Preprocess text: tokenize, remove stop words, keep alphanumeric.
         """
-        tokens = word_tokenize(text.lower())
+        tokens = self._tokenize(text.lower())
         filtered = [w for w in tokens if w not in self.stop_words and w.isalnum()]
         return filtered
 
+    def analyze_text(self, text: str) -> NLUResult:
+        """
+        Tokens, entities and raw intent scores of an utterance, before any
+        session context is applied. Cached by normalized text; do not mutate.
+        """
+        key = self.nlu_cache.normalize(text)
+        result = self.nlu_cache.get(key)
+        if result is None:
+            tokens = self.preprocess_text(key)
+            result = NLUResult(tuple(tokens), self.extract_entities(key), self.intent_scorer.score(tokens))
+            self.nlu_cache.put(key, result)
+        return result
+
+    @timed_stage('parse_intent')
     def parse_intent(self, text: str, session_id: str = "") -> dict:
         """
         Parse intent from text using keyword matching on preprocessed tokens.
         Enhanced with session context awareness and better fallback logic.
         """
         self.logger.info(f"Parsing intent for text: {text}")
-        preprocessed = self.preprocess_text(text)
-        entities = self.extract_entities(text)
+        # Context-independent analysis (cached); copies, since boosts below modify them
+        analysis = self.analyze_text(text)
+        preprocessed = list(analysis.tokens)
+        entities = dict(analysis.entities)
 
         # Debug: Show preprocessing and entities
         self.logger.debug(f"Preprocessed tokens: {preprocessed}")
         self.logger.debug(f"Extracted entities: {entities}")
 
         # Calculate match scores for better intent selection
-        intent_scores = {}
-        for intent_name, intent_data in INTENTS.items():
-            score = 0
-            for keyword in intent_data['keywords']:
-                words = keyword.split()
-                if all(word in preprocessed for word in words):
-                    score += len(words)
-            if score > 0:
-                intent_scores[intent_name] = score
+        intent_scores = dict(analysis.scores)
 
         # Debug: Show initial scores
         self.logger.debug(f"Initial intent scores: {intent_scores}")
@@ -489,7 +568,7 @@ class AIModel:
             history = self.sessions[session_id].history
 
             # Boost booking-related intents if user was recently discussing slots
-            if context.get('last_slots') and any(intent in intent_scores for intent in ['book_slot', 'view_slots']):
+            if context.get(SlotListing.CONTEXT_KEY) and any(intent in intent_scores for intent in ['book_slot', 'view_slots']):
                 for intent in ['book_slot', 'view_slots']:
                     if intent in intent_scores:
                         intent_scores[intent] += 3
@@ -596,6 +675,7 @@ class AIModel:
         if fallback_intent:
             intent_data = INTENTS[fallback_intent]
             self.logger.info(f"Using fallback intent: {fallback_intent}")
+            FALLBACKS.inc(intent=fallback_intent)
             return {
                 'intent': fallback_intent,
                 'response': RESPONSE_TEMPLATES.get(fallback_intent, "Action completed."),
@@ -607,6 +687,7 @@ class AIModel:
 
         # Default to unknown
         self.logger.info("No intent matched, returning unknown")
+        FALLBACKS.inc(intent='unknown')
         self.logger.debug("No matching intents found, defaulting to unknown")
         return {
             'intent': 'unknown',
@@ -649,7 +730,7 @@ class AIModel:
                     return 'display_stations'
 
                 # If user was recently viewing slots, filter slots by new city
-                if (context.get('last_slots') or
+                if (context.get(SlotListing.CONTEXT_KEY) or
                     any(h['response'].lower().find('slot') != -1 for h in history[-3:]) or
                     any(h['user'].lower().find('slot') != -1 for h in history[-3:])):
                     return 'view_slots_filtered'
@@ -659,7 +740,7 @@ class AIModel:
             context = self.sessions[session_id].context
 
             # If user was looking at slots, they might want to book
-            if context.get('last_slots') and any(word in preprocessed for word in ['that', 'this', 'it', 'one']):
+            if context.get(SlotListing.CONTEXT_KEY) and any(word in preprocessed for word in ['that', 'this', 'it', 'one']):
                 return 'book_slot'
 
             # If user has pending booking, they might be confirming or providing info
@@ -668,94 +749,168 @@ class AIModel:
 
         return None
 
+    @timed_stage('extract_entities')
     def extract_entities(self, text: str) -> dict:
         """
         Extract entities using enhanced rules including better location recognition.
         """
-        entities = {}
-        text_lower = text.lower()
+        return self.entity_extractor.extract(text)
 
-        # Location entities - enhanced to recognize cities like "bangalore"
-        cities = ['bangalore', 'delhi', 'mumbai', 'chennai', 'kolkata', 'hyderabad', 'pune', 'ahmedabad', 'jaipur', 'surat']
-        for city in cities:
-            if city in text_lower:
-                entities['city'] = city
-                break
 
-        # Vehicle type entities
-        vehicle_types = ['car', 'cars', 'bike', 'bikes', 'scooter', 'scooters',
-                        'motorcycle', 'motorcycles', 'vehicle', 'vehicles']
-        for vehicle in vehicle_types:
-            if vehicle in text_lower:
-                entities['vehicle_type'] = vehicle.rstrip('s')  # Remove plural
-                break
 
-        # Parking type entities
-        parking_types = ['available', 'empty', 'vacant', 'free', 'occupied', 'full']
-        for parking_type in parking_types:
-            if parking_type in text_lower:
-                entities['availability'] = parking_type
-                break
+    def get_ai_response(self, session_id: str, text: str, token: str = "",
+                        page_size: Optional[int] = None, cursor: Optional[str] = None,
+                        profile: bool = False) -> Dict[str, Any]:
+        """
+        Load the session from the session backend, answer the turn and save the session back.
+        `page_size` sets the size of slot listing pages; `cursor` requests another page
+        of the session's current slot listing instead of parsing `text`.
+        With `profile`, the result includes the turn's timing breakdown under 'profile'.
+        """
+        turn = self._begin_turn(page_size, profile)
+        start = time.perf_counter()
+        result = None
+        with turn_scope(turn), self.profile_sampler.sample():
+            save = self._load_session(session_id)
+            try:
+                result = self._answer_turn(session_id, text, token, cursor)
+            finally:
+                self._end_turn(session_id, turn, start, result, save)
+        if turn.profile is not None:
+            result['profile'] = turn.profile.to_dict(turn.branch, result.get('typing_delay_ms'))
+        return result
 
-        # Extract 'this station' reference first
-        if re.search(r'this.*station[s]?', text, re.IGNORECASE) or re.search(r'\bthis\b', text, re.IGNORECASE):
-            entities['station'] = 'this'
-        else:
-            # Extract station name
-            station_match = re.search(r'(\w+) station', text, re.IGNORECASE)
-            if station_match:
-                value = station_match.group(1).lower()
-                # Avoid setting station to common words like "parking"
-                if value not in ['parking']:
-                    entities['station'] = value
-
-        # Extract other entities using existing regex rules
-        for entity, regex in ENTITY_RULES.items():
-            # Skip time_range as it's handled specially below
-            if entity == 'time_range':
-                continue
-            match = re.search(regex, text, re.IGNORECASE)
-            if match:
-                value = match.group(1).lower()
-                # Apply corrections for cities
-                if entity == 'city' and value in CITY_CORRECTIONS:
-                    value = CITY_CORRECTIONS[value]
-                # Don't set city if it's the same as station name
-                if entity == 'city' and 'station' in entities and value == entities['station']:
-                    continue
-                entities[entity] = value
-
-        # Special handling for time_range entity
-        time_range_match = re.search(ENTITY_RULES['time_range'], text, re.IGNORECASE)
-        if time_range_match:
-            start_time = time_range_match.group(1).lower()
-            end_time = time_range_match.group(2).lower()
-            entities['start_time'] = start_time
-            entities['end_time'] = end_time
-
-        # Extract vehicle type from patterns like "bike slots", "car parking", etc.
-        vehicle_patterns = [
-            r'\b(bike|car|motorcycle|scooter|truck|van|vehicle)\b.*\b(slots?|parking)\b',
-            r'\b(slots?|parking)\b.*\b(bike|car|motorcycle|scooter|truck|van|vehicle)\b',
-            r'for (bike|car|motorcycle|scooter|truck|van|vehicle)\b'
-        ]
-        for pattern in vehicle_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                # Find the vehicle type in the match groups
-                for group in match.groups():
-                    if group and group.lower() in ['bike', 'car', 'motorcycle', 'scooter', 'truck', 'van', 'vehicle']:
-                        entities['vehicle_type'] = group.lower()
-                        break
-                break
+    async def get_ai_response_async(self, session_id: str, text: str, token: str = "",
+                                    page_size: Optional[int] = None, cursor: Optional[str] = None,
+                                    profile: bool = False) -> Dict[str, Any]:
+        """
+        get_ai_response for the event loop (AI_EXECUTION_MODE=async): the turn's
+        backend requests are awaited on the async client, so a turn waiting on the
+        backend holds no thread. Async turns are not sampled by cProfile.
+        """
+        turn = self._begin_turn(page_size, profile)
+        start = time.perf_counter()
+        result = None
+        with turn_scope(turn):
+            save = self._load_session(session_id)
+            try:
+                result = await self._run_steps_async(self._turn_steps(session_id, text, token, cursor))
+            finally:
+                self._end_turn(session_id, turn, start, result, save)
+        if turn.profile is not None:
+            result['profile'] = turn.profile.to_dict(turn.branch, result.get('typing_delay_ms'))
+        return result
 
-        return entities
+    @property
+    def async_backend(self):
+        if self._async_backend is None:
+            from async_backend_client import AsyncBackendClient
+            # Same circuit breakers and retry budget as the sync client
+            self._async_backend = AsyncBackendClient(base_url=getattr(self.backend, 'base_url', BACKEND_URL),
+                                                     breakers=getattr(self.backend, 'breakers', None),
+                                                     retries=getattr(self.backend, 'retries', None))
+        return self._async_backend
+
+    async def aclose(self) -> None:
+        """Close the async backend client's connections, if it was created."""
+        if self._async_backend is not None:
+            await self._async_backend.aclose()
+
+    def _run_steps(self, steps: Generator) -> Any:
+        """
+        Run turn code written as a generator (see _turn_steps). Each backend step it
+        yields, (method name, args), is answered by calling that method.
+        """
+        try:
+            step = next(steps)
+            while True:
+                name, args = step
+                try:
+                    value = getattr(self, name)(*args)
+                except Exception as e:
+                    step = steps.throw(e)
+                else:
+                    step = steps.send(value)
+        except StopIteration as done:
+            return done.value
 
+    async def _run_steps_async(self, steps: Generator) -> Any:
+        """_run_steps on the event loop: each step is answered by awaiting the method's `_async` variant."""
+        try:
+            step = next(steps)
+            while True:
+                name, args = step
+                try:
+                    value = await getattr(self, f"{name}_async")(*args)
+                except Exception as e:
+                    step = steps.throw(e)
+                else:
+                    step = steps.send(value)
+        except StopIteration as done:
+            return done.value
+
+    def _begin_turn(self, page_size: Optional[int], profile: bool) -> TurnContext:
+        turn = current_turn() or TurnContext()
+        turn.page_size = page_size
+        turn.branch = None
+        turn.profile = TurnProfile() if profile else None
+        turn.deadline = time.monotonic() + self.turn_deadline if self.turn_deadline > 0 else None
+        turn.degraded = None
+        return turn
+
+    def _load_session(self, session_id: str) -> bool:
+        """
+        Load the session before a turn. Returns whether the turn may save it back:
+        not when the store couldn't be read and there is no local copy, since a
+        new session saved then would overwrite the stored conversation.
+        """
+        with stage('session_load'):
+            try:
+                session = self.session_backend.load(session_id)
+            except SessionLoadError:
+                # Keep the local copy, if any, rather than starting the dialog over
+                return session_id in self.sessions
+            if session is not None:
+                self.sessions[session_id] = session
+            elif self.session_backend.shared:
+                # Expired or deleted in the shared store: don't resume a stale local copy
+                self.sessions.pop(session_id)
+            return True
+
+    def _answer_turn(self, session_id: str, text: str, token: str, cursor: Optional[str]) -> Dict[str, Any]:
+        return self._run_steps(self._turn_steps(session_id, text, token, cursor))
+
+    def _turn_steps(self, session_id: str, text: str, token: str, cursor: Optional[str]) -> Generator:
+        """
+        The turn, as a generator that runs once in both execution modes. Where it
+        needs the backend it yields (method name, args) and is sent the method's
+        result: get_ai_response calls the method, get_ai_response_async awaits
+        its `_async` variant. Everything else (NLU, session updates, metrics)
+        runs only here.
+        """
+        if cursor or self._is_next_page_request(session_id, text):
+            mark_branch('slot_page')
+            return (yield from self._slot_page_response(session_id, text, cursor))
+        result = yield from self._dialog_steps(session_id, text, token)
+        turn = current_turn()
+        if turn is not None and turn.degraded:
+            result['degraded'] = True
+            result['response'] = f"{result['response']} {turn.degraded}"
+        return result
 
+    def _end_turn(self, session_id: str, turn: TurnContext, start: float, result: Optional[Dict[str, Any]],
+                  save: bool = True) -> None:
+        with stage('session_save'):
+            session = self.sessions.get(session_id) if save else None
+            if session is not None:
+                self.session_backend.save(session_id, session)
+        TURN_SECONDS.observe(time.perf_counter() - start, branch=turn.branch or 'error')
+        INTENT_TURNS.inc(intent=result.get('intent', 'none') if result else 'error')
 
-    def get_ai_response(self, session_id: str, text: str, token: str = "") -> Dict[str, Any]:
+    def _dialog_steps(self, session_id: str, text: str, token: str = "") -> Generator:
         """
         Orchestrate parsing, response generation, and session history update.
+        Backend proxy calls are yielded as turn steps (see _turn_steps).
         """
         self.logger.info(f"Getting AI response for session {session_id}: {text}")
         # Initialize session if not exists
@@ -770,12 +925,14 @@ class AIModel:
 
         # Fix 6: Check for frustration early
         if self._detect_user_frustration(text):
+            mark_branch('frustration')
             frustration_response = self._handle_frustrated_user(session_id, text)
             if frustration_response:
                 return frustration_response
 
         # Handle awaiting_booking_yes responses
         if text.lower() == 'yes' and self.sessions[session_id].context.get('awaiting_booking_yes'):
+            mark_branch('booking_offer')
             self.sessions[session_id].context['collecting_booking_info'] = {'step': 'vehicle_type'}
             self.sessions[session_id].context.pop('awaiting_booking_yes', None)
             result = {
@@ -788,6 +945,7 @@ class AIModel:
             }
             return result
         elif text.lower() == 'no' and self.sessions[session_id].context.get('awaiting_booking_yes'):
+            mark_branch('booking_offer')
             self.sessions[session_id].context.pop('awaiting_booking_yes', None)
             result = {
                 'intent': 'unknown',
@@ -802,6 +960,7 @@ class AIModel:
         # Handle collecting_booking_info steps
         collecting = self.sessions[session_id].context.get('collecting_booking_info')
         if collecting:
+            mark_branch('collect_booking_info')
             if collecting['step'] == 'vehicle_type':
                 entities = self.extract_entities(text)
                 if entities.get('vehicle_type'):
@@ -868,11 +1027,9 @@ class AIModel:
                             }
                         }
                         # Fetch slots data
-                        proxy_result = self.proxy_to_backend_with_token(proxy_intent, token, session_id)
+                        proxy_result = yield from self._proxy_steps(proxy_intent, token, session_id)
                         if proxy_result['status'] == 'success':
-                            slots = proxy_result['data']
-                            # Filter for available slots only
-                            slots = [slot for slot in slots if slot.get('availability') == 'Free']
+                            slots = self._filter_slots(proxy_result['data'])
                             result = {
                                 'intent': 'view_slots_filtered',
                                 'response': f"Got it. Here are the available slots for your {collecting['vehicle_type']} on {collecting['date']} from {collecting['start_time']} to {collecting['end_time']} at {last_station} station.",
@@ -884,10 +1041,9 @@ class AIModel:
                                     'vehicle_type': collecting['vehicle_type'],
                                     'availability': 'available'
                                 },
-                                'data': slots
                             }
-                            # Store slots in context for booking reference
-                            self.sessions[session_id].context['last_slots'] = slots
+                            # Store a compact listing in context for booking reference
+                            result['data'], result['page'] = self._start_slot_listing(session_id, slots, proxy_result.get('stations'))
                         else:
                             result = {
                                 'intent': 'view_slots_filtered',
@@ -928,6 +1084,7 @@ class AIModel:
 
         # Handle cancellation at any point
         if text.lower() in ['no', 'cancel', 'nevermind']:
+            mark_branch('booking_cancel')
             if pending_booking:
                 self.sessions[session_id].context.pop('pending_booking', None)
                 result = {
@@ -952,6 +1109,7 @@ class AIModel:
 
         # Handle booking confirmation
         if text.lower() in ['yes', 'confirm'] and pending_booking and pending_booking.get('awaiting_confirmation'):
+            mark_branch('booking_confirm')
             # Move to payment method selection
             result = {
                 'intent': 'book_slot',
@@ -967,6 +1125,7 @@ class AIModel:
 
         # Handle payment method selection
         if text.lower() in ['razorpay', 'coupon', 'coupon bookfree'] and pending_booking and pending_booking.get('awaiting_payment_method'):
+            mark_branch('payment_method')
             if text.lower() == 'razorpay':
                 pending_booking['payment_method'] = 'razorpay'
                 pending_booking['awaiting_payment_confirmation'] = True
@@ -994,8 +1153,9 @@ class AIModel:
 
         # Handle payment confirmation
         if text.lower() in ['yes', 'confirm'] and pending_booking and pending_booking.get('awaiting_payment_confirmation'):
+            mark_branch('payment_confirm')
             # Proceed with booking - directly proxy with book_slot intent
-            proxy_result = self.proxy_to_backend_with_token({'intent': 'book_slot', 'entities': pending_booking}, token, session_id)
+            proxy_result = yield from self._proxy_steps({'intent': 'book_slot', 'entities': pending_booking}, token, session_id)
             if proxy_result['status'] == 'success':
                 result = {
                     'intent': 'book_slot',
@@ -1074,6 +1234,8 @@ class AIModel:
                 if not has_location_context:
                     clarifications = self._detect_ambiguity(text, result['entities'])
                     if clarifications:
+                        mark_branch('clarify_location')
+                        CLARIFICATIONS.inc(kind='location')
                         result['intent'] = 'clarification_needed'
                         result['response'] = clarifications[0]
                         result['action'] = None
@@ -1104,6 +1266,8 @@ class AIModel:
         # Check for ambiguities and missing information
         clarifications = self._detect_ambiguity(text, result['entities'])
         if clarifications:
+            mark_branch('clarify')
+            CLARIFICATIONS.inc(kind='missing_info')
             # If we have clarifications needed, prioritize asking questions
             result['intent'] = 'clarification_needed'
             result['response'] = clarifications[0]  # Ask the first clarification question
@@ -1126,9 +1290,14 @@ class AIModel:
             else:
                 result['response'] = self._get_personality_response('clarifications') + " I'm here to help with parking! I can show you available slots, help you book parking, check your bookings, or find parking stations. What would you like to do?"
 
+        mark_branch(result['intent'])
+        # Streaming clients get the intent and response text before any backend data is fetched
+        emit('intent', {'intent': result['intent'], 'response': result['response'], 'entities': result['entities'],
+                        'action': result.get('action'), 'screen': result.get('screen')})
+
         # If intent is navigate_bookings or display_stations, fetch actual data
         if result['intent'] == 'navigate_bookings' and token:
-            proxy_result = self.proxy_to_backend_with_token(result, token, session_id)
+            proxy_result = yield from self._proxy_steps(result, token, session_id)
             if proxy_result['status'] == 'success':
                 bookings = proxy_result['data']
                 result['data'] = bookings
@@ -1141,7 +1310,7 @@ class AIModel:
             else:
                 result['response'] = "Failed to fetch bookings. Please try again."
         elif result['intent'] == 'display_stations':
-            proxy_result = self.proxy_to_backend_with_token(result, token, session_id)
+            proxy_result = yield from self._proxy_steps(result, token, session_id)
             if proxy_result['status'] == 'success':
                 stations = proxy_result['data']
                 result['data'] = stations
@@ -1166,13 +1335,13 @@ class AIModel:
             else:
                 result['response'] = "Failed to fetch stations. Please try again."
         elif result['intent'] == 'cancel_booking':
-            proxy_result = self.proxy_to_backend_with_token(result, token, session_id)
+            proxy_result = yield from self._proxy_steps(result, token, session_id)
             if proxy_result['status'] == 'success':
                 result['response'] = proxy_result['data']
             else:
                 result['response'] = "Failed to cancel booking."
         elif result['intent'] == 'view_payment_history':
-            proxy_result = self.proxy_to_backend_with_token(result, token, session_id)
+            proxy_result = yield from self._proxy_steps(result, token, session_id)
             if proxy_result['status'] == 'success':
                 result['data'] = proxy_result['data']
                 result['response'] = "Here is your payment history:"
@@ -1181,15 +1350,14 @@ class AIModel:
             else:
                 result['response'] = "Failed to fetch payment history."
         elif result['intent'] == 'view_slots':
-            proxy_result = self.proxy_to_backend_with_token(result, token, session_id)
+            proxy_result = yield from self._proxy_steps(result, token, session_id)
             if proxy_result['status'] == 'success':
                 slots = proxy_result['data']
                 # Filter for available slots only if filter_available is True
                 if result.get('params', {}).get('filter_available', False):
-                    slots = [slot for slot in slots if slot.get('availability') == 'Free']
-                result['data'] = slots
-                # Store slots in context for booking reference
-                self.sessions[session_id].context['last_slots'] = slots
+                    slots = self._filter_slots(slots)
+                # Store a compact listing in context for booking reference; return its first page
+                result['data'], result['page'] = self._start_slot_listing(session_id, slots)
                 if slots:
                     # Use last mentioned station if available, else city
                     last_station = self.sessions[session_id].context.get('last_station')
@@ -1219,14 +1387,11 @@ class AIModel:
             else:
                 result['response'] = "Failed to fetch slots."
         elif result['intent'] == 'view_slots_filtered':
-            proxy_result = self.proxy_to_backend_with_token(result, token, session_id)
+            proxy_result = yield from self._proxy_steps(result, token, session_id)
             if proxy_result['status'] == 'success':
-                slots = proxy_result['data']
-                # Filter for available slots only
-                slots = [slot for slot in slots if slot.get('availability') == 'Free']
-                result['data'] = slots
-                # Store slots in context for booking reference
-                self.sessions[session_id].context['last_slots'] = slots
+                slots = self._filter_slots(proxy_result['data'])
+                # Store a compact listing in context for booking reference; return its first page
+                result['data'], result['page'] = self._start_slot_listing(session_id, slots, proxy_result.get('stations'))
                 if slots:
                     result['action'] = 'display'
                     result['screen'] = 'slots'
@@ -1313,7 +1478,7 @@ class AIModel:
                         'awaiting_confirmation': True
                     }
         elif result['intent'] == 'emergency':
-            proxy_result = self.proxy_to_backend_with_token(result, token, session_id)
+            proxy_result = yield from self._proxy_steps(result, token, session_id)
             if proxy_result['status'] == 'success':
                 result['data'] = proxy_result['data']
                 result['response'] = proxy_result['data']
@@ -1324,6 +1489,7 @@ class AIModel:
 
         # 🚨 CRITICAL FIX: Apply personality enhancement to all responses
         result['response'] = self._enhance_response_with_personality(result['response'], result['intent'])
+        result['typing_delay_ms'] = self._typing_delay_hint()
 
         # 🚨 CRITICAL FIX: Add human-like elements to booking flow
         if result['intent'] == 'book_slot':
@@ -1343,6 +1509,7 @@ class AIModel:
         followup_question = self._generate_followup_question(session_id, result['intent'], result['entities'], result['response'])
         if followup_question:
             result['response'] += f" {followup_question}"
+            emit('followup', {'question': followup_question})
 
         # Add to history
         self.sessions[session_id].history.append({'user': text, 'response': result['response']})
@@ -1357,7 +1524,7 @@ class AIModel:
         Login to backend and get JWT token.
         """
         try:
-            response = requests.post(f"{BACKEND_URL}/api/auth/login", json={"email": email, "password": password})
+            response = self.backend.post('auth_login', "/api/auth/login", json={"email": email, "password": password})
             response.raise_for_status()
             data = response.json()
             return data.get('token')
@@ -1365,44 +1532,53 @@ class AIModel:
             self.logger.error(f"Login failed: {str(e)}")
             return None
 
+    async def login_and_get_token_async(self, email: str, password: str) -> str:
+        try:
+            response = await self.async_backend.post('auth_login', "/api/auth/login",
+                                                     json={"email": email, "password": password})
+            response.raise_for_status()
+            return response.json().get('token')
+        except Exception as e:
+            self.logger.error(f"Login failed: {str(e)}")
+            return None
+
     def proxy_to_backend_with_token(self, intent: Dict[str, Any], token: str, session_id: str = "") -> Dict[str, Any]:
         """
         Proxy request to backend based on intent using provided token.
         """
+        return self._run_steps(self._proxy_steps(intent, token, session_id))
+
+    def _proxy_steps(self, intent: Dict[str, Any], token: str, session_id: str = "") -> Generator:
+        """
+        proxy_to_backend_with_token as turn steps (see _turn_steps): backend
+        requests are yielded, so async turns await them on the async client.
+        """
         self.logger.info(f"Proxying to backend for intent: {intent['intent']} with token")
         try:
             headers = {'Authorization': f'Bearer {token}'}
             if intent['intent'] == 'navigate_search_stations':
                 # Fetch stations
-                response = requests.get(f"{BACKEND_URL}/api/stations")
-                response.raise_for_status()
-                data = response.json()
+                data = (yield ('_loaded_station_directory', ())).stations()
                 self.logger.info("Successfully fetched stations")
                 return {'status': 'success', 'data': data}
             elif intent['intent'] == 'display_stations':
                 # Fetch stations by city if entity present
                 city = intent.get('entities', {}).get('city')
                 if city:
-                    response = requests.get(f"{BACKEND_URL}/api/stations/search/{city}")
-                    response.raise_for_status()
-                    data = response.json()
+                    data = yield ('_get_json', ('stations_search', f"/api/stations/search/{city}"))
                     stations = data.get('stations', [])
                 else:
                     # Fetch all stations if no city
-                    response = requests.get(f"{BACKEND_URL}/api/stations")
-                    response.raise_for_status()
-                    stations = response.json()
+                    stations = (yield ('_loaded_station_directory', ())).stations()
                 self.logger.info(f"Successfully fetched {len(stations)} stations")
                 return {'status': 'success', 'data': stations}
             elif intent['intent'] == 'navigate_bookings':
                 # Fetch user ID by email (session_id is userEmail)
-                user_id = self._fetch_user_id_by_email(session_id)
+                user_id = yield ('_fetch_user_id_by_email', (session_id,))
                 if not user_id:
                     return {'status': 'error', 'message': 'User not found'}
                 # Fetch bookings by user ID
-                response = requests.get(f"{BACKEND_URL}/api/slots/slotbookings/{user_id}")
-                response.raise_for_status()
-                data = response.json()
+                data = yield ('_get_json', ('slot_bookings', f"/api/slots/slotbookings/{user_id}"))
                 self.logger.info("Successfully fetched bookings")
                 bookings_data = data if isinstance(data, list) else []
                 return {'status': 'success', 'data': bookings_data}
@@ -1422,10 +1598,7 @@ class AIModel:
                     last_station = self.sessions[session_id].get_context('last_station')
                     if last_station:
                         # Find station by name
-                        response = requests.get(f"{BACKEND_URL}/api/stations")
-                        response.raise_for_status()
-                        all_stations = response.json()
-                        station = next((s for s in all_stations if s.get('stationName') and isinstance(s['stationName'], str) and s['stationName'].lower() == last_station.lower()), None)
+                        station = (yield ('_loaded_station_directory', ())).find_by_name(last_station)
                         if station:
                             station_id = station['stationId']
                         else:
@@ -1435,19 +1608,14 @@ class AIModel:
 
                 # If station is mentioned by name, find its ID
                 elif station_id != 'ST001' and not station_id.startswith('ST'):
-                    response = requests.get(f"{BACKEND_URL}/api/stations")
-                    response.raise_for_status()
-                    all_stations = response.json()
-                    station = next((s for s in all_stations if s.get('stationName') and isinstance(s['stationName'], str) and s['stationName'].lower().startswith(station_id.split()[0])), None)
+                    station = (yield ('_loaded_station_directory', ())).find_by_prefix(station_id.split()[0])
                     if station:
                         station_id = station['stationId']
                     else:
                         return {'status': 'error', 'message': f'Station {station_id} not found'}
 
                 # Fetch slots using the station ID
-                slots_response = requests.get(f"{BACKEND_URL}/api/slots/station/{station_id}")
-                slots_response.raise_for_status()
-                slots = slots_response.json()
+                slots = self._without_booked(session_id, (yield ('_station_slots', (station_id,))))
                 self.logger.info(f"Successfully fetched {len(slots)} slots for station {station_id}")
                 return {'status': 'success', 'data': slots}
             elif intent['intent'] == 'view_slots_filtered':
@@ -1461,31 +1629,19 @@ class AIModel:
                 if last_station_id:
                     try:
                         # Fetch slots directly using station ID
-                        slots_response = requests.get(f"{BACKEND_URL}/api/slots/station/{last_station_id}")
-                        slots_response.raise_for_status()
-                        slots = slots_response.json()
-                        # Filter by vehicle_type if specified
-                        if vehicle_type:
-                            slots = [slot for slot in slots if slot.get('type', '').lower() == vehicle_type.lower()]
-                        # Filter for available slots only
-                        slots = [slot for slot in slots if slot.get('availability') == 'Free']
-                        # Add station info to slots for context
+                        slots = self._without_booked(session_id, self._filter_slots(
+                            (yield ('_station_slots', (last_station_id,))), vehicle_type))
+                        # Station info for the slots
+                        stations = {}
                         try:
-                            station_response = requests.get(f"{BACKEND_URL}/api/stations/{last_station_id}")
-                            station_response.raise_for_status()
-                            station_data = station_response.json()
-                            station_name = station_data.get('stationName', 'Unknown')
-                            station_address = station_data.get('address', 'Unknown')
-                            for slot in slots:
-                                slot['stationName'] = station_name
-                                slot['stationAddress'] = station_address
+                            station_data = (yield ('_loaded_station_directory', ())).get(last_station_id)
+                            if station_data is None:
+                                station_data = yield ('_get_json', ('station_detail', f"/api/stations/{last_station_id}"))
+                            stations[last_station_id] = station_data
                         except Exception as e:
                             self.logger.warning(f"Failed to fetch station details for {last_station_id}: {e}")
-                            for slot in slots:
-                                slot['stationName'] = 'Unknown'
-                                slot['stationAddress'] = 'Unknown'
                         self.logger.info(f"Successfully fetched {len(slots)} filtered slots for station ID {last_station_id}")
-                        return {'status': 'success', 'data': slots}
+                        return {'status': 'success', 'data': slots, 'stations': stations}
                     except Exception as e:
                         self.logger.warning(f"Failed to fetch slots for station ID {last_station_id}: {e}")
 
@@ -1494,75 +1650,48 @@ class AIModel:
                 if last_station:
                     # Try to find the station by name
                     try:
-                        response = requests.get(f"{BACKEND_URL}/api/stations")
-                        response.raise_for_status()
-                        all_stations = response.json()
-                        station = next((s for s in all_stations if s.get('stationName') and isinstance(s['stationName'], str) and s['stationName'].lower() == last_station.lower()), None)
+                        station = (yield ('_loaded_station_directory', ())).find_by_name(last_station)
                         if station:
                             station_id = station['stationId']
                             # Fetch slots for this specific station
-                            slots_response = requests.get(f"{BACKEND_URL}/api/slots/station/{station_id}")
-                            slots_response.raise_for_status()
-                            slots = slots_response.json()
-                            # Filter by vehicle_type if specified
-                            if vehicle_type:
-                                slots = [slot for slot in slots if slot.get('type', '').lower() == vehicle_type.lower()]
-                            # Filter for available slots only
-                            slots = [slot for slot in slots if slot.get('availability') == 'Free']
-                            # Add station info to slots for context
-                            for slot in slots:
-                                slot['stationName'] = station.get('stationName', 'Unknown')
-                                slot['stationAddress'] = station.get('address', 'Unknown')
+                            slots = self._without_booked(session_id, self._filter_slots(
+                                (yield ('_station_slots', (station_id,))), vehicle_type))
                             self.logger.info(f"Successfully fetched {len(slots)} filtered slots for last station {last_station}")
-                            return {'status': 'success', 'data': slots}
+                            return {'status': 'success', 'data': slots, 'stations': {station_id: station}}
                     except Exception as e:
                         self.logger.warning(f"Failed to fetch slots for last station {last_station}: {e}")
 
                 # Final fallback: Fetch stations by city if specified
                 if city:
-                    response = requests.get(f"{BACKEND_URL}/api/stations/search/{city}")
-                    response.raise_for_status()
-                    data = response.json()
+                    data = yield ('_get_json', ('stations_search', f"/api/stations/search/{city}"))
                     stations = data.get('stations', [])
                 else:
                     # Fetch all stations if no city
-                    response = requests.get(f"{BACKEND_URL}/api/stations")
-                    response.raise_for_status()
-                    stations = response.json()
+                    stations = (yield ('_loaded_station_directory', ())).stations()
 
                 if not stations:
-                    return {'status': 'success', 'data': []}
+                    return {'status': 'success', 'data': [], 'stations': {}}
 
-                # For each station, fetch slots and filter by vehicle_type if specified
-                all_filtered_slots = []
-                for station in stations:
-                    station_id = station.get('stationId')
-                    if station_id:
-                        try:
-                            slots_response = requests.get(f"{BACKEND_URL}/api/slots/station/{station_id}")
-                            slots_response.raise_for_status()
-                            slots = slots_response.json()
-                            # Filter by vehicle_type if specified
-                            if vehicle_type:
-                                slots = [slot for slot in slots if slot.get('type', '').lower() == vehicle_type.lower()]
-                            # Filter for available slots only
-                            slots = [slot for slot in slots if slot.get('availability') == 'Free']
-                            # Add station info to slots for context
-                            for slot in slots:
-                                slot['stationName'] = station.get('stationName', 'Unknown')
-                                slot['stationAddress'] = station.get('address', 'Unknown')
-                            all_filtered_slots.extend(slots)
-                        except Exception as e:
-                            self.logger.warning(f"Failed to fetch slots for station {station_id}: {e}")
+                # Fetch each station's slots concurrently, then merge them in station order
+                stations = [station for station in stations if station.get('stationId')]
+                slots_by_station, failed = yield ('_fetch_slots_for_stations', (stations, vehicle_type, session_id))
+                if failed:
+                    degrade('partial_slots', f"(Some slots may be missing: {failed} of {len(stations)} stations "
+                                             f"didn't respond in time.)")
+                all_filtered_slots = self._without_booked(session_id, [
+                    slot for index in range(len(stations)) for slot in slots_by_station.get(index, [])])
 
                 self.logger.info(f"Successfully fetched {len(all_filtered_slots)} filtered slots")
-                return {'status': 'success', 'data': all_filtered_slots}
+                return {'status': 'success', 'data': all_filtered_slots,
+                        'stations': {station['stationId']: station for station in stations}}
             elif intent['intent'] == 'emergency':
                 # Implement emergency contacts logic - placeholder
                 return {'status': 'success', 'data': 'Emergency contacts: Police - 100, Ambulance - 108.'}
             elif intent['intent'] == 'book_slot':
                 # Get pending booking from session context
-                pending_booking = self.sessions.get(session_id, {}).get('context', {}).get('pending_booking', {})
+                session = self.sessions.get(session_id)
+                session_context = session.context if session else {}
+                pending_booking = session_context.get('pending_booking', {})
 
                 if not pending_booking or not pending_booking.get('awaiting_payment_method'):
                     return {'status': 'error', 'message': 'No pending booking found'}
@@ -1591,31 +1720,34 @@ class AIModel:
                         pass
 
                 if slot_index is not None:
-                    last_slots = self.sessions.get(session_id, {}).get('context', {}).get('last_slots', [])
-                    if 0 <= slot_index < len(last_slots):
-                        slot = last_slots[slot_index]
-                        slot_object_id = slot['_id']
-                        slot_price = slot.get('price', 0)
-                        self.logger.info(f"Using slot at position {slot_index + 1}: {slot.get('slotId')}")
+                    # Positions count over the whole listing, across pages
+                    listing = SlotListing.load(session_context)
+                    position_slot_id = listing.at_position(slot_index + 1) if listing else None
+                    slot = (yield ('_lookup_slot', (position_slot_id,))) if position_slot_id else None
+                    if slot:
+                        slot_object_id = slot._id
+                        slot_price = slot.price or 0
+                        self.logger.info(f"Using slot at position {slot_index + 1}: {slot.slotId}")
+                    elif self._cut_off_by_deadline():
+                        return self._booking_unreachable()
                     else:
-                        return {'status': 'error', 'message': f'Slot position {slot_id} is out of range. Only {len(last_slots)} slots available.'}
+                        available = len(listing.ids) if listing else 0
+                        return {'status': 'error', 'message': f'Slot position {slot_id} is out of range. Only {available} slots available.'}
                 else:
-                    # slot_id is not a positional reference, treat as actual slotId
-                    try:
-                        # First, find the slot by slotId to get its ObjectId
-                        slots_response = requests.get(f"{BACKEND_URL}/api/slots")
-                        slots_response.raise_for_status()
-                        all_slots = slots_response.json()
-                        slot = next((s for s in all_slots if s.get('slotId') == slot_id), None)
-                        if not slot:
-                            return {'status': 'error', 'message': f'Slot {slot_id} not found'}
-                        slot_object_id = slot['_id']
-                        slot_price = slot.get('price', 0)
-                    except Exception as e:
-                        return {'status': 'error', 'message': f'Failed to find slot: {str(e)}'}
+                    # slot_id is not a positional reference, treat as actual slotId.
+                    # Resolve its ObjectId from the slot index, or fetch just this slot on a miss.
+                    slot = yield ('_lookup_slot', (slot_id,))
+                    if not slot and self._cut_off_by_deadline():
+                        return self._booking_unreachable()
+                    if not slot:
+                        return {'status': 'error', 'message': f'Slot {slot_id} not found'}
+                    slot_object_id = slot._id
+                    slot_price = slot.price or 0
 
                 # Fetch user's vehicles to select one for booking
-                user_vehicles = self._fetch_user_vehicles(token)
+                user_vehicles = yield ('_fetch_user_vehicles', (token,))
+                if not user_vehicles and self._cut_off_by_deadline():
+                    return self._booking_unreachable()
                 if not user_vehicles:
                     return {'status': 'error', 'message': 'No vehicles found for user. Please add a vehicle first.'}
 
@@ -1689,7 +1821,12 @@ class AIModel:
                 }
 
                 # Make request to backend
-                response = requests.post(f"{BACKEND_URL}/api/slots/{slot_object_id}/bookings", json=booking_data, headers=headers)
+                response = yield ('_post', ('create_booking', f"/api/slots/{slot_object_id}/bookings",
+                                            {'json': booking_data, 'headers': headers}))
+                if 200 <= response.status_code < 300 or response.status_code == 409:
+                    # The cached list of the slot's station no longer shows its availability
+                    self.slot_cache.invalidate_slot(slot_object_id)
+                    self._remember_booked_slot(session_id, slot_object_id)
                 if response.status_code == 201:
                     data = response.json()
                     if payment_method == 'razorpay':
@@ -1713,6 +1850,171 @@ class AIModel:
             self.logger.error(f"Unexpected error: {str(e)}")
             return {'status': 'error', 'message': f'Unexpected error: {str(e)}'}
 
+    # Backend steps yielded by _proxy_steps and _slot_page_response, each with an `_async` variant
+
+    def _loaded_station_directory(self) -> StationDirectory:
+        """The station directory; its lookups load the station list on first use."""
+        return self.station_directory
+
+    async def _loaded_station_directory_async(self) -> StationDirectory:
+        """The station directory, with a missing or expired station list loaded on the event loop first."""
+        await self.station_directory.ensure_async(self.async_backend)
+        return self.station_directory
+
+    def _get_json(self, endpoint: str, path: str, headers: Optional[Dict[str, str]] = None) -> Any:
+        response = self.backend.get(endpoint, path, headers=headers)
+        response.raise_for_status()
+        return response.json()
+
+    async def _get_json_async(self, endpoint: str, path: str, headers: Optional[Dict[str, str]] = None) -> Any:
+        response = await self.async_backend.get(endpoint, path, headers=headers)
+        response.raise_for_status()
+        return response.json()
+
+    def _post(self, endpoint: str, path: str, kwargs: Dict[str, Any]) -> requests.Response:
+        return self.backend.post(endpoint, path, **kwargs)
+
+    async def _post_async(self, endpoint: str, path: str, kwargs: Dict[str, Any]) -> requests.Response:
+        return await self.async_backend.post(endpoint, path, **kwargs)
+
+    def _fetch_slots_for_stations(self, stations: List[dict], vehicle_type: Optional[str] = None,
+                                  session_id: str = "") -> Tuple[Dict[int, List[SlotRecord]], int]:
+        """
+        Fetch each station's free slots concurrently, until the turn deadline.
+        Returns the slots by station index and how many stations failed or timed out.
+        Each station's slots are streamed as they arrive, as `session_id` would be shown them.
+        """
+        # Each task runs in a copy of this context so batch-scoped state (shared_gets) carries over
+        futures = {self._fanout_pool.submit(contextvars.copy_context().run, self._fetch_station_slots, station, vehicle_type): index
+                   for index, station in enumerate(stations)}
+        slots_by_station = {}
+        failed = 0
+        remaining = time_left()
+        try:
+            for future in as_completed(futures, timeout=max(remaining, 0) if remaining is not None else None):
+                try:
+                    slots_by_station[futures[future]] = future.result()
+                except Exception as e:
+                    self.logger.warning(f"Failed to fetch slots for station {stations[futures[future]].get('stationId')}: {e}")
+                    failed += 1
+                    continue
+                self._emit_station_slots(session_id, stations[futures[future]], slots_by_station[futures[future]])
+        except FutureTimeoutError:
+            # Turn deadline: answer with the stations fetched so far; fetches not started are dropped
+            for future in futures:
+                if not future.done():
+                    future.cancel()
+                    failed += 1
+        return slots_by_station, failed
+
+    async def _fetch_slots_for_stations_async(self, stations: List[dict], vehicle_type: Optional[str] = None,
+                                              session_id: str = "") -> Tuple[Dict[int, List[SlotRecord]], int]:
+        """_fetch_slots_for_stations with the fetches as tasks on the event loop."""
+        tasks = {asyncio.ensure_future(self._fetch_station_slots_async(station, vehicle_type)): index
+                 for index, station in enumerate(stations)}
+        slots_by_station = {}
+        failed = 0
+        pending = set(tasks)
+        while pending:
+            remaining = time_left()
+            done, pending = await asyncio.wait(pending, timeout=max(remaining, 0) if remaining is not None else None,
+                                               return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in done:
+                try:
+                    slots_by_station[tasks[task]] = task.result()
+                except Exception as e:
+                    self.logger.warning(f"Failed to fetch slots for station {stations[tasks[task]].get('stationId')}: {e}")
+                    failed += 1
+                    continue
+                self._emit_station_slots(session_id, stations[tasks[task]], slots_by_station[tasks[task]])
+        # Turn deadline: answer with the stations fetched so far
+        for task in pending:
+            task.cancel()
+            failed += 1
+        return slots_by_station, failed
+
+    def _emit_station_slots(self, session_id: str, station: dict, slots: List[SlotRecord]) -> None:
+        """
+        Stream one station's slots as soon as they arrive: without those the
+        session just booked, and no more than a page of them (`total` counts all).
+        """
+        turn = current_turn()
+        if turn is None or turn.sink is None:
+            return
+        slots = self._without_booked(session_id, slots)
+        emit('slots', {'stationId': station.get('stationId'), 'stationName': station.get('stationName'),
+                       'slots': [slot.to_dict(station) for slot in slots[:clamp_page_size(turn.page_size)]],
+                       'total': len(slots)})
+
+    def _fetch_station_slots(self, station: dict, vehicle_type: str = None) -> List[SlotRecord]:
+        """
+        Fetch free slots for one station, filtered by vehicle type.
+        """
+        return self._filter_slots(self._station_slots(station.get('stationId')), vehicle_type)
+
+    async def _fetch_station_slots_async(self, station: dict, vehicle_type: str = None) -> List[SlotRecord]:
+        return self._filter_slots(await self._station_slots_async(station.get('stationId')), vehicle_type)
+
+    def _station_slots(self, station_id: str) -> List[SlotRecord]:
+        """
+        All slots of a station, from the slot cache or the backend, with live
+        sensor occupancy applied. The list may be shared with the cache and must
+        not be modified.
+        """
+        load = functools.partial(self._load_station_slots, station_id)
+        # While the station's sensors report, availability comes from them, so any cached list will do
+        live = self.occupancy.is_live(station_id)
+        return self.occupancy.apply(station_id, self.slot_cache.get(station_id, load, allow_stale=live))
+
+    async def _station_slots_async(self, station_id: str) -> List[SlotRecord]:
+        """_station_slots with a cache miss fetched on the event loop."""
+        async def load_async() -> List[SlotRecord]:
+            return self.slot_index.add_slots(
+                await self._get_json_async('slots_by_station', f"/api/slots/station/{station_id}"), station_id)
+        # Background refreshes of stale lists run on the cache's thread, with the sync client
+        load = functools.partial(self._load_station_slots, station_id)
+        live = self.occupancy.is_live(station_id)
+        return self.occupancy.apply(station_id, await self.slot_cache.get_async(station_id, load, load_async,
+                                                                                allow_stale=live))
+
+    def _load_station_slots(self, station_id: str) -> List[SlotRecord]:
+        return self.slot_index.add_slots(self._get_json('slots_by_station', f"/api/slots/station/{station_id}"),
+                                         station_id)
+
+    def _remember_booked_slot(self, session_id: str, slot_object_id: str) -> None:
+        """
+        Keep a slot the session just booked in the session, which every worker
+        loads, so its listings leave the slot out while other workers' slot
+        caches may still show it as free.
+        """
+        session = self.sessions.get(session_id)
+        if session is not None:
+            booked = self._booked_slots(session)
+            booked[slot_object_id] = time.time()
+            session.update_context('booked_slots', booked)
+
+    def _booked_slots(self, session: SessionContext) -> Dict[str, float]:
+        """The session's booked slot _ids (with booking times) that a cached slot list may still show."""
+        horizon = time.time() - max(self.slot_cache.ttl + self.slot_cache.stale_ttl, self.slot_cache.max_age)
+        return {slot_id: booked_at for slot_id, booked_at in (session.get_context('booked_slots') or {}).items()
+                if booked_at > horizon}
+
+    def _without_booked(self, session_id: str, slots: List[SlotRecord]) -> List[SlotRecord]:
+        session = self.sessions.get(session_id)
+        booked = self._booked_slots(session) if session is not None else None
+        if not booked:
+            return slots
+        return [slot for slot in slots if slot._id not in booked]
+
+    @staticmethod
+    def _filter_slots(slots: List[SlotRecord], vehicle_type: Optional[str] = None) -> List[SlotRecord]:
+        """Free slots, of `vehicle_type` if given."""
+        if vehicle_type:
+            slots = [slot for slot in slots if (slot.type or '').lower() == vehicle_type.lower()]
+        return [slot for slot in slots if slot.availability == 'Free']
+
     def _convert_to_24_hour(self, time_str: str) -> str:
         """
         Convert 12-hour time format to 24-hour format.
@@ -1733,7 +2035,7 @@ class AIModel:
         Fetch user ID by email.
         """
         try:
-            response = requests.get(f"{BACKEND_URL}/api/users/email/{email}")
+            response = self.backend.get('user_by_email', f"/api/users/email/{email}")
             response.raise_for_status()
             data = response.json()
             return data.get('_id', '')
@@ -1741,13 +2043,33 @@ class AIModel:
             self.logger.error(f"Failed to fetch user ID for email {email}: {str(e)}")
             return ''
 
+    async def _fetch_user_id_by_email_async(self, email: str) -> str:
+        try:
+            data = await self._get_json_async('user_by_email', f"/api/users/email/{email}")
+            return data.get('_id', '')
+        except Exception as e:
+            self.logger.error(f"Failed to fetch user ID for email {email}: {str(e)}")
+            return ''
+
+    @staticmethod
+    def _cut_off_by_deadline() -> bool:
+        """Whether the turn's deadline has passed, so an empty backend answer may just be a GET cut short."""
+        remaining = time_left()
+        return remaining is not None and remaining <= 0
+
+    @staticmethod
+    def _booking_unreachable() -> Dict[str, Any]:
+        """The booking error for a turn whose slot or vehicle lookup was cut short by its deadline."""
+        degrade('booking_deadline', "Please try again.")
+        return {'status': 'error', 'message': "Couldn't reach the booking service in time."}
+
     def _fetch_user_vehicles(self, token: str) -> list:
         """
         Fetch user vehicles using token.
         """
         try:
             headers = {'Authorization': f'Bearer {token}'}
-            response = requests.get(f"{BACKEND_URL}/api/user/vehicles", headers=headers)
+            response = self.backend.get('user_vehicles', "/api/user/vehicles", headers=headers)
             response.raise_for_status()
             data = response.json()
             return data.get('vehicles', [])
@@ -1755,41 +2077,185 @@ class AIModel:
             self.logger.error(f"Failed to fetch user vehicles: {str(e)}")
             return []
 
+    async def _fetch_user_vehicles_async(self, token: str) -> list:
+        try:
+            headers = {'Authorization': f'Bearer {token}'}
+            response = await self.async_backend.get('user_vehicles', "/api/user/vehicles", headers=headers)
+            response.raise_for_status()
+            return response.json().get('vehicles', [])
+        except Exception as e:
+            self.logger.error(f"Failed to fetch user vehicles: {str(e)}")
+            return []
+
+    def _lookup_slot(self, slot_id: str) -> Optional[SlotRecord]:
+        """
+        Slot record for a slotId from the slot index, fetching just this slot on a miss.
+        """
+        slot = self.slot_index.get(slot_id)
+        if not slot:
+            slot = self._fetch_slot_details(slot_id)
+            if not slot or not slot.get('_id'):
+                return None
+            slot = self.slot_index.add(slot)
+        return slot
+
+    async def _lookup_slot_async(self, slot_id: str) -> Optional[SlotRecord]:
+        slot = self.slot_index.get(slot_id)
+        if not slot:
+            slot = await self._fetch_slot_details_async(slot_id)
+            if not slot or not slot.get('_id'):
+                return None
+            slot = self.slot_index.add(slot)
+        return slot
+
+    def _slot_view(self, slot: SlotRecord, stations: Optional[Dict[str, dict]] = None) -> dict:
+        """
+        A slot as returned in slot listings. Its station comes from `stations`
+        (those of the fetch that produced the slot) or the station directory.
+        """
+        station = stations.get(slot.stationId) if stations else None
+        if station is None and slot.stationId:
+            try:
+                station = self.station_directory.get(slot.stationId)
+            except Exception as e:
+                self.logger.warning(f"Station lookup failed for slot listing: {e}")
+        return slot.to_dict(station)
+
+    def _slot_page(self, listing: SlotListing, slots_by_id: Optional[Dict[str, SlotRecord]] = None,
+                   stations: Optional[Dict[str, dict]] = None) -> List[dict]:
+        """
+        The current page of a listing, serialized. Slots come from `slots_by_id` (the fetch
+        that produced the listing) or the slot index; index misses are fetched concurrently.
+        """
+        page_ids, found, missing = self._page_slots(listing, slots_by_id)
+        if missing:
+            # Contexts are copied here, on the turn's thread, so lookups keep its deadline and memo
+            futures = [self._fanout_pool.submit(contextvars.copy_context().run, self._lookup_slot, slot_id)
+                       for slot_id in missing]
+            for slot_id, future in zip(missing, futures):
+                found[slot_id] = future.result()
+        return [self._slot_view(found[slot_id], stations) for slot_id in page_ids if found.get(slot_id)]
+
+    async def _slot_page_async(self, listing: SlotListing, slots_by_id: Optional[Dict[str, SlotRecord]] = None,
+                               stations: Optional[Dict[str, dict]] = None) -> List[dict]:
+        """_slot_page with index misses and the station list fetched on the event loop."""
+        page_ids, found, missing = self._page_slots(listing, slots_by_id)
+        if missing:
+            for slot_id, slot in zip(missing, await asyncio.gather(*map(self._lookup_slot_async, missing))):
+                found[slot_id] = slot
+        try:
+            await self._loaded_station_directory_async()
+        except Exception as e:
+            self.logger.warning(f"Station lookup failed for slot listing: {e}")
+        return [self._slot_view(found[slot_id], stations) for slot_id in page_ids if found.get(slot_id)]
+
+    def _page_slots(self, listing: SlotListing, slots_by_id: Optional[Dict[str, SlotRecord]]
+                    ) -> Tuple[List[str], Dict[str, SlotRecord], List[str]]:
+        """The page's slotIds, the records found for them without a request, and the slotIds missing."""
+        page_ids = listing.page_ids()
+        found = {}
+        for slot_id in page_ids:
+            slot = slots_by_id.get(slot_id) if slots_by_id else None
+            if slot is None:
+                slot = self.slot_index.get(slot_id)
+            if slot is not None:
+                found[slot_id] = slot
+        return page_ids, found, [slot_id for slot_id in page_ids if slot_id not in found]
+
+    def _start_slot_listing(self, session_id: str, slots: List[SlotRecord],
+                            stations: Optional[Dict[str, dict]] = None) -> Tuple[List[dict], Dict[str, Any]]:
+        """
+        Keep a compact listing of `slots` in the session and return its first page and page info.
+        """
+        turn = current_turn()
+        listing = SlotListing.from_slots(slots, turn.page_size if turn else None)
+        listing.save(self.sessions[session_id].context)
+        slots_by_id = {slot.slotId: slot for slot in slots}
+        return self._slot_page(listing, slots_by_id, stations), listing.page_info()
+
+    def _is_next_page_request(self, session_id: str, text: str) -> bool:
+        """'more' / 'next page' while a slot listing with further pages is open."""
+        if text.lower().strip(' .!?') not in self.NEXT_PAGE_PHRASES or session_id not in self.sessions:
+            return False
+        listing = SlotListing.load(self.sessions[session_id].context)
+        return bool(listing and listing.page_info()['next_cursor'])
+
+    def _slot_page_response(self, session_id: str, text: str, cursor: Optional[str]) -> Generator:
+        """
+        Answer a page request (explicit cursor, or 'more') from the session's slot listing.
+        Slot lookups are yielded as a turn step (see _turn_steps).
+        """
+        if session_id not in self.sessions:
+            self.sessions[session_id] = SessionContext()
+        context = self.sessions[session_id].context
+        listing = SlotListing.load(context)
+        result = {'intent': 'view_slots', 'action': None, 'screen': None, 'params': {}, 'entities': {}}
+        offset = None
+        if listing:
+            offset = listing.offset_for(cursor) if cursor else listing.offset + listing.page_size
+        if offset is None:
+            result['response'] = "That slot list is no longer available. Please search for slots again."
+        else:
+            turn = current_turn()
+            if turn and turn.page_size:
+                listing.page_size = clamp_page_size(turn.page_size)
+            listing.offset = offset
+            listing.save(context)
+            result['data'] = yield ('_slot_page', (listing,))
+            result['page'] = listing.page_info()
+            result['response'] = f"Here are slots {offset + 1}-{offset + len(result['data'])} of {listing.total}:"
+            result['action'] = 'display'
+            result['screen'] = 'slots'
+        result['typing_delay_ms'] = self._typing_delay_hint()
+        self.sessions[session_id].add_to_history(text, result['response'])
+        return result
+
     def _fetch_slot_details(self, slot_id: str) -> dict:
         """
         Fetch slot details by slot ID.
         """
         try:
-            response = requests.get(f"{BACKEND_URL}/api/slots/slot/{slot_id}")
+            response = self.backend.get('slot_detail', f"/api/slots/slot/{slot_id}")
             response.raise_for_status()
             return response.json()
         except Exception as e:
             self.logger.error(f"Failed to fetch slot details for {slot_id}: {str(e)}")
             return {}
 
+    async def _fetch_slot_details_async(self, slot_id: str) -> dict:
+        try:
+            return await self._get_json_async('slot_detail', f"/api/slots/slot/{slot_id}")
+        except Exception as e:
+            self.logger.error(f"Failed to fetch slot details for {slot_id}: {str(e)}")
+            return {}
+
     def proxy_to_backend(self, intent: Dict[str, Any]) -> Dict[str, Any]:
         """
         Proxy request to backend based on intent.
         """
+        return self._run_steps(self._login_proxy_steps(intent))
+
+    async def proxy_to_backend_async(self, intent: Dict[str, Any]) -> Dict[str, Any]:
+        """proxy_to_backend for the event loop, with its requests awaited on the async client."""
+        return await self._run_steps_async(self._login_proxy_steps(intent))
+
+    def _login_proxy_steps(self, intent: Dict[str, Any]) -> Generator:
+        """proxy_to_backend as turn steps (see _turn_steps)."""
         self.logger.info(f"Proxying to backend for intent: {intent['intent']}")
         try:
             if intent['intent'] == 'navigate_search_stations':
                 # Fetch stations
-                response = requests.get(f"{BACKEND_URL}/api/stations")
-                response.raise_for_status()
-                data = response.json()
+                data = (yield ('_loaded_station_directory', ())).stations()
                 self.logger.info("Successfully fetched stations")
                 return {'status': 'success', 'data': data}
             elif intent['intent'] == 'navigate_bookings':
                 # Login with provided credentials
-                token = self.login_and_get_token("avinash46479@gmail.com", "949367@Sv")
+                token = yield ('login_and_get_token', ("avinash46479@gmail.com", "949367@Sv"))
                 if not token:
                     return {'status': 'error', 'message': 'Authentication failed'}
                 # Fetch user bookings
                 headers = {'Authorization': f'Bearer {token}'}
-                response = requests.get(f"{BACKEND_URL}/api/user/bookings", headers=headers)
-                response.raise_for_status()
-                data = response.json()
+                data = yield ('_get_json', ('user_bookings', "/api/user/bookings", headers))
                 self.logger.info("Successfully fetched bookings")
                 bookings_data = data.get('bookings', [])
                 if not isinstance(bookings_data, list):
@@ -1,7 +1,13 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
+import hmac
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional
+from config import PROFILE_ON_REQUEST, AI_EXECUTION_MODE, OCCUPANCY_INGEST_TOKEN
 from ai_handler import AIHandler
+from metrics import REGISTRY
 
 app = FastAPI(title="Park-Pro AI Service", version="1.0.0")
 
@@ -24,25 +30,92 @@ class ChatRequest(BaseModel):
     text: str
     session_id: str
     token: str = ""
+    # Slot listings: page size, and a cursor from a previous response's `page` to fetch another page
+    page_size: Optional[int] = None
+    cursor: Optional[str] = None
+
+class BatchChatRequest(BaseModel):
+    items: List[ChatRequest]
 
 class ProcessIntentRequest(BaseModel):
     intent: dict
 
+class OccupancyBatch(BaseModel):
+    # {stationId, slotId, occupied, ts} readings from slot sensors
+    events: List[dict]
+
 @app.get("/health")
 def health_check():
-    return {"status": "ok", "message": "AI Service is running"}
+    return {
+        "status": "ok",
+        "message": "AI Service is running",
+        "sessions": ai_handler.model.session_backend.stats(),
+        "nlu_cache": ai_handler.model.nlu_cache.stats(),
+        "slot_cache": ai_handler.model.slot_cache.stats(),
+        "occupancy": ai_handler.model.occupancy.stats(),
+    }
+
+@app.get("/metrics")
+def metrics():
+    """Prometheus metrics of this worker: stage, branch and backend latencies, intent/fallback/error/cache counters."""
+    return Response(content=REGISTRY.render(), media_type=REGISTRY.CONTENT_TYPE)
+
+@app.on_event("shutdown")
+async def close_backend_clients():
+    await ai_handler.model.aclose()
+
+# With AI_EXECUTION_MODE=async, /chat, /process and /process_intent answer on the event loop;
+# otherwise they run the sync code on Starlette's threadpool, as sync endpoints would.
 
 @app.post("/process")
-def process_text(request: ProcessRequest):
-    result = ai_handler.process_text(request.text)
-    return result
+async def process_text(request: ProcessRequest):
+    if AI_EXECUTION_MODE == "async":
+        return await ai_handler.process_text_async(request.text)
+    return await run_in_threadpool(ai_handler.process_text, request.text)
+
+def wants_profile(query_flag: bool, header: Optional[str]) -> bool:
+    """Profiling is requested with ?profile=1 or an X-Profile: 1 header, if PROFILE_ON_REQUEST allows it."""
+    requested = query_flag or (header or "").strip().lower() in ("1", "true", "yes")
+    return PROFILE_ON_REQUEST and requested
 
 @app.post("/chat")
-def chat(request: ChatRequest):
-    result = ai_handler.process_text(request.text, request.session_id, request.token)
+async def chat(request: ChatRequest, profile: bool = Query(False), x_profile: Optional[str] = Header(None)):
+    args = (request.text, request.session_id, request.token, request.page_size, request.cursor,
+            wants_profile(profile, x_profile))
+    if AI_EXECUTION_MODE == "async":
+        return await ai_handler.process_text_async(*args)
+    return await run_in_threadpool(ai_handler.process_text, *args)
+
+@app.post("/chat/stream")
+def chat_stream(request: ChatRequest, profile: bool = Query(False), x_profile: Optional[str] = Header(None)):
+    """Server-Sent Events variant of /chat: intent, per-station slot batches, follow-up, then the full result."""
+    events = ai_handler.stream_text(request.text, request.session_id, request.token,
+                                    request.page_size, request.cursor, wants_profile(profile, x_profile))
+    return StreamingResponse((f"event: {event}\ndata: {payload}\n\n" for event, payload in events),
+                             media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@app.post("/chat/batch")
+def chat_batch(request: BatchChatRequest):
+    result = ai_handler.process_batch([
+        {'session_id': item.session_id, 'text': item.text, 'token': item.token,
+         'page_size': item.page_size, 'cursor': item.cursor} for item in request.items
+    ])
     return result
 
 @app.post("/process_intent")
-def process_intent(request: ProcessIntentRequest):
-    result = ai_handler.model.proxy_to_backend(request.intent)
-    return result
+async def process_intent(request: ProcessIntentRequest):
+    if AI_EXECUTION_MODE == "async":
+        return await ai_handler.model.proxy_to_backend_async(request.intent)
+    return await run_in_threadpool(ai_handler.model.proxy_to_backend, request.intent)
+
+@app.post("/iot/occupancy")
+def ingest_occupancy(batch: OccupancyBatch, x_sensor_token: Optional[str] = Header(None)):
+    """
+    Batched slot occupancy events from the parking sensors (see occupancy_simulator.py for the format).
+    Each worker process keeps its own occupancy map, so gateways must send every batch to every worker.
+    """
+    if not OCCUPANCY_INGEST_TOKEN:
+        raise HTTPException(status_code=404, detail="Occupancy ingestion is disabled (OCCUPANCY_INGEST_TOKEN is not set)")
+    if not hmac.compare_digest((x_sensor_token or "").encode(), OCCUPANCY_INGEST_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid sensor token")
+    return ai_handler.model.occupancy.ingest(batch.events)
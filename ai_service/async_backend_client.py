@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import aiohttp
+import requests
+
+from backend_client import DEFAULT_ENDPOINT_TIMEOUTS, parse_endpoint_names, parse_endpoint_timeouts, request_key
+from config import (
+    BACKEND_URL,
+    BACKEND_CONNECT_TIMEOUT,
+    BACKEND_READ_TIMEOUT,
+    BACKEND_ENDPOINT_TIMEOUTS,
+    ASYNC_BACKEND_MAX_CONNECTIONS,
+    BACKEND_COALESCE_ENDPOINTS,
+)
+from metrics import BACKEND_COALESCED, BACKEND_ERRORS, BACKEND_SECONDS
+from profiling import record_backend_call
+from resilience import CircuitBreakers, CircuitOpenError, DeadlineExceeded, RetryPolicy, deadline_timeout
+from turn_context import time_left, without_deadline
+
+
+class _AsyncSharedGet:
+    __slots__ = ('task', 'holders')
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        # Joinable until both the task and the first caller are through with it
+        self.holders = 2
+
+
+class AsyncSingleFlight:
+    """
+    SingleFlight for coroutines on one event loop: identical GETs in flight at
+    the same time share one request. It runs as its own task with the endpoint's
+    full timeout, free of any one caller's turn deadline, and each caller gives
+    up with DeadlineExceeded when its own deadline passes first. A caller that
+    is cancelled stops waiting; the request goes on for the others.
+    """
+    def __init__(self):
+        self._in_flight: Dict[Tuple, _AsyncSharedGet] = {}
+
+    async def do(self, key: Tuple, endpoint: str, send: Callable[[], Awaitable[requests.Response]]) -> requests.Response:
+        remaining = time_left()
+        if remaining is not None and remaining <= 0:
+            BACKEND_ERRORS.inc(endpoint=endpoint, reason='deadline')
+            raise DeadlineExceeded("Turn deadline exceeded")
+        entry = self._in_flight.get(key)
+        leader = entry is None
+        BACKEND_COALESCED.inc(endpoint=endpoint, role='leader' if leader else 'follower')
+        if leader:
+            with without_deadline():
+                # The task runs in a copy of this context, made here
+                entry = self._in_flight[key] = _AsyncSharedGet(asyncio.ensure_future(send()))
+            entry.task.add_done_callback(lambda task: self._release(key, entry))
+        try:
+            return await asyncio.wait_for(asyncio.shield(entry.task), remaining)
+        except asyncio.TimeoutError:
+            BACKEND_ERRORS.inc(endpoint=endpoint, reason='deadline')
+            raise DeadlineExceeded("Turn deadline exceeded") from None
+        finally:
+            if leader:
+                self._release(key, entry)
+
+    def _release(self, key: Tuple, entry: _AsyncSharedGet) -> None:
+        entry.holders -= 1
+        if not entry.holders:
+            del self._in_flight[key]
+
+
+class AsyncBackendClient:
+    """
+    Awaitable counterpart of BackendClient for the async execution mode.
+
+    Requests share one aiohttp.ClientSession connection pool, created on first
+    use in the running event loop, and use the same per-endpoint (connect, read)
+    timeouts, deadline, circuit breakers, retries, metrics and profile records as
+    BackendClient (pass it the same `breakers` and `retries` to share their
+    state), and identical concurrent GETs to the `coalesce` endpoints share one
+    request. Responses and errors
+    are converted to their requests equivalents, so code written against
+    BackendClient handles both. Cookies are never stored.
+    """
+    def __init__(self, base_url: str = BACKEND_URL,
+                 max_connections: int = ASYNC_BACKEND_MAX_CONNECTIONS,
+                 connect_timeout: float = BACKEND_CONNECT_TIMEOUT,
+                 read_timeout: float = BACKEND_READ_TIMEOUT,
+                 endpoint_timeouts: Optional[Dict[str, Tuple[float, float]]] = None,
+                 breakers: Optional[CircuitBreakers] = None,
+                 retries: Optional[RetryPolicy] = None,
+                 coalesce: Optional[frozenset] = None):
+        self.logger = logging.getLogger(__name__)
+        self.base_url = base_url.rstrip('/')
+        self.max_connections = max_connections
+        self.default_timeout = (connect_timeout, read_timeout)
+        self.endpoint_timeouts = dict(DEFAULT_ENDPOINT_TIMEOUTS)
+        self.endpoint_timeouts.update(parse_endpoint_timeouts(BACKEND_ENDPOINT_TIMEOUTS))
+        if endpoint_timeouts:
+            self.endpoint_timeouts.update(endpoint_timeouts)
+        self.breakers = breakers or CircuitBreakers()
+        self.retries = retries or RetryPolicy()
+        self.coalesce = parse_endpoint_names(BACKEND_COALESCE_ENDPOINTS) if coalesce is None else coalesce
+        self.single_flight = AsyncSingleFlight()
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    def timeout_for(self, endpoint: str) -> Tuple[float, float]:
+        """Get the (connect, read) timeout for an endpoint."""
+        return self.endpoint_timeouts.get(endpoint, self.default_timeout)
+
+    def _session(self) -> aiohttp.ClientSession:
+        if self.session is None:
+            self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.max_connections),
+                                                 cookie_jar=aiohttp.DummyCookieJar())
+        return self.session
+
+    async def request(self, method: str, endpoint: str, path: str, **kwargs) -> requests.Response:
+        """
+        Send a request to the backend; arguments are those of BackendClient.request.
+        Raises requests.RequestException subclasses on connection errors and timeouts.
+        """
+        if method == 'GET' and endpoint in self.coalesce:
+            return await self.single_flight.do(request_key(method, path, kwargs), endpoint,
+                                               lambda: self._send(method, endpoint, path, kwargs))
+        return await self._send(method, endpoint, path, kwargs)
+
+    async def _send(self, method: str, endpoint: str, path: str, kwargs: Dict[str, Any]) -> requests.Response:
+        """Send one request, retrying it as the retry policy allows."""
+        timeout = tuple(kwargs.get('timeout') or self.timeout_for(endpoint))
+        breaker = self.breakers.get(endpoint)
+        self.retries.budget.deposit()
+        attempt = 0
+        while True:
+            response, error = None, None
+            try:
+                response = await self._send_once(method, endpoint, path, kwargs, timeout, breaker)
+            except requests.RequestException as e:
+                error = e
+            delay = self.retries.delay(method, endpoint, attempt, response, error)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _send_once(self, method: str, endpoint: str, path: str, kwargs: Dict[str, Any],
+                         full_timeout: Tuple[float, float], breaker) -> requests.Response:
+        try:
+            connect, read = deadline_timeout(full_timeout) if method == 'GET' else full_timeout
+        except DeadlineExceeded:
+            BACKEND_ERRORS.inc(endpoint=endpoint, reason='deadline')
+            raise
+        if not breaker.allow():
+            BACKEND_ERRORS.inc(endpoint=endpoint, reason='circuit_open')
+            raise CircuitOpenError(f"Backend endpoint {endpoint} is unavailable (circuit open)")
+        url = f"{self.base_url}{path}"
+        start = time.perf_counter()
+        status = None
+        try:
+            async with self._session().request(method, url, params=kwargs.get('params'), json=kwargs.get('json'),
+                                               headers=kwargs.get('headers'),
+                                               timeout=aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+                                               ) as response:
+                content = await response.read()
+                status = response.status
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            BACKEND_ERRORS.inc(endpoint=endpoint, reason=type(e).__name__)
+            if isinstance(e, asyncio.TimeoutError) and (connect, read) != full_timeout:
+                # Cut short by the turn's deadline, not necessarily the backend's fault
+                breaker.release()
+            else:
+                breaker.record_failure()
+            if isinstance(e, asyncio.TimeoutError):
+                raise requests.Timeout(f"{method} {url} timed out") from e
+            raise requests.ConnectionError(f"{method} {url}: {e}") from e
+        finally:
+            elapsed = time.perf_counter() - start
+            BACKEND_SECONDS.observe(elapsed, endpoint=endpoint, method=method)
+            record_backend_call(endpoint, method, status, start, elapsed)
+        if status >= 500:
+            BACKEND_ERRORS.inc(endpoint=endpoint, reason=f"http_{status}")
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+        converted = requests.Response()
+        converted.status_code = status
+        converted._content = content
+        converted.headers = requests.structures.CaseInsensitiveDict(response.headers)
+        converted.encoding = response.charset or 'utf-8'
+        converted.reason = response.reason
+        converted.url = str(response.url)
+        return converted
+
+    async def get(self, endpoint: str, path: str, **kwargs) -> requests.Response:
+        return await self.request('GET', endpoint, path, **kwargs)
+
+    async def post(self, endpoint: str, path: str, **kwargs) -> requests.Response:
+        return await self.request('POST', endpoint, path, **kwargs)
+
+    async def aclose(self) -> None:
+        """Close all pooled connections."""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
@@ -0,0 +1,391 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import contextvars
+from http.cookiejar import DefaultCookiePolicy
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import (
+    BACKEND_URL,
+    BACKEND_POOL_CONNECTIONS,
+    BACKEND_POOL_MAXSIZE,
+    BACKEND_POOL_BLOCK,
+    BACKEND_CONNECT_TIMEOUT,
+    BACKEND_READ_TIMEOUT,
+    BACKEND_ENDPOINT_TIMEOUTS,
+    BACKEND_COALESCE_ENDPOINTS,
+    BACKEND_COALESCE_WORKERS,
+    BATCH_MEMO_ENDPOINTS,
+)
+from metrics import BACKEND_COALESCED, BACKEND_ERRORS, BACKEND_SECONDS, CACHE_LOOKUPS
+from profiling import record_backend_call
+from resilience import CircuitBreakers, CircuitOpenError, DeadlineExceeded, RetryPolicy, deadline_timeout
+from turn_context import time_left, without_deadline
+
+# (connect, read) timeouts for endpoints that need something other than the defaults
+DEFAULT_ENDPOINT_TIMEOUTS: Dict[str, Tuple[float, float]] = {
+    'auth_login': (BACKEND_CONNECT_TIMEOUT, 5.0),
+    'user_by_email': (BACKEND_CONNECT_TIMEOUT, 5.0),
+    'user_vehicles': (BACKEND_CONNECT_TIMEOUT, 5.0),
+    'slot_detail': (BACKEND_CONNECT_TIMEOUT, 5.0),
+    'station_detail': (BACKEND_CONNECT_TIMEOUT, 5.0),
+    'slots': (BACKEND_CONNECT_TIMEOUT, 30.0),  # full slot collection
+    'create_booking': (BACKEND_CONNECT_TIMEOUT, 20.0),  # may create a payment order
+}
+
+
+def parse_endpoint_timeouts(spec: str) -> Dict[str, Tuple[float, float]]:
+    """
+    Parse "endpoint=connect:read,..." into a timeout map.
+    A single number ("endpoint=5") sets only the read timeout.
+    """
+    timeouts = {}
+    for item in spec.split(','):
+        item = item.strip()
+        if not item or '=' not in item:
+            continue
+        name, value = item.split('=', 1)
+        parts = value.split(':')
+        try:
+            if len(parts) == 2:
+                timeouts[name.strip()] = (float(parts[0]), float(parts[1]))
+            else:
+                timeouts[name.strip()] = (BACKEND_CONNECT_TIMEOUT, float(parts[0]))
+        except ValueError:
+            logging.getLogger(__name__).warning(f"Ignoring invalid backend timeout override: {item}")
+    return timeouts
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable form of request params/headers for use in a memo key."""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), str(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return tuple(map(_freeze, value))
+    return value
+
+
+def request_key(method: str, path: str, kwargs: Dict[str, Any]) -> Tuple:
+    """Identity of a backend request: method, path, params, headers and JSON body."""
+    return (method, path, _freeze(kwargs.get('params')), _freeze(kwargs.get('headers')),
+            _freeze(kwargs.get('json')))
+
+
+class _SharedGet:
+    """A GET sent once and handed to every caller that asked for it."""
+    __slots__ = ('done', 'response', 'error', 'holders')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response: Optional[requests.Response] = None
+        self.error: Optional[BaseException] = None
+        # Joinable until both the send and the first caller are through with it
+        self.holders = 1
+
+
+class RequestMemo:
+    """
+    GET responses shared across one unit of work, such as a /chat/batch request.
+
+    Only GETs to the `endpoints` given (by default the station lists, which
+    a batch's utterances keep asking for and which bookings don't change) go
+    through the memo. The first caller of an identical GET (same path, params
+    and headers) sends it; concurrent and later callers wait for and reuse that
+    response. Errors are not kept: when the request fails, its waiters send
+    their own and the next caller tries again. Any other request, such as a
+    booking POST, clears the memo, so later reads see what it changed.
+    Responses are not streamed, so each caller's .json() parses its own copy
+    of the body.
+    """
+    def __init__(self, endpoints: Optional[frozenset] = None):
+        self.endpoints = parse_endpoint_names(BATCH_MEMO_ENDPOINTS) if endpoints is None else endpoints
+        self._entries: Dict[Tuple, _SharedGet] = {}
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.reused = 0
+
+    def covers(self, method: str, endpoint: str) -> bool:
+        """Whether this request goes through fetch()."""
+        return method == 'GET' and endpoint in self.endpoints
+
+    def write(self, method: str, endpoint: str) -> None:
+        """A request not covered by the memo is about to be sent: forget every response kept so far."""
+        if method != 'GET':
+            with self._lock:
+                self._entries.clear()
+
+    def fetch(self, key: Tuple, send: Callable[[], requests.Response]) -> requests.Response:
+        """The response for `key`; `send` sends the request."""
+        with self._lock:
+            entry = self._entries.get(key)
+            leader = entry is None
+            if leader:
+                entry = self._entries[key] = _SharedGet()
+                self.sent += 1
+            else:
+                self.reused += 1
+        CACHE_LOOKUPS.inc(cache='request_memo', result='miss' if leader else 'hit')
+        if not leader:
+            entry.done.wait()
+            if entry.error is None:
+                return entry.response
+            return send()
+        try:
+            entry.response = send()
+        except BaseException as e:
+            entry.error = e
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            raise
+        finally:
+            entry.done.set()
+        return entry.response
+
+
+def parse_endpoint_names(spec: str) -> frozenset:
+    """Parse "endpoint,endpoint,..." into a set of endpoint names."""
+    return frozenset(name.strip() for name in spec.split(',') if name.strip())
+
+
+class SingleFlight:
+    """
+    Identical GETs in flight at the same time, from any thread, share one request.
+
+    The first caller starts it; callers arriving while it is in flight wait for
+    its response (or error) instead of sending their own. Nothing is kept once
+    it completes, so a later caller sends a fresh request. The request is sent
+    with the endpoint's full timeout, free of any one caller's turn deadline
+    (on a `max_workers` pool when the first caller has one), and each caller,
+    the first included, gives up with DeadlineExceeded when its own turn's
+    deadline passes first.
+    """
+    def __init__(self, max_workers: int = BACKEND_COALESCE_WORKERS):
+        self._in_flight: Dict[Tuple, _SharedGet] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='single-flight')
+
+    def do(self, key: Tuple, endpoint: str, send: Callable[[], requests.Response]) -> requests.Response:
+        remaining = time_left()
+        if remaining is not None and remaining <= 0:
+            BACKEND_ERRORS.inc(endpoint=endpoint, reason='deadline')
+            raise DeadlineExceeded("Turn deadline exceeded")
+        with self._lock:
+            entry = self._in_flight.get(key)
+            leader = entry is None
+            if leader:
+                entry = self._in_flight[key] = _SharedGet()
+        BACKEND_COALESCED.inc(endpoint=endpoint, role='leader' if leader else 'follower')
+        if leader and remaining is None:
+            self._send(key, entry, send)
+        elif leader:
+            # Shared with other turns, so this turn's deadline only bounds the wait below.
+            # It stays joinable until this caller is through too, as if it had sent it itself.
+            entry.holders += 1
+            self._pool.submit(contextvars.copy_context().run, self._send, key, entry, send)
+        try:
+            if not entry.done.wait(None if remaining is None else max(remaining, 0)):
+                BACKEND_ERRORS.inc(endpoint=endpoint, reason='deadline')
+                raise DeadlineExceeded("Turn deadline exceeded")
+        finally:
+            if leader and remaining is not None:
+                self._release(key, entry)
+        if entry.error is not None:
+            raise entry.error
+        return entry.response
+
+    def _send(self, key: Tuple, entry: _SharedGet, send: Callable[[], requests.Response]) -> None:
+        try:
+            with without_deadline():
+                entry.response = send()
+        except BaseException as e:
+            entry.error = e
+        finally:
+            self._release(key, entry)
+            entry.done.set()
+
+    def _release(self, key: Tuple, entry: _SharedGet) -> None:
+        with self._lock:
+            entry.holders -= 1
+            if not entry.holders:
+                del self._in_flight[key]
+
+
+# Memo of the unit of work the current context belongs to, if any
+_request_memo: contextvars.ContextVar[Optional[RequestMemo]] = contextvars.ContextVar('backend_request_memo', default=None)
+
+
+@contextmanager
+def memo_scope(memo: RequestMemo) -> Iterator[RequestMemo]:
+    """Send the backend requests made inside this block through `memo`."""
+    token = _request_memo.set(memo)
+    try:
+        yield memo
+    finally:
+        _request_memo.reset(token)
+
+
+@contextmanager
+def shared_gets() -> Iterator[RequestMemo]:
+    """
+    Deduplicate identical backend GETs made inside this block.
+    Worker threads take part when their tasks run in a copy of this context
+    (contextvars.copy_context().run).
+    """
+    with memo_scope(RequestMemo()) as memo:
+        yield memo
+
+
+class BackendClient:
+    """
+    Shared HTTP client for all calls from the AI service to the Node backend.
+
+    Requests go through one requests.Session with a keep-alive connection pool,
+    so concurrent chat turns reuse TCP connections instead of opening a new one
+    per call. Every request gets a (connect, read) timeout looked up by endpoint
+    name. GETs are cut short when the current turn's deadline is nearer; writes
+    are not, since one abandoned mid-flight may still be applied. Each endpoint has
+    a circuit breaker, and failed GETs are retried as `retries` allows. Identical
+    concurrent GETs to the `coalesce` endpoints share one request (SingleFlight).
+    Cookies are never stored, because the session is shared between users.
+    """
+    def __init__(self, base_url: str = BACKEND_URL,
+                 pool_connections: int = BACKEND_POOL_CONNECTIONS,
+                 pool_maxsize: int = BACKEND_POOL_MAXSIZE,
+                 pool_block: bool = BACKEND_POOL_BLOCK,
+                 connect_timeout: float = BACKEND_CONNECT_TIMEOUT,
+                 read_timeout: float = BACKEND_READ_TIMEOUT,
+                 endpoint_timeouts: Optional[Dict[str, Tuple[float, float]]] = None,
+                 breakers: Optional[CircuitBreakers] = None,
+                 retries: Optional[RetryPolicy] = None,
+                 coalesce: Optional[frozenset] = None):
+        self.logger = logging.getLogger(__name__)
+        self.base_url = base_url.rstrip('/')
+        self.default_timeout = (connect_timeout, read_timeout)
+        self.endpoint_timeouts = dict(DEFAULT_ENDPOINT_TIMEOUTS)
+        self.endpoint_timeouts.update(parse_endpoint_timeouts(BACKEND_ENDPOINT_TIMEOUTS))
+        if endpoint_timeouts:
+            self.endpoint_timeouts.update(endpoint_timeouts)
+        self.breakers = breakers or CircuitBreakers()
+        self.retries = retries or RetryPolicy()
+        self.coalesce = parse_endpoint_names(BACKEND_COALESCE_ENDPOINTS) if coalesce is None else coalesce
+        self.single_flight = SingleFlight()
+
+        self.session = requests.Session()
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(pool_connections=pool_connections,
+                              pool_maxsize=pool_maxsize,
+                              pool_block=pool_block,
+                              max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def timeout_for(self, endpoint: str) -> Tuple[float, float]:
+        """Get the (connect, read) timeout for an endpoint."""
+        return self.endpoint_timeouts.get(endpoint, self.default_timeout)
+
+    def request(self, method: str, endpoint: str, path: str, **kwargs) -> requests.Response:
+        """
+        Send a request to the backend.
+        `endpoint` is a short route name (e.g. 'slots_by_station') used to pick timeouts;
+        `path` is the URL path below the backend base URL.
+        """
+        kwargs.setdefault('timeout', self.timeout_for(endpoint))
+        key = request_key(method, path, kwargs)
+
+        def send() -> requests.Response:
+            if method == 'GET' and endpoint in self.coalesce:
+                return self.single_flight.do(key, endpoint, lambda: self._send(method, endpoint, path, kwargs))
+            return self._send(method, endpoint, path, kwargs)
+
+        memo = _request_memo.get()
+        if memo is not None:
+            if memo.covers(method, endpoint):
+                return memo.fetch(key, send)
+            memo.write(method, endpoint)
+        return send()
+
+    def _send(self, method: str, endpoint: str, path: str, kwargs: Dict[str, Any]) -> requests.Response:
+        """Send one request, retrying it as the retry policy allows."""
+        breaker = self.breakers.get(endpoint)
+        self.retries.budget.deposit()
+        attempt = 0
+        while True:
+            response, error = None, None
+            try:
+                response = self._send_once(method, endpoint, path, kwargs, breaker)
+            except requests.RequestException as e:
+                error = e
+            delay = self.retries.delay(method, endpoint, attempt, response, error)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            time.sleep(delay)
+            attempt += 1
+
+    def _send_once(self, method: str, endpoint: str, path: str, kwargs: Dict[str, Any],
+                   breaker) -> requests.Response:
+        """Send one HTTP request, recording its latency and failures per endpoint."""
+        try:
+            timeout = deadline_timeout(kwargs['timeout']) if method == 'GET' else tuple(kwargs['timeout'])
+        except DeadlineExceeded:
+            BACKEND_ERRORS.inc(endpoint=endpoint, reason='deadline')
+            raise
+        if not breaker.allow():
+            BACKEND_ERRORS.inc(endpoint=endpoint, reason='circuit_open')
+            raise CircuitOpenError(f"Backend endpoint {endpoint} is unavailable (circuit open)")
+        start = time.perf_counter()
+        status = None
+        try:
+            response = self.session.request(method, f"{self.base_url}{path}", **dict(kwargs, timeout=timeout))
+            status = response.status_code
+        except requests.RequestException as e:
+            BACKEND_ERRORS.inc(endpoint=endpoint, reason=type(e).__name__)
+            if isinstance(e, requests.Timeout) and timeout != tuple(kwargs['timeout']):
+                # Cut short by the turn's deadline, not necessarily the backend's fault
+                breaker.release()
+            else:
+                breaker.record_failure()
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            BACKEND_SECONDS.observe(elapsed, endpoint=endpoint, method=method)
+            record_backend_call(endpoint, method, status, start, elapsed)
+        if response.status_code >= 500:
+            BACKEND_ERRORS.inc(endpoint=endpoint, reason=f"http_{response.status_code}")
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    def get(self, endpoint: str, path: str, **kwargs) -> requests.Response:
+        return self.request('GET', endpoint, path, **kwargs)
+
+    def post(self, endpoint: str, path: str, **kwargs) -> requests.Response:
+        return self.request('POST', endpoint, path, **kwargs)
+
+    def close(self):
+        """Close all pooled connections."""
+        self.session.close()
+
+
+_shared_client: Optional[BackendClient] = None
+_shared_client_lock = threading.Lock()
+
+
+def get_backend_client() -> BackendClient:
+    """
+    Get the process-wide backend client, creating it on first use.
+    """
+    global _shared_client
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                _shared_client = BackendClient()
+    return _shared_client
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Threadpool vs async execution mode under concurrent chat load.
+
+Runs the loadgen conversation scripts against a freshly spawned AI service
+in each AI_EXECUTION_MODE, with the same fake backend settings, and compares
+throughput, latency percentiles, errors and server memory.
+
+Usage: python bench_async.py [--users 200] [--duration 20] [--backend-latency-ms 50] [--output FILE]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+import loadgen
+
+MODES = ('threadpool', 'async')
+
+
+def run_mode(mode: str, index: int, args) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, f"{mode}.json")
+        print(f"\n=== {mode}: {args.users} users, backend latency {args.backend_latency_ms} ms ===")
+        loadgen.main(['--spawn', '--mode', mode, '--users', str(args.users), '--duration', str(args.duration),
+                      '--ramp-up', str(args.ramp_up), '--interval', str(args.interval),
+                      '--backend-latency-ms', str(args.backend_latency_ms),
+                      '--backend-jitter-ms', str(args.backend_jitter_ms),
+                      '--port', str(args.port + index), '--backend-port', str(args.backend_port + index),
+                      '--output', output])
+        with open(output) as f:
+            return json.load(f)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--ramp-up', type=float, default=3)
+    parser.add_argument('--interval', type=float, default=5)
+    parser.add_argument('--backend-latency-ms', type=float, default=50)
+    parser.add_argument('--backend-jitter-ms', type=float, default=10)
+    parser.add_argument('--port', type=int, default=8770)
+    parser.add_argument('--backend-port', type=int, default=5070)
+    parser.add_argument('--output', help="write both summaries as JSON to this file")
+    args = parser.parse_args(argv)
+
+    summaries = {mode: run_mode(mode, index, args) for index, mode in enumerate(MODES)}
+
+    print(f"\n{'mode':12s} {'turns/s':>9s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'errors':>8s} {'rss +MB':>8s}")
+    for mode, summary in summaries.items():
+        latency = summary['latency']
+        growth = summary['memory']['growth_mb'] if summary['memory'] else float('nan')
+        print(f"{mode:12s} {summary['turns_per_sec']:9.1f} {latency['p50_ms']:9.1f} {latency['p95_ms']:9.1f} "
+              f"{latency['p99_ms']:9.1f} {summary['error_rate']:8.2%} {growth:8.1f}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summaries, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
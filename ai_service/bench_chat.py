@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for chat turns served from a fixed-size thread pool,
+the way FastAPI runs the sync /chat endpoint.
+
+Compares the old server-side thinking delay (time.sleep on the request thread)
+with the typing_delay_ms hint that leaves the delay to the client.
+The backend is replaced by canned responses, so only AI service time is measured.
+
+Usage: python bench_chat.py [turns] [threads]
+"""
+
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ai_model import AIModel
+from bench_nlu import CORPUS
+
+STATIONS = [{'_id': f'oid{i}', 'stationId': f'ST{i:03d}', 'stationName': f'Station {i}',
+             'name': f'Station {i}', 'address': f'Road {i}', 'city': 'bangalore'} for i in range(5)]
+SLOTS = [{'_id': f'slot{i}', 'slotId': f'SL{i}', 'type': 'Car' if i % 2 else 'Bike',
+          'price': 20, 'availability': 'Free'} for i in range(10)]
+
+
+class CannedResponse:
+    def __init__(self, data, status_code=200):
+        self.status_code = status_code
+        self.text = json.dumps(data)
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class CannedBackend:
+    """Stand-in for BackendClient that answers instantly"""
+    def get(self, endpoint, path, **kwargs):
+        if endpoint == 'stations_search':
+            return CannedResponse({'success': True, 'stations': STATIONS})
+        if endpoint == 'stations':
+            return CannedResponse(STATIONS)
+        if endpoint == 'slots_by_station':
+            return CannedResponse(SLOTS)
+        if endpoint == 'user_vehicles':
+            return CannedResponse({'vehicles': [{'_id': 'veh1', 'number': 'KA01AB1234', 'isPrimary': True}]})
+        return CannedResponse({})
+
+    def post(self, endpoint, path, **kwargs):
+        if endpoint == 'create_booking':
+            return CannedResponse({'success': True}, status_code=201)
+        return CannedResponse({})
+
+
+class SleepingAIModel(AIModel):
+    """The previous behaviour: sleep for the thinking delay while holding the request thread"""
+    def _enhance_response_with_personality(self, response: str, intent: str) -> str:
+        time.sleep(self.typing_delay_ms / 1000)
+        return super()._enhance_response_with_personality(response, intent)
+
+
+def run(model: AIModel, turns: int, threads: int):
+    latencies = []
+
+    def turn(i):
+        start = time.perf_counter()
+        model.get_ai_response(f"bench-{i % 50}", CORPUS[i % len(CORPUS)])
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(turn, range(turns)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return turns / elapsed, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99) - 1]
+
+
+if __name__ == "__main__":
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    print(f"{turns} chat turns on {threads} request threads")
+    for label, model_class in [("server-side sleep", SleepingAIModel), ("typing_delay_ms hint", AIModel)]:
+        model = model_class(backend=CannedBackend())
+        throughput, p50, p99 = run(model, turns, threads)
+        print(f"  {label:22s} {throughput:8.1f} turns/sec   p50 {p50 * 1000:7.1f} ms   p99 {p99 * 1000:7.1f} ms")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the NLU hot path.
+Compares the original implementations with the compiled ones:
+- intent scoring: keyword loop in parse_intent vs IntentScorer
+- entity extraction: rule-by-rule re.search vs EntityExtractor
+
+Usage: python bench_nlu.py [rounds]
+"""
+
+import sys
+import time
+
+from ai_model import AIModel
+from intent_scorer import IntentScorer
+from entity_extractor import EntityExtractor
+from test_intent_scorer import legacy_scores
+from test_entity_extractor import legacy_extract_entities
+
+# Fixed utterance corpus, taken from the assistant's test scripts and chat logs
+CORPUS = [
+    "hello", "hi", "hey", "Show me slots", "Show stations in Bangalore", "What can you do?",
+    "Show slots at this station", "Show car slots in Bangalore", "Show available slots",
+    "Book for evening", "I want to book", "Book the first one", "Book that slot",
+    "Book car slot at MG Road station for 2 hours tomorrow at 3pm", "Show available car slots",
+    "Book slot 3", "Tomorrow 2pm to 5pm", "razorpay", "yes", "cancel",
+    "Show all car slots in Bangalore", "Show parking stations with slots", "reserve",
+    "get parking", "rent slot", "at 2pm", "2:30 PM", "15-12-2024", "bike slots",
+    "parking for car", "motorcycle parking", "in banglore", "Show my bookings",
+    "Book slot #5 @ 2pm!", "Show Bangalore stations", "show parking slots in chennai for scooter",
+    "list parking stations near koramangala", "from 9am to 6pm on 12/11/2024", "payment history",
+    "i want to rent a bike parking for 2 hours", "show 5 available van slots in pune",
+]
+
+
+def _time_per_op(func, inputs, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for item in inputs:
+            func(item)
+    elapsed = time.perf_counter() - start
+    return elapsed / (rounds * len(inputs))
+
+
+def bench_intent_scoring(model: AIModel, rounds: int):
+    token_lists = [model.preprocess_text(text) for text in CORPUS]
+    scorer = IntentScorer()
+    for tokens in token_lists:
+        assert legacy_scores(tokens) == scorer.score(tokens), tokens
+
+    legacy = _time_per_op(legacy_scores, token_lists, rounds)
+    compiled = _time_per_op(scorer.score, token_lists, rounds)
+    print("Intent scoring (per utterance)")
+    print(f"  keyword loop:    {legacy * 1e6:8.2f} us  ({1 / legacy:,.0f} ops/sec)")
+    print(f"  inverted index:  {compiled * 1e6:8.2f} us  ({1 / compiled:,.0f} ops/sec)")
+    print(f"  speedup:         {legacy / compiled:8.1f}x")
+
+
+def bench_entity_extraction(rounds: int):
+    extractor = EntityExtractor()
+    for text in CORPUS:
+        assert legacy_extract_entities(text) == extractor.extract(text), text
+
+    legacy = _time_per_op(legacy_extract_entities, CORPUS, rounds)
+    compiled = _time_per_op(extractor.extract, CORPUS, rounds)
+    print("Entity extraction (per utterance)")
+    print(f"  rule-by-rule:    {legacy * 1e6:8.2f} us  ({1 / legacy:,.0f} ops/sec)")
+    print(f"  single pass:     {compiled * 1e6:8.2f} us  ({1 / compiled:,.0f} ops/sec)")
+    print(f"  speedup:         {legacy / compiled:8.1f}x")
+
+
+if __name__ == "__main__":
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    model = AIModel()
+    bench_intent_scoring(model, rounds)
+    bench_entity_extraction(rounds)
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the AI service.
+Starts a fresh interpreter per run and measures how long `import app` takes
+(module imports plus AIHandler/AIModel construction), and the total process time,
+with the bundled tokenizer and with AI_TOKENIZER=nltk.
+
+Usage: python bench_startup.py [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+IMPORT_APP = "import time; start = time.perf_counter(); import app; print(time.perf_counter() - start)"
+
+
+def cold_start(tokenizer: str, runs: int):
+    env = dict(os.environ, AI_TOKENIZER=tokenizer)
+    import_times, process_times = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, "-c", IMPORT_APP], env=env, capture_output=True,
+                                text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        process_times.append(time.perf_counter() - start)
+        import_times.append(float(output.stdout.strip().splitlines()[-1]))
+    return statistics.median(import_times), statistics.median(process_times)
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"Cold start of app.py, median of {runs} runs")
+    for tokenizer in ["builtin", "nltk"]:
+        import_time, process_time = cold_start(tokenizer, runs)
+        print(f"  AI_TOKENIZER={tokenizer:8s} import app {import_time * 1000:7.1f} ms   "
+              f"whole process {process_time * 1000:7.1f} ms")
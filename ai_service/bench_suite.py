@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Reproducible NLU and dialog benchmark suite.
+
+Times preprocess_text, extract_entities and parse_intent over the fixed
+bench_nlu corpus, and whole scripted conversations through get_ai_response
+(including the booking collection flow) against the canned backend from
+bench_chat. Reports ops/sec and p50/p95/p99 per benchmark.
+
+Results are compared with a JSON baseline: a benchmark whose ops/sec drops,
+or whose p50 grows, by more than the threshold fails the run (exit code 1).
+Baselines are machine specific; record one with --update-baseline on the
+machine that runs the comparison.
+
+Usage: python bench_suite.py [--rounds N] [--baseline FILE] [--threshold 0.25]
+                             [--update-baseline] [--only NAME ...] [--output FILE]
+"""
+
+import argparse
+import gc
+import itertools
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Sequence
+
+from ai_model import AIModel
+from bench_chat import CannedBackend
+from bench_nlu import CORPUS
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+SEED = 1234
+# Small pages, so the canned backend's slot lists span several pages
+PAGE_SIZE = 4
+
+# Scripted conversations: (utterance, intent expected for that turn)
+CONVERSATIONS: Dict[str, List[tuple]] = {
+    'booking_collection': [
+        ("hello", 'greet'),
+        ("Show parking stations in Bangalore", 'display_stations'),
+        ("yes", 'unknown'),
+        ("car", 'unknown'),
+        ("tomorrow", 'unknown'),
+        ("from 2:00pm to 5:00pm", 'view_slots_filtered'),
+        ("book slot 2 tomorrow from 2:00pm to 5:00pm", 'book_slot'),
+        ("yes", 'book_slot'),
+        ("coupon", 'book_slot'),
+        ("yes", 'book_slot'),
+    ],
+    'direct_booking': [
+        ("Show car slots in Bangalore", 'view_slots_filtered'),
+        ("book slot 3 tomorrow from 10:00am to 12:00pm", 'book_slot'),
+        ("yes", 'book_slot'),
+        ("razorpay", 'book_slot'),
+        ("yes", 'book_slot'),
+    ],
+    'browse_and_help': [
+        ("hi", 'greet'),
+        ("What can you do?", None),
+        ("Show all car slots in Bangalore", None),
+        ("show more", 'view_slots'),
+        ("qwerty zxcv", None),
+        ("cancel", 'unknown'),
+    ],
+}
+
+
+def summarize(samples: Sequence[float], ops: int) -> Dict[str, float]:
+    """ops/sec over the total measured time, and latency percentiles in microseconds."""
+    ordered = sorted(samples)
+
+    def percentile(fraction):
+        return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))] * 1e6
+
+    return {
+        'ops': ops,
+        'ops_per_sec': round(ops / sum(samples), 1),
+        'p50_us': round(percentile(0.50), 2),
+        'p95_us': round(percentile(0.95), 2),
+        'p99_us': round(percentile(0.99), 2),
+    }
+
+
+def time_calls(func: Callable, inputs: Sequence, rounds: int, warmup: int = 2) -> Dict[str, float]:
+    for _ in range(warmup):
+        for item in inputs:
+            func(item)
+    gc.collect()
+    samples = []
+    clock = time.perf_counter
+    for _ in range(rounds):
+        for item in inputs:
+            start = clock()
+            func(item)
+            samples.append(clock() - start)
+    return summarize(samples, len(samples))
+
+
+def new_model(**kwargs) -> AIModel:
+    model = AIModel(backend=CannedBackend(), **kwargs)
+    # Benchmarks measure the code, not log output
+    logging.disable(logging.INFO)
+    return model
+
+
+def bench_nlu(rounds: int) -> Dict[str, Dict[str, float]]:
+    model = new_model()
+    results = {
+        'preprocess_text': time_calls(model.preprocess_text, CORPUS, rounds),
+        'extract_entities': time_calls(model.extract_entities, CORPUS, rounds),
+        'parse_intent': time_calls(model.parse_intent, CORPUS, rounds),
+    }
+    # Every utterance new: the NLU cache never hits
+    model.nlu_cache.max_entries = 0
+    model.nlu_cache.clear()
+    results['parse_intent_uncached'] = time_calls(model.parse_intent, CORPUS, rounds)
+    return results
+
+
+def check_conversation(model: AIModel, name: str, script: List[tuple]) -> None:
+    """Run a script once and make sure each turn still lands on the expected intent."""
+    session_id = f"check-{name}"
+    for text, expected in script:
+        result = model.get_ai_response(session_id, text, "bench-token", page_size=PAGE_SIZE)
+        if expected is not None and result['intent'] != expected:
+            raise SystemExit(f"Conversation '{name}' broke at {text!r}: got intent {result['intent']!r}, "
+                             f"expected {expected!r}")
+
+
+def bench_conversations(rounds: int) -> Dict[str, Dict[str, float]]:
+    model = new_model()
+    results = {}
+    turn_samples = []
+    sessions = itertools.count()
+    for name, script in CONVERSATIONS.items():
+        random.seed(SEED)
+        check_conversation(model, name, script)
+        samples = []
+        gc.collect()
+        for _ in range(rounds):
+            session_id = f"bench-{name}-{next(sessions)}"
+            start = time.perf_counter()
+            for text, _ in script:
+                turn_start = time.perf_counter()
+                model.get_ai_response(session_id, text, "bench-token", page_size=PAGE_SIZE)
+                turn_samples.append(time.perf_counter() - turn_start)
+            samples.append(time.perf_counter() - start)
+        results[f'conversation:{name}'] = summarize(samples, len(samples))
+    results['chat_turn'] = summarize(turn_samples, len(turn_samples))
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            threshold: float) -> List[str]:
+    """Regressions beyond `threshold` (a fraction) against the baseline."""
+    regressions = []
+    for name, base in baseline.items():
+        current = results.get(name)
+        if current is None:
+            continue
+        if current['ops_per_sec'] < base['ops_per_sec'] * (1 - threshold):
+            regressions.append(f"{name}: {current['ops_per_sec']:,.0f} ops/sec vs baseline {base['ops_per_sec']:,.0f}")
+        if current['p50_us'] > base['p50_us'] * (1 + threshold):
+            regressions.append(f"{name}: p50 {current['p50_us']:,.1f} us vs baseline {base['p50_us']:,.1f} us")
+    return regressions
+
+
+def print_table(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]]) -> None:
+    print(f"{'benchmark':32s} {'ops/sec':>12s} {'p50 us':>10s} {'p95 us':>10s} {'p99 us':>10s} {'vs base':>8s}")
+    for name, stats in results.items():
+        base = baseline.get(name)
+        change = f"{stats['ops_per_sec'] / base['ops_per_sec'] - 1:+.0%}" if base else "-"
+        print(f"{name:32s} {stats['ops_per_sec']:12,.1f} {stats['p50_us']:10,.1f} {stats['p95_us']:10,.1f} "
+              f"{stats['p99_us']:10,.1f} {change:>8s}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rounds', type=int, default=200, help="passes over the corpus / runs per conversation")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument('--threshold', type=float, default=0.25, help="allowed regression, as a fraction")
+    parser.add_argument('--update-baseline', action='store_true', help="write these results as the new baseline")
+    parser.add_argument('--only', nargs='*', choices=['nlu', 'conversations'], help="run only these groups")
+    parser.add_argument('--output', help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    groups = args.only or ['nlu', 'conversations']
+    results = {}
+    if 'nlu' in groups:
+        results.update(bench_nlu(args.rounds))
+    if 'conversations' in groups:
+        results.update(bench_conversations(args.rounds))
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['benchmarks']
+
+    print(f"Python {platform.python_version()} on {platform.machine()}, rounds={args.rounds}")
+    print_table(results, baseline)
+
+    report = {'python': platform.python_version(), 'machine': platform.machine(), 'rounds': args.rounds,
+              'benchmarks': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\nRegressions beyond {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    if baseline:
+        print(f"\nNo regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,3 +9,114 @@ CORS_ORIGINS = [
     "http://localhost:8080",  # Alternative
     "http://localhost:5000",  # Backend
 ]
+
+# Backend client: keep-alive connection pool and timeouts (seconds)
+BACKEND_POOL_CONNECTIONS = int(os.getenv("BACKEND_POOL_CONNECTIONS", "10"))
+BACKEND_POOL_MAXSIZE = int(os.getenv("BACKEND_POOL_MAXSIZE", "20"))
+BACKEND_POOL_BLOCK = os.getenv("BACKEND_POOL_BLOCK", "false").lower() == "true"
+BACKEND_CONNECT_TIMEOUT = float(os.getenv("BACKEND_CONNECT_TIMEOUT", "3.05"))
+BACKEND_READ_TIMEOUT = float(os.getenv("BACKEND_READ_TIMEOUT", "10"))
+# Per-endpoint overrides, e.g. "slots=3.05:30,create_booking=3.05:20"
+BACKEND_ENDPOINT_TIMEOUTS = os.getenv("BACKEND_ENDPOINT_TIMEOUTS", "")
+
+# Per-endpoint circuit breakers: consecutive failures (errors, timeouts, 5xx) that open
+# the circuit, and seconds it stays open before one trial request is let through
+BACKEND_BREAKER_FAILURES = int(os.getenv("BACKEND_BREAKER_FAILURES", "5"))
+BACKEND_BREAKER_RESET = float(os.getenv("BACKEND_BREAKER_RESET", "10"))
+# Retries of failed idempotent GETs: max per request, full-jitter backoff base and cap
+# (seconds), and the retry budget - retries earned per request, and the most banked
+BACKEND_RETRY_MAX = int(os.getenv("BACKEND_RETRY_MAX", "2"))
+BACKEND_RETRY_BACKOFF = float(os.getenv("BACKEND_RETRY_BACKOFF", "0.05"))
+BACKEND_RETRY_BACKOFF_MAX = float(os.getenv("BACKEND_RETRY_BACKOFF_MAX", "1"))
+BACKEND_RETRY_BUDGET_RATIO = float(os.getenv("BACKEND_RETRY_BUDGET_RATIO", "0.2"))
+BACKEND_RETRY_BUDGET_RESERVE = float(os.getenv("BACKEND_RETRY_BUDGET_RESERVE", "10"))
+# Latency budget of a chat turn (seconds, 0 disables): backend GETs are cut off
+# when it is spent, and the turn is answered with the data fetched so far.
+# Writes such as bookings always get their endpoint's full timeout
+TURN_DEADLINE_SECONDS = float(os.getenv("TURN_DEADLINE_SECONDS", "8"))
+
+# GET endpoints whose identical concurrent requests share one in-flight request
+# (comma separated endpoint names; empty disables)
+BACKEND_COALESCE_ENDPOINTS = os.getenv(
+    "BACKEND_COALESCE_ENDPOINTS", "stations,stations_search,station_detail,slots,slots_by_station,slot_detail")
+# Threads that send coalesced GETs for turns with a deadline, detached from the first
+# caller. It caps how many distinct coalesced GETs are in flight across the process:
+# once all are busy, further sends queue and their callers wait until their deadline.
+# Size it for the concurrent turns times BACKEND_FANOUT_CONCURRENCY, not the pool
+BACKEND_COALESCE_WORKERS = int(os.getenv("BACKEND_COALESCE_WORKERS", "64"))
+
+# Max concurrent per-station slot fetches when a query spans many stations
+BACKEND_FANOUT_CONCURRENCY = int(os.getenv("BACKEND_FANOUT_CONCURRENCY", "8"))
+
+# Seconds before the cached station directory is reloaded from /api/stations
+STATION_DIRECTORY_TTL = float(os.getenv("STATION_DIRECTORY_TTL", "300"))
+
+# Per-station slot lists: seconds a list is served as fresh (0 disables the cache), then
+# seconds it may still be served while it is refreshed in the background
+SLOT_CACHE_TTL = float(os.getenv("SLOT_CACHE_TTL", "5"))
+SLOT_CACHE_STALE_TTL = float(os.getenv("SLOT_CACHE_STALE_TTL", "25"))
+# Oldest slot list served to stations with live sensor data while its refreshes keep failing
+SLOT_CACHE_MAX_AGE = float(os.getenv("SLOT_CACHE_MAX_AGE", "300"))
+
+# slotId -> slot summary cache used when booking by slotId
+SLOT_INDEX_TTL = float(os.getenv("SLOT_INDEX_TTL", "900"))
+SLOT_INDEX_MAX_ENTRIES = int(os.getenv("SLOT_INDEX_MAX_ENTRIES", "50000"))
+
+# "Thinking" pause the client should show before revealing a reply (milliseconds).
+# Sent to clients as typing_delay_ms; the server itself never sleeps.
+TYPING_DELAY_MS = int(os.getenv("AI_TYPING_DELAY_MS", "300"))
+
+# In-memory chat sessions: max sessions kept and idle seconds before a session is dropped
+SESSION_MAX_COUNT = int(os.getenv("SESSION_MAX_COUNT", "10000"))
+SESSION_IDLE_TTL = float(os.getenv("SESSION_IDLE_TTL", "3600"))
+# Where sessions are kept between turns: "memory" (this process only) or
+# "sqlite" (a local WAL database shared by all workers, survives restarts)
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "memory").lower()
+SESSION_SQLITE_PATH = os.getenv("SESSION_SQLITE_PATH", "sessions.db")
+
+# Uvicorn worker processes started by run.py (use SESSION_BACKEND=sqlite when > 1)
+AI_WORKERS = int(os.getenv("AI_WORKERS", "1"))
+
+# /chat/batch: sessions processed in parallel, and the largest batch accepted
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "5000"))
+# GET endpoints whose responses a batch reuses across its items (comma separated endpoint names)
+BATCH_MEMO_ENDPOINTS = os.getenv("BATCH_MEMO_ENDPOINTS", "stations,stations_search,station_detail")
+
+# Tokenizer for intent parsing: "builtin" (bundled, no downloads) or "nltk"
+# (imports NLTK and downloads punkt/stopwords at startup)
+TOKENIZER = os.getenv("AI_TOKENIZER", "builtin").lower()
+
+# Max utterances whose tokens/entities/intent scores are cached (0 disables)
+NLU_CACHE_SIZE = int(os.getenv("NLU_CACHE_SIZE", "4096"))
+
+# /chat/stream: turns processed concurrently while their events are streamed
+STREAM_CONCURRENCY = int(os.getenv("STREAM_CONCURRENCY", "32"))
+
+# Profiling: allow clients to request a per-stage timing breakdown (X-Profile header
+# or ?profile=1), and the fraction of turns run under cProfile with the profile
+# written to PROFILE_DIR (0 disables sampling)
+PROFILE_ON_REQUEST = os.getenv("PROFILE_ON_REQUEST", "true").lower() == "true"
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+
+# Slot listings: default and max page size, and how many ranked slotIds a session keeps
+SLOT_PAGE_SIZE = int(os.getenv("SLOT_PAGE_SIZE", "20"))
+SLOT_PAGE_SIZE_MAX = int(os.getenv("SLOT_PAGE_SIZE_MAX", "100"))
+SLOT_RESULTS_TOP_K = int(os.getenv("SLOT_RESULTS_TOP_K", "500"))
+
+# How /chat, /process and /process_intent run turns: "threadpool" (sync code on
+# Starlette's worker threads) or "async" (on the event loop, with an async backend client)
+AI_EXECUTION_MODE = os.getenv("AI_EXECUTION_MODE", "threadpool").lower()
+# Async mode: backend connection pool size
+ASYNC_BACKEND_MAX_CONNECTIONS = int(os.getenv("ASYNC_BACKEND_MAX_CONNECTIONS", "100"))
+
+# Live slot occupancy from the IoT sensors: seconds since a station's last sensor
+# event during which its sensor data is trusted, max events per ingested batch, and
+# the token sensor gateways send in X-Sensor-Token (empty disables /iot/occupancy)
+OCCUPANCY_MAX_AGE = float(os.getenv("OCCUPANCY_MAX_AGE", "60"))
+OCCUPANCY_MAX_BATCH = int(os.getenv("OCCUPANCY_MAX_BATCH", "10000"))
+OCCUPANCY_INGEST_TOKEN = os.getenv("OCCUPANCY_INGEST_TOKEN", "")
+# Most stations, and slots per station, the occupancy map tracks; events for others are dropped
+OCCUPANCY_MAX_STATIONS = int(os.getenv("OCCUPANCY_MAX_STATIONS", "5000"))
+OCCUPANCY_MAX_SLOTS_PER_STATION = int(os.getenv("OCCUPANCY_MAX_SLOTS_PER_STATION", "1000"))
@@ -0,0 +1,176 @@
+import re
+from typing import Dict, FrozenSet, List, Tuple
+
+from intents import (
+    ENTITY_RULES,
+    ENTITY_RULE_TRIGGERS,
+    CITY_CORRECTIONS,
+    CITY_NAMES,
+    VEHICLE_TYPE_WORDS,
+    AVAILABILITY_WORDS,
+    VEHICLE_NAMES,
+    VEHICLE_PATTERNS,
+)
+
+# Internal checks that are gated like ENTITY_RULES entries
+_THIS_STATION = '_this_station'
+_STATION_NAME = '_station_name'
+_VEHICLE_PATTERN = '_vehicle_pattern'
+
+
+def _trie_pattern(words: List[str]) -> str:
+    """
+    Build a regex alternation shaped like a trie of `words`.
+    Branches split on the next character and optional tails are greedy,
+    so the longest word starting at a position is the one captured.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class EntityExtractor:
+    """
+    Entity extraction with every rule compiled once.
+
+    A single regex pass over the lowercased utterance finds all gazetteer words
+    (cities, vehicle types, availability) and the trigger literals of every
+    rule (ENTITY_RULE_TRIGGERS). Only rules whose triggers occurred are then
+    evaluated. The result is the same entity dict, in the same key order, as
+    the original rule-by-rule extraction.
+    """
+    GAZETTEERS = (
+        ('city', CITY_NAMES),
+        ('vehicle_type', VEHICLE_TYPE_WORDS),
+        ('availability', AVAILABILITY_WORDS),
+    )
+
+    def __init__(self):
+        self.rules = {entity: re.compile(regex, re.IGNORECASE) for entity, regex in ENTITY_RULES.items()}
+        self.this_station = re.compile(r'this.*station[s]?|\bthis\b', re.IGNORECASE)
+        self.station_name = re.compile(r'(\w+) station', re.IGNORECASE)
+        self.vehicle_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in VEHICLE_PATTERNS]
+
+        # literal -> rules it triggers, and literal -> (category, rank, word) for gazetteer words
+        triggers: Dict[str, set] = {}
+        for entity, literals in ENTITY_RULE_TRIGGERS.items():
+            for literal in literals:
+                triggers.setdefault(literal, set()).add(entity)
+        triggers.setdefault('this', set()).add(_THIS_STATION)
+        triggers.setdefault(' station', set()).add(_STATION_NAME)
+        for name in VEHICLE_NAMES:
+            triggers.setdefault(name, set()).add(_VEHICLE_PATTERN)
+        gazetteer: Dict[str, List[Tuple[str, int, str]]] = {}
+        for category, words in self.GAZETTEERS:
+            for rank, word in enumerate(words):
+                gazetteer.setdefault(word, []).append((category, rank, word))
+
+        # The scan reports only the longest literal at each position, so every
+        # literal also carries what its prefixes would have reported
+        literals = set(triggers) | set(gazetteer)
+        self._literal_hits: Dict[str, Tuple[Tuple[Tuple[str, int, str], ...], FrozenSet[str]]] = {}
+        for literal in literals:
+            words: List[Tuple[str, int, str]] = []
+            rules: set = set()
+            for other in literals:
+                if literal.startswith(other):
+                    words.extend(gazetteer.get(other, ()))
+                    rules.update(triggers.get(other, ()))
+            self._literal_hits[literal] = (tuple(words), frozenset(rules))
+        self._scan = re.compile(f'(?=({_trie_pattern(sorted(literals))}))')
+        self._all_rules = frozenset(set(ENTITY_RULES) | {_THIS_STATION, _STATION_NAME, _VEHICLE_PATTERN})
+
+    def _scan_text(self, text_lower: str):
+        """Single pass: best-ranked gazetteer word per category, and the rules worth running."""
+        best: Dict[str, Tuple[int, str]] = {}
+        triggered: set = set()
+        literal_hits = self._literal_hits
+        for match in self._scan.finditer(text_lower):
+            words, rules = literal_hits[match.group(1)]
+            for category, rank, word in words:
+                current = best.get(category)
+                if current is None or rank < current[0]:
+                    best[category] = (rank, word)
+            triggered |= rules
+        return best, triggered
+
+    def extract(self, text: str) -> dict:
+        """
+        Extract entities using enhanced rules including better location recognition.
+        """
+        entities = {}
+        text_lower = text.lower()
+        best, triggered = self._scan_text(text_lower)
+        if not text.isascii():
+            # Case-insensitive regex matching and str.lower() can disagree outside ASCII,
+            # so the literal prefilter is only trusted for ASCII text
+            triggered = self._all_rules
+
+        # Location, vehicle type and parking type entities from the gazetteers
+        if 'city' in best:
+            entities['city'] = best['city'][1]
+        if 'vehicle_type' in best:
+            entities['vehicle_type'] = best['vehicle_type'][1].rstrip('s')  # Remove plural
+        if 'availability' in best:
+            entities['availability'] = best['availability'][1]
+
+        # Extract 'this station' reference first
+        if _THIS_STATION in triggered and self.this_station.search(text):
+            entities['station'] = 'this'
+        elif _STATION_NAME in triggered:
+            # Extract station name
+            station_match = self.station_name.search(text)
+            if station_match:
+                value = station_match.group(1).lower()
+                # Avoid setting station to common words like "parking"
+                if value not in ['parking']:
+                    entities['station'] = value
+
+        # Extract other entities using the compiled rules
+        for entity, regex in self.rules.items():
+            # Skip time_range as it's handled specially below
+            if entity == 'time_range' or (entity in ENTITY_RULE_TRIGGERS and entity not in triggered):
+                continue
+            match = regex.search(text)
+            if match:
+                value = match.group(1).lower()
+                # Apply corrections for cities
+                if entity == 'city' and value in CITY_CORRECTIONS:
+                    value = CITY_CORRECTIONS[value]
+                # Don't set city if it's the same as station name
+                if entity == 'city' and 'station' in entities and value == entities['station']:
+                    continue
+                entities[entity] = value
+
+        # Special handling for time_range entity
+        if 'time_range' in self.rules and ('time_range' not in ENTITY_RULE_TRIGGERS or 'time_range' in triggered):
+            time_range_match = self.rules['time_range'].search(text)
+            if time_range_match:
+                entities['start_time'] = time_range_match.group(1).lower()
+                entities['end_time'] = time_range_match.group(2).lower()
+
+        # Extract vehicle type from patterns like "bike slots", "car parking", etc.
+        if _VEHICLE_PATTERN in triggered:
+            for pattern in self.vehicle_patterns:
+                match = pattern.search(text)
+                if match:
+                    # Find the vehicle type in the match groups
+                    for group in match.groups():
+                        if group and group.lower() in VEHICLE_NAMES:
+                            entities['vehicle_type'] = group.lower()
+                            break
+                    break
+
+        return entities
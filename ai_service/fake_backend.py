@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""
+Stand-in for the Node backend, for load testing the AI service on its own.
+
+Serves the routes the assistant calls from synthetic stations and slots:
+
+    GET  /api/stations                  GET  /api/slots
+    GET  /api/stations/search/{city}    GET  /api/slots/station/{stationId}
+    GET  /api/stations/{id}             GET  /api/slots/slot/{slotId}
+    GET  /api/users/email/{email}       GET  /api/user/vehicles
+    POST /api/slots/{slotObjectId}/bookings
+
+Every route can be given a latency, jitter and error rate, either for all
+routes or per route by the endpoint names BackendClient uses
+(e.g. "slots_by_station=40:20:0.05" for 40 ms +/- 20 ms and 5% 503s).
+
+In process, hand a FakeBackend's client() to AIModel(backend=...).
+On a local port:
+
+    python fake_backend.py --port 5055 --stations 200 --slots-per-station 60 --latency-ms 20 --jitter-ms 10
+    BACKEND_URL=http://127.0.0.1:5055 python run.py
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from backend_client import BackendClient
+
+DEFAULT_CITIES = ('bangalore', 'chennai', 'mumbai', 'delhi', 'hyderabad', 'pune')
+# Slot types with their share of a station's slots and hourly price
+SLOT_TYPES = (('Car', 0.6, 40), ('Bike', 0.3, 15), ('Van', 0.1, 60))
+
+
+def object_id(*parts: Any) -> str:
+    """Deterministic 24-hex id shaped like a MongoDB ObjectId."""
+    return hashlib.md5('/'.join(map(str, parts)).encode()).hexdigest()[:24]
+
+
+class SyntheticData:
+    """
+    Stations spread over `cities`, each with `slots_per_station` slots.
+    The same arguments always produce the same data.
+    """
+    def __init__(self, stations: int = 50, slots_per_station: int = 40,
+                 cities: Tuple[str, ...] = DEFAULT_CITIES, free_ratio: float = 0.7, seed: int = 42):
+        rng = random.Random(seed)
+        self.stations: List[dict] = []
+        self.slots_by_station: Dict[str, List[dict]] = {}  # station _id -> slots
+        self.slots_by_id: Dict[str, dict] = {}  # slot _id -> slot
+        self.slots_by_slot_id: Dict[str, dict] = {}
+        for i in range(1, stations + 1):
+            city = cities[(i - 1) % len(cities)]
+            station_id = f"ST{i:03d}"
+            name = f"{city.title()} Parking {i}"
+            station = {
+                '_id': object_id('station', i),
+                'stationId': station_id,
+                'name': name,
+                'stationName': name,
+                'address': f"{i} Ring Road, {city.title()}",
+                'city': city,
+                'status': 'active',
+            }
+            self.stations.append(station)
+            slots = []
+            for j in range(1, slots_per_station + 1):
+                slot_type, price = self._pick_type(rng)
+                slot = {
+                    '_id': object_id('slot', i, j),
+                    'slotId': f"{station_id}-S{j:03d}",
+                    'stationId': station['_id'],
+                    'type': slot_type,
+                    'price': price,
+                    'status': 'Enabled',
+                    'availability': 'Free' if rng.random() < free_ratio else 'Booked',
+                }
+                slots.append(slot)
+                self.slots_by_id[slot['_id']] = slot
+                self.slots_by_slot_id[slot['slotId']] = slot
+            self.slots_by_station[station['_id']] = slots
+        self.stations_by_key = {key: station for station in self.stations
+                                for key in (station['_id'], station['stationId'])}
+
+    @staticmethod
+    def _pick_type(rng: random.Random) -> Tuple[str, int]:
+        roll = rng.random()
+        for slot_type, share, price in SLOT_TYPES:
+            if roll < share:
+                return slot_type, price
+            roll -= share
+        return SLOT_TYPES[0][0], SLOT_TYPES[0][2]
+
+    def station(self, key: str) -> Optional[dict]:
+        """A station by its _id or stationId."""
+        return self.stations_by_key.get(key)
+
+    def slot_count(self) -> int:
+        return len(self.slots_by_id)
+
+
+class Fault:
+    """Latency (with uniform +/- jitter) and error rate injected into a route."""
+    __slots__ = ('latency_ms', 'jitter_ms', 'error_rate')
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+
+    def delay(self, rng: random.Random) -> float:
+        """Seconds to wait before answering."""
+        ms = self.latency_ms + (rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0)
+        return max(0.0, ms) / 1000
+
+    def fails(self, rng: random.Random) -> bool:
+        return self.error_rate > 0 and rng.random() < self.error_rate
+
+
+def parse_route_faults(spec: str) -> Dict[str, Fault]:
+    """
+    Parse "route=latency_ms[:jitter_ms[:error_rate]],..." into per-route faults,
+    e.g. "slots_by_station=40:20:0.05,create_booking=200".
+    """
+    faults = {}
+    for item in spec.split(','):
+        item = item.strip()
+        if not item or '=' not in item:
+            continue
+        name, value = item.split('=', 1)
+        try:
+            faults[name.strip()] = Fault(*(float(part) for part in value.split(':')[:3]))
+        except ValueError:
+            logging.getLogger(__name__).warning(f"Ignoring invalid route fault: {item}")
+    return faults
+
+
+# (method, path pattern, route name); route names match BackendClient's endpoint names
+ROUTES = [
+    ('GET', r'/api/stations', 'stations'),
+    ('GET', r'/api/stations/search/(?P<city>[^/]+)', 'stations_search'),
+    ('GET', r'/api/stations/(?P<station_id>[^/]+)', 'station_detail'),
+    ('GET', r'/api/slots', 'slots'),
+    ('GET', r'/api/slots/station/(?P<station_id>[^/]+)', 'slots_by_station'),
+    ('GET', r'/api/slots/slot/(?P<slot_id>[^/]+)', 'slot_detail'),
+    ('GET', r'/api/users/email/(?P<email>[^/]+)', 'user_by_email'),
+    ('GET', r'/api/user/vehicles', 'user_vehicles'),
+    ('POST', r'/api/slots/(?P<slot_oid>[^/]+)/bookings', 'create_booking'),
+]
+_COMPILED_ROUTES = [(method, re.compile(pattern + r'/?'), name) for method, pattern, name in ROUTES]
+# Routes whose responses never change, so their encoded bodies are kept
+CACHEABLE_ROUTES = frozenset({'stations', 'stations_search', 'station_detail', 'slots', 'slots_by_station',
+                              'slot_detail'})
+BOOKING_FIELDS = ('slotId', 'bookingStartTime', 'durationHours', 'vehicleId', 'paymentMethod')
+
+
+class FakeBackend:
+    """
+    Answers backend requests from SyntheticData, after the route's injected
+    latency. Injected errors are 503s. Bookings are kept in memory and an
+    overlapping booking of the same slot gets a 409, as in the real backend.
+    """
+    def __init__(self, data: Optional[SyntheticData] = None, latency_ms: float = 0, jitter_ms: float = 0,
+                 error_rate: float = 0, route_faults: Optional[Dict[str, Fault]] = None, seed: Optional[int] = None):
+        self.logger = logging.getLogger(__name__)
+        self.data = data or SyntheticData()
+        self.default_fault = Fault(latency_ms, jitter_ms, error_rate)
+        self.route_faults = dict(route_faults or {})
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._encoded: Dict[str, bytes] = {}
+        self.bookings: Dict[str, List[Tuple[float, float]]] = {}  # slot _id -> [(start, end)] epoch seconds
+        self.requests: Dict[str, int] = {}
+        self.injected_errors: Dict[str, int] = {}
+
+    def fault_for(self, route: str) -> Fault:
+        return self.route_faults.get(route, self.default_fault)
+
+    def match(self, method: str, path: str) -> Tuple[Optional[str], Dict[str, str]]:
+        """Route name and path parameters for a request, or (None, {})."""
+        for route_method, pattern, name in _COMPILED_ROUTES:
+            if route_method == method:
+                found = pattern.fullmatch(path)
+                if found:
+                    return name, {key: requests.utils.unquote(value) for key, value in found.groupdict().items()}
+        return None, {}
+
+    def plan(self, method: str, path: str) -> Tuple[Optional[str], Dict[str, str], float, bool]:
+        """Match a request and draw its delay (seconds) and whether it fails."""
+        route, params = self.match(method, path)
+        if route is None:
+            return None, params, 0.0, False
+        fault = self.fault_for(route)
+        with self._lock:
+            self.requests[route] = self.requests.get(route, 0) + 1
+            delay, fails = fault.delay(self.rng), fault.fails(self.rng)
+            if fails:
+                self.injected_errors[route] = self.injected_errors.get(route, 0) + 1
+        return route, params, delay, fails
+
+    def respond(self, method: str, path: str, route: Optional[str], params: Dict[str, str], fails: bool,
+                body: Optional[dict] = None, headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes]:
+        """Status and JSON body for a planned request, without waiting."""
+        if route is None:
+            return 404, json.dumps({'message': f'Cannot {method} {path}'}).encode()
+        if fails:
+            return 503, b'{"message": "Injected backend error"}'
+        if route in CACHEABLE_ROUTES:
+            encoded = self._encoded.get(path)
+            if encoded is None:
+                status, payload = getattr(self, f'_{route}')(**params)
+                if status != 200:
+                    return status, json.dumps(payload).encode()
+                encoded = self._encoded[path] = json.dumps(payload).encode()
+            return 200, encoded
+        token = self._bearer(headers)
+        if route == 'user_vehicles':
+            status, payload = self._user_vehicles(token)
+        elif route == 'create_booking':
+            status, payload = self._create_booking(params['slot_oid'], body or {}, token)
+        else:
+            status, payload = getattr(self, f'_{route}')(**params)
+        return status, json.dumps(payload).encode()
+
+    def handle(self, method: str, path: str, body: Optional[dict] = None,
+               headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes]:
+        """Answer a request in the calling thread, sleeping for its latency."""
+        route, params, delay, fails = self.plan(method, path)
+        if delay:
+            time.sleep(delay)
+        return self.respond(method, path, route, params, fails, body, headers)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'stations': len(self.data.stations),
+                'slots': self.data.slot_count(),
+                'requests': dict(self.requests),
+                'injected_errors': dict(self.injected_errors),
+                'bookings': sum(len(bookings) for bookings in self.bookings.values()),
+            }
+
+    def client(self, **kwargs) -> BackendClient:
+        """A BackendClient whose requests are answered in process by this backend."""
+        client = BackendClient(base_url='http://fake-backend', **kwargs)
+        client.session.close()
+        client.session = FakeBackendSession(self)
+        return client
+
+    def async_client(self, **kwargs):
+        """An AsyncBackendClient whose requests are answered in process by this backend."""
+        from async_backend_client import AsyncBackendClient
+        client = AsyncBackendClient(base_url='http://fake-backend', **kwargs)
+        client.session = FakeBackendAsyncSession(self)
+        return client
+
+    # Route handlers: (status, JSON payload)
+
+    def _stations(self) -> Tuple[int, Any]:
+        return 200, self.data.stations
+
+    def _stations_search(self, city: str) -> Tuple[int, Any]:
+        pattern = re.compile(re.escape(city), re.IGNORECASE)
+        return 200, {'success': True, 'stations': [s for s in self.data.stations if pattern.search(s['city'])]}
+
+    def _station_detail(self, station_id: str) -> Tuple[int, Any]:
+        station = self.data.station(station_id)
+        return (200, station) if station else (404, {'message': 'Station not found'})
+
+    def _slots(self) -> Tuple[int, Any]:
+        return 200, list(self.data.slots_by_id.values())
+
+    def _slots_by_station(self, station_id: str) -> Tuple[int, Any]:
+        station = self.data.station(station_id)
+        if station is None:
+            return 404, {'message': 'Station not found'}
+        return 200, self.data.slots_by_station[station['_id']]
+
+    def _slot_detail(self, slot_id: str) -> Tuple[int, Any]:
+        slot = self.data.slots_by_slot_id.get(slot_id)
+        return (200, slot) if slot else (404, {'message': 'Slot not found'})
+
+    def _user_by_email(self, email: str) -> Tuple[int, Any]:
+        return 200, {'_id': object_id('user', email), 'name': email.split('@')[0], 'email': email, 'role': 'user'}
+
+    @staticmethod
+    def _bearer(headers: Optional[Dict[str, str]]) -> str:
+        for name, value in (headers or {}).items():
+            if name.lower() == 'authorization' and value.startswith('Bearer '):
+                return value[len('Bearer '):].strip()
+        return ''
+
+    @staticmethod
+    def vehicles_for(token: str) -> List[dict]:
+        """The vehicles of the user a token belongs to."""
+        return [
+            {'_id': object_id('vehicle', token, 0), 'number': 'KA01AB' + object_id(token)[:4].upper(),
+             'type': 'Car', 'isPrimary': True},
+            {'_id': object_id('vehicle', token, 1), 'number': 'KA02CD' + object_id(token)[4:8].upper(),
+             'type': 'Bike', 'isPrimary': False},
+        ]
+
+    def _user_vehicles(self, token: str) -> Tuple[int, Any]:
+        if not token:
+            return 401, {'message': 'Unauthorized'}
+        return 200, {'success': True, 'vehicles': self.vehicles_for(token)}
+
+    def _create_booking(self, slot_oid: str, body: dict, token: str) -> Tuple[int, Any]:
+        if not token:
+            return 401, {'message': 'Authentication required'}
+        if any(body.get(field) in (None, '') for field in BOOKING_FIELDS):
+            return 400, {'message': 'Missing required booking fields'}
+        payment_method = body['paymentMethod']
+        if payment_method not in ('coupon', 'razorpay', 'upi'):
+            return 400, {'message': 'Invalid payment method'}
+        if payment_method == 'coupon' and body.get('amountPaid', 0) != 0:
+            return 400, {'message': 'Coupon bookings must have amountPaid of 0'}
+        if body['vehicleId'] not in {vehicle['_id'] for vehicle in self.vehicles_for(token)}:
+            return 404, {'message': 'Vehicle not found'}
+        slot = self.data.slots_by_id.get(slot_oid)
+        if slot is None:
+            return 404, {'message': 'Slot not found'}
+        try:
+            start = time.mktime(time.strptime(str(body['bookingStartTime'])[:16], '%Y-%m-%dT%H:%M'))
+            end = start + float(body['durationHours']) * 3600
+        except ValueError:
+            return 400, {'message': 'Invalid booking time'}
+        with self._lock:
+            taken = self.bookings.setdefault(slot_oid, [])
+            if any(start < other_end and other_start < end for other_start, other_end in taken):
+                return 409, {'message': 'Slot is not available for the selected time'}
+            taken.append((start, end))
+        booking = {
+            '_id': object_id('booking', slot_oid, start, token),
+            'slotId': slot_oid,
+            'vehicleId': body['vehicleId'],
+            'stationId': slot['stationId'],
+            'bookingStartTime': body['bookingStartTime'],
+            'durationHours': body['durationHours'],
+            'amountPaid': body.get('amountPaid', 0),
+            'paymentMethod': payment_method,
+        }
+        if payment_method == 'razorpay':
+            # The real backend answers a Razorpay order with 200, not 201
+            return 200, {'orderId': 'order_' + booking['_id'][:14], 'amount': int(booking['amountPaid'] * 100),
+                         'currency': 'INR', 'bookingId': booking['_id'], 'paymentMethod': 'razorpay'}
+        return 201, {'booking': booking, 'message': 'Booking created successfully'}
+
+
+class FakeBackendSession:
+    """
+    Drop-in for the requests.Session of a BackendClient: requests are answered
+    by a FakeBackend in the calling thread. A latency above the request's read
+    timeout raises requests.ReadTimeout after the timeout, as a real socket would.
+    """
+    def __init__(self, backend: FakeBackend):
+        self.backend = backend
+
+    def request(self, method: str, url: str, params: Optional[dict] = None, json: Optional[dict] = None,
+                headers: Optional[Dict[str, str]] = None, timeout: Any = None, **kwargs) -> requests.Response:
+        path = '/' + url.split('://', 1)[-1].split('/', 1)[-1].split('?', 1)[0]
+        route, path_params, delay, fails = self.backend.plan(method, path)
+        read_timeout = timeout[1] if isinstance(timeout, tuple) else timeout
+        if read_timeout is not None and delay > read_timeout:
+            time.sleep(read_timeout)
+            raise requests.ReadTimeout(f"Fake backend: {method} {path} took longer than {read_timeout}s")
+        if delay:
+            time.sleep(delay)
+        status, content = self.backend.respond(method, path, route, path_params, fails, json, headers)
+        response = requests.Response()
+        response.status_code = status
+        response._content = content
+        response.headers['Content-Type'] = 'application/json'
+        response.encoding = 'utf-8'
+        response.url = url
+        response.request = requests.Request(method, url, params=params, headers=headers).prepare()
+        return response
+
+    def close(self):
+        pass
+
+
+class _FakeAsyncResponse:
+    """The parts of an aiohttp.ClientResponse that AsyncBackendClient reads."""
+    charset = 'utf-8'
+
+    def __init__(self, status: int, content: bytes, url: str):
+        self.status = status
+        self.reason = 'OK' if status < 400 else 'Error'
+        self.headers = {'Content-Type': 'application/json'}
+        self.url = url
+        self._content = content
+
+    async def read(self) -> bytes:
+        return self._content
+
+
+class _FakeAsyncRequest:
+    def __init__(self, backend: FakeBackend, method: str, url: str, json: Optional[dict],
+                 headers: Optional[Dict[str, str]], timeout: Any):
+        self.backend = backend
+        self.method = method
+        self.url = url
+        self.json = json
+        self.headers = headers
+        self.timeout = timeout
+
+    async def __aenter__(self) -> _FakeAsyncResponse:
+        path = '/' + self.url.split('://', 1)[-1].split('/', 1)[-1].split('?', 1)[0]
+        route, path_params, delay, fails = self.backend.plan(self.method, path)
+        read_timeout = getattr(self.timeout, 'sock_read', None)
+        if read_timeout is not None and delay > read_timeout:
+            await asyncio.sleep(read_timeout)
+            raise asyncio.TimeoutError()
+        if delay:
+            await asyncio.sleep(delay)
+        status, content = self.backend.respond(self.method, path, route, path_params, fails, self.json, self.headers)
+        return _FakeAsyncResponse(status, content, self.url)
+
+    async def __aexit__(self, *exc) -> None:
+        pass
+
+
+class FakeBackendAsyncSession:
+    """
+    Drop-in for the aiohttp.ClientSession of an AsyncBackendClient: requests are
+    answered by a FakeBackend, their latency awaited on the event loop.
+    """
+    def __init__(self, backend: FakeBackend):
+        self.backend = backend
+
+    def request(self, method: str, url: str, params: Optional[dict] = None, json: Optional[dict] = None,
+                headers: Optional[Dict[str, str]] = None, timeout: Any = None, **kwargs) -> _FakeAsyncRequest:
+        return _FakeAsyncRequest(self.backend, method, url, json, headers, timeout)
+
+    async def close(self) -> None:
+        pass
+
+
+def create_app(backend: FakeBackend):
+    """A FastAPI app serving `backend` over HTTP; latency is awaited, so slow routes don't hold threads."""
+    from fastapi import FastAPI, Request
+    from fastapi.responses import JSONResponse, Response
+
+    app = FastAPI(title="Park-Pro fake backend")
+
+    @app.get("/_fake/stats")
+    def stats():
+        return backend.stats()
+
+    @app.api_route("/api/{rest:path}", methods=["GET", "POST"])
+    async def serve(request: Request):
+        path = request.url.path
+        route, params, delay, fails = backend.plan(request.method, path)
+        if delay:
+            await asyncio.sleep(delay)
+        body = None
+        if request.method == 'POST':
+            try:
+                body = await request.json()
+            except ValueError:
+                return JSONResponse({'message': 'Invalid JSON body'}, status_code=400)
+        status, content = backend.respond(request.method, path, route, params, fails, body, dict(request.headers))
+        return Response(content=content, status_code=status, media_type='application/json')
+
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fake Park-Pro backend for load testing the AI service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--stations', type=int, default=50)
+    parser.add_argument('--slots-per-station', type=int, default=40)
+    parser.add_argument('--cities', default=','.join(DEFAULT_CITIES), help="comma separated city names")
+    parser.add_argument('--free-ratio', type=float, default=0.7, help="fraction of slots that are Free")
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0, help="fraction of requests answered with a 503")
+    parser.add_argument('--route', default='',
+                        help="per-route faults: route=latency_ms[:jitter_ms[:error_rate]],...")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    data = SyntheticData(args.stations, args.slots_per_station, tuple(c.strip() for c in args.cities.split(',')),
+                         args.free_ratio, args.seed)
+    backend = FakeBackend(data, args.latency_ms, args.jitter_ms, args.error_rate,
+                          parse_route_faults(args.route), seed=args.seed)
+    print(f"Fake backend: {len(data.stations)} stations, {data.slot_count()} slots on http://{args.host}:{args.port}")
+    uvicorn.run(create_app(backend), host=args.host, port=args.port, log_level='warning')
+
+
+if __name__ == "__main__":
+    main()
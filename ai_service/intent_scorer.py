@@ -0,0 +1,72 @@
+from typing import Dict, Iterable, List, Tuple
+
+from intents import INTENTS
+
+
+class IntentScorer:
+    """
+    Keyword scorer for INTENTS, compiled once into an inverted index.
+
+    Scoring rule (unchanged from the original loop in parse_intent): every
+    keyword whose words all appear in the utterance tokens adds len(words)
+    to its intent's score.
+
+    The index maps each token to the keywords that contain it, so a turn only
+    touches keywords its tokens actually hit:
+    - single-word keywords are folded into token -> [(intent, weight)];
+    - multi-word keywords are counted per token and fire when all of their
+      distinct words were seen.
+    """
+    def __init__(self, intents: Dict[str, dict] = INTENTS):
+        self.intent_names: List[str] = list(intents)
+        self._single: Dict[str, List[Tuple[int, int]]] = {}  # token -> [(intent ordinal, weight)]
+        self._multi: Dict[str, List[int]] = {}  # token -> [multi-word keyword id]
+        self._multi_intent: List[int] = []
+        self._multi_required: List[int] = []  # distinct words the keyword needs
+        self._multi_weight: List[int] = []  # score added when the keyword matches
+
+        for ordinal, (intent_name, intent_data) in enumerate(intents.items()):
+            single_weights: Dict[str, int] = {}
+            for keyword in intent_data['keywords']:
+                words = keyword.split()
+                distinct = set(words)
+                if not words:
+                    continue  # matches everything but adds nothing
+                if len(distinct) == 1:
+                    token = words[0]
+                    single_weights[token] = single_weights.get(token, 0) + len(words)
+                    continue
+                keyword_id = len(self._multi_intent)
+                self._multi_intent.append(ordinal)
+                self._multi_required.append(len(distinct))
+                self._multi_weight.append(len(words))
+                for word in distinct:
+                    self._multi.setdefault(word, []).append(keyword_id)
+            for token, weight in single_weights.items():
+                self._single.setdefault(token, []).append((ordinal, weight))
+
+    def score(self, tokens: Iterable[str]) -> Dict[str, int]:
+        """
+        Score every intent hit by the tokens.
+        Returns {intent: score} for scores > 0, in INTENTS order (which breaks ties in max()).
+        """
+        scores: Dict[int, int] = {}
+        multi_hits: Dict[int, int] = {}
+        single = self._single
+        multi = self._multi
+        for token in set(tokens):
+            postings = single.get(token)
+            if postings:
+                for ordinal, weight in postings:
+                    scores[ordinal] = scores.get(ordinal, 0) + weight
+            keyword_ids = multi.get(token)
+            if keyword_ids:
+                for keyword_id in keyword_ids:
+                    multi_hits[keyword_id] = multi_hits.get(keyword_id, 0) + 1
+
+        for keyword_id, hits in multi_hits.items():
+            if hits == self._multi_required[keyword_id]:
+                ordinal = self._multi_intent[keyword_id]
+                scores[ordinal] = scores.get(ordinal, 0) + self._multi_weight[keyword_id]
+
+        return {self.intent_names[ordinal]: scores[ordinal] for ordinal in sorted(scores)}
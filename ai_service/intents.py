@@ -126,6 +126,39 @@ ENTITY_RULES = {
     'time_range': r'(?:from\s+)?(\d{1,2}(?::\d{2})? ?(?:am|pm)?)\s*to\s*(\d{1,2}(?::\d{2})? ?(?:am|pm)?)'
 }
 
+# Literal (lowercase) text an ENTITY_RULES pattern cannot match without.
+# The entity extractor skips a rule when none of its triggers occur in the text;
+# rules missing from this table are always evaluated.
+ENTITY_RULE_TRIGGERS = {
+    'city': ['in '],
+    'time': ['at '],
+    'date': ['tomorrow', 'today', '-', '/'],
+    'duration': ['for '],
+    'booking_id': ['booking '],
+    'amount': ['amount '],
+    'vehicle': ['vehicle '],
+    'station': [' station'],
+    'vehicle_type': [' slot'],
+    'slot_id': ['book '],
+    'start_time': ['start time', 'from'],
+    'end_time': ['end time', 'to'],
+    'time_range': ['to']
+}
+
+# Gazetteers matched as substrings of the lowercased text; the first listed word found wins
+CITY_NAMES = ['bangalore', 'delhi', 'mumbai', 'chennai', 'kolkata', 'hyderabad', 'pune', 'ahmedabad', 'jaipur', 'surat']
+VEHICLE_TYPE_WORDS = ['car', 'cars', 'bike', 'bikes', 'scooter', 'scooters',
+                      'motorcycle', 'motorcycles', 'vehicle', 'vehicles']
+AVAILABILITY_WORDS = ['available', 'empty', 'vacant', 'free', 'occupied', 'full']
+
+# Vehicle type from patterns like "bike slots", "car parking", "parking for car"
+VEHICLE_NAMES = ['bike', 'car', 'motorcycle', 'scooter', 'truck', 'van', 'vehicle']
+VEHICLE_PATTERNS = [
+    r'\b(bike|car|motorcycle|scooter|truck|van|vehicle)\b.*\b(slots?|parking)\b',
+    r'\b(slots?|parking)\b.*\b(bike|car|motorcycle|scooter|truck|van|vehicle)\b',
+    r'for (bike|car|motorcycle|scooter|truck|van|vehicle)\b'
+]
+
 RESPONSE_TEMPLATES = {
     'book_slot': "Booking slot...",
     'navigate_search_stations': "Searching for stations{city_part}.",
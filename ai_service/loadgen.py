@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Load generator for the AI service's /chat endpoint.
+
+Runs many concurrent virtual users. Each one plays scripted conversations
+(greet -> stations in a city -> yes -> vehicle -> date -> times -> pick a
+slot -> payment) in fresh sessions, back to back, for the given duration.
+Every few seconds it prints throughput, p50/p99 latency, errors and the
+server's memory; at the end it reports totals, p50/p95/p99 overall and per
+conversation step, and memory growth.
+
+Against a running service (RSS needs its pid, on Linux):
+
+    python loadgen.py --url http://127.0.0.1:8000 --users 100 --duration 60 --server-pid 1234
+
+Or let it start the fake backend and the AI service itself:
+
+    python loadgen.py --spawn --users 100 --duration 60 --backend-latency-ms 20
+
+Errors are counted by kind: transport (connection errors, timeouts), http_<status>,
+off_script (a turn answered with an unexpected intent) and degraded (a reply
+reporting a backend failure or partial data). Bookings refused because another user holds the
+slot are counted as conflicts, not errors.
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from fake_backend import DEFAULT_CITIES
+
+DEGRADED = re.compile(r"backend request failed|unexpected error|trouble|couldn't|could not", re.IGNORECASE)
+CONFLICT = re.compile(r"not available for the selected time", re.IGNORECASE)
+BOOKING_FAILED = re.compile(r"booking failed", re.IGNORECASE)
+
+
+def _hour(hour: int) -> str:
+    return f"{(hour - 1) % 12 + 1}:00{'am' if hour < 12 else 'pm'}"
+
+
+def booking_conversation(rng: random.Random) -> List[Tuple[str, str, Optional[str]]]:
+    """(step, utterance, expected intent) for a guided booking, with a random city, slot and time."""
+    city = rng.choice(DEFAULT_CITIES)
+    start = rng.randint(10, 19)
+    end = start + rng.randint(1, 3)
+    times = f"from {_hour(start)} to {_hour(end)}"
+    return [
+        ('greet', rng.choice(["hello", "hi", "hey there"]), 'greet'),
+        ('stations', f"Show parking stations in {city.title()}", 'display_stations'),
+        ('yes', "yes", None),
+        ('vehicle', "car", None),
+        ('date', "tomorrow", None),
+        ('times', times, 'view_slots_filtered'),
+        ('pick_slot', f"book slot {rng.randint(1, 10)} tomorrow {times}", 'book_slot'),
+        ('confirm', "yes", 'book_slot'),
+        ('payment', "coupon", 'book_slot'),
+        ('pay_confirm', "yes", 'book_slot'),
+    ]
+
+
+def browse_conversation(rng: random.Random) -> List[Tuple[str, str, Optional[str]]]:
+    """A user who looks around and leaves without booking."""
+    city = rng.choice(DEFAULT_CITIES)
+    return [
+        ('greet', "hi", 'greet'),
+        ('help', "What can you do?", None),
+        ('slots', f"Show all car slots in {city.title()}", None),
+        ('more', "show more", None),
+        ('cancel', "cancel", None),
+    ]
+
+
+# Conversation kinds and how often a virtual user picks each
+CONVERSATIONS = (('booking', booking_conversation, 0.8), ('browse', browse_conversation, 0.2))
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50/p95/p99 in milliseconds."""
+    if not samples:
+        return {'p50_ms': 0.0, 'p95_ms': 0.0, 'p99_ms': 0.0}
+    ordered = sorted(samples)
+    pick = lambda fraction: round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000, 2)
+    return {'p50_ms': pick(0.50), 'p95_ms': pick(0.95), 'p99_ms': pick(0.99)}
+
+
+def read_rss(pid: Optional[int]) -> Optional[int]:
+    """Resident memory of a process in bytes (Linux), or None."""
+    if not pid:
+        return None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class Recorder:
+    """Turn results from all virtual users, and the interval reports taken while they run."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.turns: List[Tuple[float, float, str, Optional[str]]] = []  # (finished, seconds, step, error kind)
+        self.conversations: Dict[str, int] = {}
+        self.conflicts = 0
+        self.bookings = 0
+        self.intervals: List[Dict[str, Any]] = []
+
+    def turn(self, seconds: float, step: str, error: Optional[str] = None) -> None:
+        with self._lock:
+            self.turns.append((time.perf_counter() - self.started, seconds, step, error))
+
+    def conversation(self, kind: str, booked: bool = False, conflict: bool = False) -> None:
+        with self._lock:
+            self.conversations[kind] = self.conversations.get(kind, 0) + 1
+            self.bookings += booked
+            self.conflicts += conflict
+
+    def window(self, since: float) -> List[Tuple[float, float, str, Optional[str]]]:
+        with self._lock:
+            return [turn for turn in self.turns if turn[0] >= since]
+
+
+def run_user(index: int, args, recorder: Recorder, deadline: float, stop: threading.Event) -> None:
+    rng = random.Random(args.seed * 100003 + index)
+    http = requests.Session()
+    kinds = [kind for kind, _, _ in CONVERSATIONS]
+    weights = [weight for _, _, weight in CONVERSATIONS]
+    builders = {kind: build for kind, build, _ in CONVERSATIONS}
+    count = 0
+    while not stop.is_set() and time.perf_counter() < deadline:
+        kind = rng.choices(kinds, weights)[0]
+        session_id = f"load-{index}-{count}@loadtest.local"
+        count += 1
+        booked = conflict = False
+        for step, text, expected in builders[kind](rng):
+            if stop.is_set():
+                return
+            error = None
+            start = time.perf_counter()
+            try:
+                response = http.post(f"{args.url}/chat", json={'text': text, 'session_id': session_id,
+                                                               'token': f"load-token-{index}"},
+                                     timeout=args.timeout)
+                elapsed = time.perf_counter() - start
+                if response.status_code != 200:
+                    error = f"http_{response.status_code}"
+                else:
+                    result = response.json()
+                    reply = result.get('response', '')
+                    if CONFLICT.search(reply):
+                        conflict = True
+                    elif BOOKING_FAILED.search(reply) or DEGRADED.search(reply) or result.get('degraded'):
+                        error = 'degraded'
+                    elif expected is not None and result.get('intent') != expected:
+                        error = 'off_script'
+                    elif step == 'pay_confirm' and 'confirmed' in reply.lower():
+                        booked = True
+            except requests.RequestException:
+                elapsed = time.perf_counter() - start
+                error = 'transport'
+            recorder.turn(elapsed, step, error)
+            if error in ('transport', 'off_script') or (error or '').startswith('http_'):
+                break  # the rest of the script no longer makes sense
+            if args.think_ms:
+                time.sleep(rng.uniform(0.5, 1.5) * args.think_ms / 1000)
+        recorder.conversation(kind, booked, conflict)
+
+
+def fetch_health(url: str) -> Dict[str, Any]:
+    try:
+        return requests.get(f"{url}/health", timeout=5).json()
+    except (requests.RequestException, ValueError):
+        return {}
+
+
+def report_interval(args, recorder: Recorder, since: float) -> Dict[str, Any]:
+    now = time.perf_counter() - recorder.started
+    window = recorder.window(since)
+    latencies = [seconds for _, seconds, _, _ in window]
+    errors = sum(1 for turn in window if turn[3])
+    health = fetch_health(args.url)
+    rss = read_rss(args.server_pid)
+    interval = {
+        't_s': round(now, 1),
+        'turns_per_sec': round(len(window) / max(now - since, 1e-9), 1),
+        **percentiles(latencies),
+        'errors': errors,
+        'rss_mb': round(rss / 2 ** 20, 1) if rss else None,
+        'sessions': health.get('sessions', {}).get('active'),
+    }
+    recorder.intervals.append(interval)
+    print(f"[{interval['t_s']:6.1f}s] {interval['turns_per_sec']:8.1f} turns/s  p50 {interval['p50_ms']:8.1f} ms  "
+          f"p99 {interval['p99_ms']:8.1f} ms  errors {errors:5d}  "
+          f"rss {interval['rss_mb'] if interval['rss_mb'] is not None else '-':>7} MB  "
+          f"sessions {interval['sessions'] if interval['sessions'] is not None else '-'}", flush=True)
+    return interval
+
+
+def summarize(args, recorder: Recorder, elapsed: float) -> Dict[str, Any]:
+    turns = recorder.turns
+    errors: Dict[str, int] = {}
+    by_step: Dict[str, List[float]] = {}
+    for _, seconds, step, error in turns:
+        by_step.setdefault(step, []).append(seconds)
+        if error:
+            errors[error] = errors.get(error, 0) + 1
+    rss = [interval['rss_mb'] for interval in recorder.intervals if interval['rss_mb'] is not None]
+    return {
+        'url': args.url,
+        'users': args.users,
+        'duration_s': round(elapsed, 1),
+        'turns': len(turns),
+        'turns_per_sec': round(len(turns) / elapsed, 1) if elapsed else 0.0,
+        'conversations': dict(recorder.conversations),
+        'bookings': recorder.bookings,
+        'booking_conflicts': recorder.conflicts,
+        'latency': percentiles([seconds for _, seconds, _, _ in turns]),
+        'steps': {step: {'turns': len(samples), **percentiles(samples)} for step, samples in by_step.items()},
+        'errors': errors,
+        'error_rate': round(sum(errors.values()) / len(turns), 4) if turns else 0.0,
+        'memory': {'start_rss_mb': rss[0], 'end_rss_mb': rss[-1], 'growth_mb': round(rss[-1] - rss[0], 1)}
+        if rss else None,
+        'intervals': recorder.intervals,
+    }
+
+
+def print_summary(summary: Dict[str, Any]) -> None:
+    latency = summary['latency']
+    print(f"\n{summary['turns']} turns in {summary['duration_s']}s from {summary['users']} users: "
+          f"{summary['turns_per_sec']} turns/s")
+    print(f"latency p50 {latency['p50_ms']} ms  p95 {latency['p95_ms']} ms  p99 {latency['p99_ms']} ms")
+    print(f"conversations {summary['conversations']}  bookings {summary['bookings']}  "
+          f"conflicts {summary['booking_conflicts']}")
+    print(f"errors {summary['errors'] or 'none'} (rate {summary['error_rate']:.2%})")
+    if summary['memory']:
+        memory = summary['memory']
+        print(f"server rss {memory['start_rss_mb']} -> {memory['end_rss_mb']} MB ({memory['growth_mb']:+} MB)")
+    print(f"\n{'step':12s} {'turns':>8s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s}")
+    for step, stats in summary['steps'].items():
+        print(f"{step:12s} {stats['turns']:8d} {stats['p50_ms']:9.1f} {stats['p95_ms']:9.1f} {stats['p99_ms']:9.1f}")
+
+
+def wait_until_up(url: str, seconds: float = 30) -> None:
+    deadline = time.time() + seconds
+    while time.time() < deadline:
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.RequestException:
+            time.sleep(0.2)
+    raise SystemExit(f"{url} did not come up within {seconds:.0f}s")
+
+
+def spawn_services(args) -> List[subprocess.Popen]:
+    """Start the fake backend and the AI service as child processes; --url and --server-pid point at them."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    backend_url = f"http://127.0.0.1:{args.backend_port}"
+    backend = subprocess.Popen(
+        [sys.executable, 'fake_backend.py', '--port', str(args.backend_port),
+         '--stations', str(args.stations), '--slots-per-station', str(args.slots_per_station),
+         '--latency-ms', str(args.backend_latency_ms), '--jitter-ms', str(args.backend_jitter_ms),
+         '--error-rate', str(args.backend_error_rate)],
+        cwd=here, stdout=subprocess.DEVNULL)
+    wait_until_up(f"{backend_url}/_fake/stats")
+    service = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'app:app', '--port', str(args.port), '--log-level', 'warning'],
+        cwd=here, env={**os.environ, 'BACKEND_URL': backend_url,
+                       **({'AI_EXECUTION_MODE': args.mode} if args.mode else {})},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    args.url = f"http://127.0.0.1:{args.port}"
+    args.server_pid = service.pid
+    wait_until_up(f"{args.url}/health")
+    return [service, backend]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Drive /chat with concurrent scripted conversations")
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help="AI service base URL")
+    parser.add_argument('--users', type=int, default=50, help="concurrent virtual users")
+    parser.add_argument('--duration', type=float, default=30, help="seconds of load")
+    parser.add_argument('--ramp-up', type=float, default=5, help="seconds over which users start")
+    parser.add_argument('--think-ms', type=float, default=0, help="mean pause between a user's turns")
+    parser.add_argument('--timeout', type=float, default=30, help="per-turn HTTP timeout (seconds)")
+    parser.add_argument('--interval', type=float, default=5, help="seconds between progress reports")
+    parser.add_argument('--server-pid', type=int, help="AI service pid, to sample its RSS")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help="write the summary as JSON to this file")
+    spawn = parser.add_argument_group('spawned services (--spawn)')
+    spawn.add_argument('--spawn', action='store_true', help="start the fake backend and the AI service")
+    spawn.add_argument('--port', type=int, default=8765)
+    spawn.add_argument('--backend-port', type=int, default=5055)
+    spawn.add_argument('--stations', type=int, default=60)
+    spawn.add_argument('--slots-per-station', type=int, default=40)
+    spawn.add_argument('--backend-latency-ms', type=float, default=10)
+    spawn.add_argument('--backend-jitter-ms', type=float, default=5)
+    spawn.add_argument('--backend-error-rate', type=float, default=0)
+    spawn.add_argument('--mode', choices=['threadpool', 'async'], help="AI_EXECUTION_MODE of the spawned service")
+    args = parser.parse_args(argv)
+
+    children = spawn_services(args) if args.spawn else []
+    try:
+        recorder = Recorder()
+        stop = threading.Event()
+        deadline = recorder.started + args.ramp_up + args.duration
+        report_interval(args, recorder, 0.0)
+        users = []
+        for index in range(args.users):
+            user = threading.Thread(target=run_user, args=(index, args, recorder, deadline, stop), daemon=True)
+            users.append(user)
+
+        def start_users():
+            for user in users:
+                user.start()
+                time.sleep(args.ramp_up / max(args.users, 1))
+
+        starter = threading.Thread(target=start_users, daemon=True)
+        starter.start()
+        since = 0.0
+        try:
+            while time.perf_counter() < deadline:
+                time.sleep(min(args.interval, max(0.0, deadline - time.perf_counter())))
+                now = time.perf_counter() - recorder.started
+                report_interval(args, recorder, since)
+                since = now
+        except KeyboardInterrupt:
+            print("Stopping...")
+        stop.set()
+        starter.join()
+        for user in users:
+            user.join(args.timeout)
+        elapsed = time.perf_counter() - recorder.started
+        summary = summarize(args, recorder, elapsed)
+        print_summary(summary)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(summary, f, indent=2)
+        return 0
+    finally:
+        for child in children:
+            child.terminate()
+            child.wait(10)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+import abc
+import bisect
+import threading
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+# Latency buckets in seconds, from sub-millisecond NLU stages to slow backend calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(abc.ABC):
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    @abc.abstractmethod
+    def _new_child(self) -> Any:
+        """A new series, for a set of label values not seen before."""
+
+    def labels(self, **labels) -> Any:
+        """
+        The series for one set of label values. Hot paths look it up once
+        and keep it, instead of passing labels on every call.
+        """
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _labels(self, key: Tuple[str, ...], extra: str = '') -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key)]
+        if extra:
+            pairs.append(extra)
+        return '{' + ','.join(pairs) + '}' if pairs else ''
+
+    @abc.abstractmethod
+    def collect(self) -> List[str]:
+        """The exposition lines of every series, without HELP and TYPE."""
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"] + self.collect()
+
+
+class _CounterChild:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    """Monotonic count per label set."""
+    kind = 'counter'
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        self.labels(**labels).inc(amount)
+
+    def value(self, **labels) -> float:
+        return self.labels(**labels).value
+
+    def collect(self) -> List[str]:
+        children = sorted(self._children.items())
+        return [f"{self.name}{self._labels(key)} {_format_value(child.value)}" for key, child in children]
+
+
+class _HistogramChild:
+    __slots__ = ('buckets', 'counts', 'sum', '_lock')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last one is +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def time(self) -> '_Timer':
+        """Context manager that observes the time spent in its block."""
+        return _Timer(self)
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        with self._lock:
+            return list(self.counts), self.sum
+
+
+class _Timer:
+    __slots__ = ('child', 'start')
+
+    def __init__(self, child: _HistogramChild):
+        self.child = child
+
+    def __enter__(self) -> '_Timer':
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.child.observe(time.perf_counter() - self.start)
+
+
+class Histogram(_Metric):
+    """
+    Distribution of observed values (seconds) per label set, with cumulative
+    buckets as Prometheus expects.
+    """
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float, **labels) -> None:
+        self.labels(**labels).observe(value)
+
+    def time(self, **labels) -> _Timer:
+        """Context manager that observes the time spent in its block."""
+        return self.labels(**labels).time()
+
+    def count(self, **labels) -> int:
+        return sum(self.labels(**labels).counts)
+
+    def collect(self) -> List[str]:
+        lines = []
+        for key, child in sorted(self._children.items()):
+            counts, total = child.snapshot()
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else _format_value(bound)
+                labels = self._labels(key, 'le="%s"' % le)
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{self._labels(key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Metrics of this process, rendered in the Prometheus text format.
+    With several uvicorn workers each worker has its own registry.
+    """
+    CONTENT_TYPE = 'text/plain; version=0.0.4'
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    'ai_stage_seconds', 'Time spent in turn stages (NLU steps, session load/save)', ('stage',))
+TURN_SECONDS = REGISTRY.histogram(
+    'ai_turn_seconds', 'Time to answer a chat turn, by get_ai_response branch', ('branch',))
+BACKEND_SECONDS = REGISTRY.histogram(
+    'ai_backend_request_seconds', 'Backend request time, by endpoint', ('endpoint', 'method'))
+INTENT_TURNS = REGISTRY.counter('ai_intents_total', 'Chat turns answered, by intent', ('intent',))
+FALLBACKS = REGISTRY.counter(
+    'ai_intent_fallbacks_total', 'Utterances no intent keyword matched, by fallback intent', ('intent',))
+CLARIFICATIONS = REGISTRY.counter('ai_clarifications_total', 'Clarifying questions asked', ('kind',))
+BACKEND_ERRORS = REGISTRY.counter(
+    'ai_backend_errors_total', 'Failed backend requests (exceptions and 5xx responses)', ('endpoint', 'reason'))
+CACHE_LOOKUPS = REGISTRY.counter('ai_cache_lookups_total', 'Cache lookups, by cache and hit/miss', ('cache', 'result'))
+BACKEND_RETRIES = REGISTRY.counter(
+    'ai_backend_retries_total', 'Backend GET retries, by endpoint and outcome (sent or budget_exhausted)',
+    ('endpoint', 'outcome'))
+CIRCUIT_TRANSITIONS = REGISTRY.counter(
+    'ai_backend_circuit_transitions_total', 'Backend circuit breaker state changes, by endpoint and new state',
+    ('endpoint', 'state'))
+DEGRADED_TURNS = REGISTRY.counter('ai_degraded_turns_total', 'Turns answered with partial data, by reason', ('reason',))
+BACKEND_COALESCED = REGISTRY.counter(
+    'ai_backend_singleflight_total',
+    'Coalescable backend GETs, by endpoint and role (leader: sent it, follower: shared one in flight)',
+    ('endpoint', 'role'))
+SLOT_CACHE_AGE = REGISTRY.histogram(
+    'ai_slot_cache_age_seconds', 'Age of station slot lists served from the slot cache, by hit or stale', ('result',),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0))
+SENSOR_EVENTS = REGISTRY.counter(
+    'ai_sensor_events_total', 'IoT slot sensor events, by result (applied, stale, invalid)', ('result',))
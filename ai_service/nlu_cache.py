@@ -0,0 +1,81 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from config import NLU_CACHE_SIZE
+from metrics import CACHE_LOOKUPS
+
+_HITS = CACHE_LOOKUPS.labels(cache='nlu', result='hit')
+_MISSES = CACHE_LOOKUPS.labels(cache='nlu', result='miss')
+
+
+class NLUResult(NamedTuple):
+    """Context-independent NLU output for one utterance."""
+    tokens: Tuple[str, ...]
+    entities: Dict[str, str]
+    scores: Dict[str, int]
+
+
+class NLUCache:
+    """
+    LRU cache of NLUResult keyed by normalized utterance text.
+
+    Entries are shared between sessions, so callers must not mutate them;
+    AIModel copies entities and scores before applying context boosts.
+    `max_entries = 0` disables caching.
+    """
+    def __init__(self, max_entries: int = NLU_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, NLUResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """
+        Cache key for an utterance. Tokenization lowercases and entity rules
+        ignore case, so ASCII text is lowercased and trimmed. Other text is used
+        as is, because case folding outside ASCII can change what the rules match.
+        """
+        return text.strip().lower() if text.isascii() else text
+
+    def get(self, key: str) -> Optional[NLUResult]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        (_MISSES if result is None else _HITS).inc()
+        return result
+
+    def put(self, key: str, result: NLUResult) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            'evictions': self.evictions,
+        }
@@ -0,0 +1,184 @@
+import logging
+import math
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from config import OCCUPANCY_MAX_AGE, OCCUPANCY_MAX_BATCH, OCCUPANCY_MAX_SLOTS_PER_STATION, OCCUPANCY_MAX_STATIONS
+from metrics import SENSOR_EVENTS
+from slot_index import SlotRecord
+
+# Slot states as the firmware names them
+SENSOR_STATES = {'occupied': True, 'empty': False}
+# Seconds a sensor clock may run ahead of ours; later timestamps are taken as now + this
+MAX_CLOCK_SKEW = 5.0
+# Longest stationId or slotId accepted
+MAX_ID_LENGTH = 64
+
+
+class _StationOccupancy:
+    """
+    Sensor state of one station's slots as bitmaps: bit i of `occupied` is set
+    when the slot at position i is occupied, and of `known` once a sensor has
+    reported it. Positions are given to slotIds as they are first reported.
+    Writers hold the map's lock; `state` reads without it, so a position is
+    published only once its bits exist.
+    """
+    __slots__ = ('positions', 'occupied', 'known', 'stamps', 'last_event_at')
+
+    def __init__(self):
+        self.positions: Dict[str, int] = {}
+        self.occupied = bytearray()
+        self.known = bytearray()
+        # Sensor timestamp of each slot's latest reading, to drop late out-of-order events
+        self.stamps: List[float] = []
+        self.last_event_at = 0.0
+
+    def set(self, slot_id: str, occupied: bool, stamp: float) -> bool:
+        position = self.positions.get(slot_id)
+        if position is None:
+            position = len(self.positions)
+            if position // 8 >= len(self.occupied):
+                self.occupied.append(0)
+                self.known.append(0)
+            self.stamps.append(stamp)
+            self.positions[slot_id] = position
+        elif stamp < self.stamps[position]:
+            return False
+        self.stamps[position] = stamp
+        byte, bit = divmod(position, 8)
+        if occupied:
+            self.occupied[byte] |= 1 << bit
+        else:
+            self.occupied[byte] &= ~(1 << bit) & 0xFF
+        self.known[byte] |= 1 << bit
+        return True
+
+    def state(self, slot_id: str) -> Optional[bool]:
+        """True if occupied, False if empty, None if no sensor reported the slot."""
+        position = self.positions.get(slot_id)
+        if position is None:
+            return None
+        byte, bit = divmod(position, 8)
+        if not self.known[byte] >> bit & 1:
+            return None
+        return bool(self.occupied[byte] >> bit & 1)
+
+    def counts(self) -> Dict[str, int]:
+        occupied = sum(bin(value).count('1') for value in self.occupied)
+        return {'slots': len(self.positions), 'occupied': occupied, 'empty': len(self.positions) - occupied}
+
+
+class OccupancyMap:
+    """
+    Live slot occupancy pushed by the IoT slot sensors (iot/smart_parking.ino),
+    kept as an in-memory stationId -> slot bitmap.
+
+    A station is live while its latest sensor event is younger than `max_age`
+    seconds; for live stations, slot lists get their availability from the map
+    (`apply`) instead of waiting for the backend to be polled again. A sensed
+    car makes a slot 'Booked'. An empty bay keeps the backend's availability,
+    because a slot booked for later is empty until its car arrives.
+
+    At most `max_stations` stations of `max_slots_per_station` slots each are
+    tracked; events for further ones are counted as invalid. The map lives in
+    one worker process: a worker that doesn't get a station's events treats it
+    as not live and keeps using the backend's availability.
+    """
+    def __init__(self, max_age: float = OCCUPANCY_MAX_AGE, max_batch: int = OCCUPANCY_MAX_BATCH,
+                 max_stations: int = OCCUPANCY_MAX_STATIONS,
+                 max_slots_per_station: int = OCCUPANCY_MAX_SLOTS_PER_STATION):
+        self.logger = logging.getLogger(__name__)
+        self.max_age = max_age
+        self.max_batch = max_batch
+        self.max_stations = max_stations
+        self.max_slots_per_station = max_slots_per_station
+        self._stations: Dict[str, _StationOccupancy] = {}
+        self._lock = threading.Lock()
+
+    def ingest(self, events: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Apply a batch of sensor events, each {stationId, slotId, occupied, ts}.
+        `occupied` is a boolean or the firmware's "Occupied"/"Empty", and `ts`
+        the sensor's reading time in epoch seconds (default: now, and at most
+        MAX_CLOCK_SKEW seconds ahead of now). Events older than the slot's
+        latest reading are ignored.
+        """
+        events = list(events)
+        if len(events) > self.max_batch:
+            return {'status': 'error', 'message': f"Batch too large: {len(events)} events (max {self.max_batch})"}
+        applied = stale = invalid = 0
+        now, wall_now = time.monotonic(), time.time()
+        with self._lock:
+            for event in events:
+                try:
+                    station_id, slot_id = str(event['stationId']), str(event['slotId'])
+                    if len(station_id) > MAX_ID_LENGTH or len(slot_id) > MAX_ID_LENGTH:
+                        raise ValueError(f"ids are limited to {MAX_ID_LENGTH} characters")
+                    occupied = event['occupied']
+                    stamp = float(event.get('ts') or wall_now)
+                    if not math.isfinite(stamp):
+                        raise ValueError(f"ts must be a finite number, got {stamp!r}")
+                    stamp = min(stamp, wall_now + MAX_CLOCK_SKEW)
+                    if isinstance(occupied, str):
+                        # The firmware's own vocabulary
+                        occupied = SENSOR_STATES[occupied.lower()]
+                    elif not isinstance(occupied, bool):
+                        raise ValueError(f"occupied must be true or false, got {occupied!r}")
+                    station = self._station(station_id, slot_id)
+                except (KeyError, TypeError, ValueError) as e:
+                    self.logger.warning(f"Ignoring invalid sensor event {str(event)[:200]}: {e}")
+                    invalid += 1
+                    continue
+                if station.set(slot_id, occupied, stamp):
+                    station.last_event_at = now
+                    applied += 1
+                else:
+                    stale += 1
+        SENSOR_EVENTS.inc(applied, result='applied')
+        SENSOR_EVENTS.inc(stale, result='stale')
+        SENSOR_EVENTS.inc(invalid, result='invalid')
+        return {'status': 'success', 'applied': applied, 'stale': stale, 'invalid': invalid}
+
+    def _station(self, station_id: str, slot_id: str) -> _StationOccupancy:
+        """The station's bitmap for a reading of `slot_id`, within the tracking limits (under the lock)."""
+        station = self._stations.get(station_id)
+        if station is None:
+            if len(self._stations) >= self.max_stations:
+                raise ValueError(f"already tracking {self.max_stations} stations")
+            station = self._stations[station_id] = _StationOccupancy()
+        if slot_id not in station.positions and len(station.positions) >= self.max_slots_per_station:
+            raise ValueError(f"already tracking {self.max_slots_per_station} slots of station {station_id}")
+        return station
+
+    def is_live(self, station_id: str) -> bool:
+        """Whether the station's sensors have reported within `max_age` seconds."""
+        station = self._stations.get(str(station_id))
+        return station is not None and time.monotonic() - station.last_event_at < self.max_age
+
+    def apply(self, station_id: str, slots: List[SlotRecord]) -> List[SlotRecord]:
+        """
+        `slots` with the availability the sensors report, if the station is live.
+        Records whose availability changes are copied; the others are returned as is.
+        """
+        if not self.is_live(station_id):
+            return slots
+        station = self._stations[str(station_id)]
+        result = []
+        for slot in slots:
+            if slot.availability != 'Booked' and station.state(slot.slotId):
+                slot = slot.with_availability('Booked')
+            result.append(slot)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            stations = {station_id: dict(station.counts(), age_seconds=round(now - station.last_event_at, 3))
+                        for station_id, station in self._stations.items()}
+        return {
+            'stations': len(stations),
+            'live_stations': sum(1 for station in stations.values() if station['age_seconds'] < self.max_age),
+            'slots': sum(station['slots'] for station in stations.values()),
+            'occupied': sum(station['occupied'] for station in stations.values()),
+        }
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Synthetic slot sensor streams for the AI service's /iot/occupancy endpoint.
+
+Plays the part of the parking sensors (iot/smart_parking.ino) for every
+slot of a SyntheticData layout (the same stations and slotIds the fake
+backend serves): each slot is reported once at the start, then alternates
+between occupied and empty with exponentially distributed stays and gaps.
+Readings are batched the way a station gateway would send them, by count
+or every --interval seconds of sensor time, and replayed --speed times
+faster than real time.
+
+Against a running AI service (started with OCCUPANCY_INGEST_TOKEN set), with
+the fake backend's layout:
+
+    python occupancy_simulator.py --url http://127.0.0.1:8000/iot/occupancy --token $OCCUPANCY_INGEST_TOKEN --stations 50 --duration 3600 --speed 60
+
+Record a stream once, then replay the same events later:
+
+    python occupancy_simulator.py --duration 3600 --output stream.jsonl
+    python occupancy_simulator.py --input stream.jsonl --speed 0
+"""
+
+import argparse
+import heapq
+import json
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import requests
+
+from fake_backend import DEFAULT_CITIES, SyntheticData
+
+
+def sensor_stream(data: SyntheticData, duration: float, rng: random.Random, mean_stay: float = 1800,
+                  mean_gap: float = 600, start: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Sensor events {stationId, slotId, occupied, ts} for all slots of `data`
+    over `duration` seconds from `start` (epoch seconds, default now), in ts order.
+    """
+    start = time.time() if start is None else start
+    occupied_share = mean_stay / (mean_stay + mean_gap)
+    upcoming = []
+    for station in data.stations:
+        for slot in data.slots_by_station[station['_id']]:
+            occupied = rng.random() < occupied_share
+            heapq.heappush(upcoming, (start, slot['slotId'], station['stationId'], occupied))
+    end = start + duration
+    while upcoming:
+        ts, slot_id, station_id, occupied = heapq.heappop(upcoming)
+        if ts > end:
+            break
+        yield {'stationId': station_id, 'slotId': slot_id, 'occupied': occupied, 'ts': round(ts, 3)}
+        next_ts = ts + rng.expovariate(1 / (mean_stay if occupied else mean_gap))
+        heapq.heappush(upcoming, (next_ts, slot_id, station_id, not occupied))
+
+
+def batches(events: Iterable[Dict[str, Any]], batch_size: int, interval: float) -> Iterator[List[Dict[str, Any]]]:
+    """Group events into batches of at most `batch_size`, each spanning at most `interval` seconds of sensor time."""
+    batch: List[Dict[str, Any]] = []
+    for event in events:
+        if batch and (len(batch) >= batch_size or event['ts'] - batch[0]['ts'] >= interval):
+            yield batch
+            batch = []
+        batch.append(event)
+    if batch:
+        yield batch
+
+
+def replay(events: Iterable[Dict[str, Any]], send: Callable[[List[Dict[str, Any]]], Dict[str, Any]],
+           batch_size: int = 200, interval: float = 1.0, speed: float = 1.0) -> Dict[str, Any]:
+    """
+    Send `events` in batches, paced by their timestamps divided by `speed`
+    (0 sends as fast as possible). Returns totals of what was sent and applied.
+    """
+    totals = {'events': 0, 'batches': 0, 'applied': 0, 'stale': 0, 'invalid': 0, 'failed_batches': 0}
+    first_ts = wall_start = None
+    for batch in batches(events, batch_size, interval):
+        if first_ts is None:
+            first_ts, wall_start = batch[0]['ts'], time.perf_counter()
+        if speed > 0:
+            wait = (batch[-1]['ts'] - first_ts) / speed - (time.perf_counter() - wall_start)
+            if wait > 0:
+                time.sleep(wait)
+        try:
+            result = send(batch)
+        except requests.RequestException as e:
+            print(f"Batch of {len(batch)} events failed: {e}", file=sys.stderr)
+            totals['failed_batches'] += 1
+            continue
+        totals['events'] += len(batch)
+        totals['batches'] += 1
+        for key in ('applied', 'stale', 'invalid'):
+            totals[key] += result.get(key, 0)
+    totals['seconds'] = round(time.perf_counter() - wall_start, 3) if wall_start is not None else 0.0
+    return totals
+
+
+def http_sender(url: str, token: str = "", timeout: float = 10) -> Callable[[List[Dict[str, Any]]], Dict[str, Any]]:
+    """A `send` for replay() that POSTs each batch to the ingestion endpoint."""
+    session = requests.Session()
+    headers = {'X-Sensor-Token': token} if token else {}
+
+    def send(batch: List[Dict[str, Any]]) -> Dict[str, Any]:
+        response = session.post(url, json={'events': batch}, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+    return send
+
+
+def read_stream(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--url', default='http://127.0.0.1:8000/iot/occupancy')
+    parser.add_argument('--token', default='', help="X-Sensor-Token: the service's OCCUPANCY_INGEST_TOKEN")
+    parser.add_argument('--stations', type=int, default=50)
+    parser.add_argument('--slots-per-station', type=int, default=40)
+    parser.add_argument('--cities', default=','.join(DEFAULT_CITIES), help="comma separated city names")
+    parser.add_argument('--duration', type=float, default=600, help="seconds of sensor time to generate")
+    parser.add_argument('--mean-stay', type=float, default=1800, help="mean seconds a car stays in a slot")
+    parser.add_argument('--mean-gap', type=float, default=600, help="mean seconds a slot stays empty")
+    parser.add_argument('--speed', type=float, default=60, help="replay speed-up (0: as fast as possible)")
+    parser.add_argument('--batch-size', type=int, default=200)
+    parser.add_argument('--interval', type=float, default=1.0, help="max seconds of sensor time per batch")
+    parser.add_argument('--seed', type=int, default=42, help="layout and stream seed (match the fake backend's)")
+    parser.add_argument('--input', help="replay the events of this JSONL file instead of generating them")
+    parser.add_argument('--output', help="write the generated events to this JSONL file instead of sending them")
+    args = parser.parse_args(argv)
+
+    if args.input:
+        events: Iterable[Dict[str, Any]] = read_stream(args.input)
+    else:
+        data = SyntheticData(args.stations, args.slots_per_station, tuple(c.strip() for c in args.cities.split(',')),
+                             seed=args.seed)
+        events = sensor_stream(data, args.duration, random.Random(args.seed), args.mean_stay, args.mean_gap)
+    if args.output:
+        count = 0
+        with open(args.output, 'w') as f:
+            for event in events:
+                f.write(json.dumps(event) + '\n')
+                count += 1
+        print(f"Wrote {count} events to {args.output}")
+        return 0
+
+    totals = replay(events, http_sender(args.url, args.token), args.batch_size, args.interval, args.speed)
+    print(json.dumps(totals, indent=2))
+    return 1 if totals['failed_batches'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+from contextlib import contextmanager
+import cProfile
+import functools
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from config import PROFILE_SAMPLE_RATE, PROFILE_DIR
+from metrics import STAGE_SECONDS
+from turn_context import current_turn
+
+
+class TurnProfile:
+    """
+    Timing breakdown of one chat turn, collected when the client asks for it.
+
+    Stages nest: parse_intent includes preprocess_text and extract_entities.
+    Backend calls made by fan-out threads are recorded too, so their total
+    can exceed the turn's wall time.
+    """
+    def __init__(self):
+        self.start = time.perf_counter()
+        self._lock = threading.Lock()
+        self.stages: Dict[str, List[float]] = {}  # stage -> [calls, seconds]
+        self.backend_calls: List[Dict[str, Any]] = []
+
+    def add_stage(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            entry = self.stages.setdefault(stage, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    def add_backend_call(self, endpoint: str, method: str, status: Optional[int], started: float, seconds: float) -> None:
+        with self._lock:
+            self.backend_calls.append({
+                'endpoint': endpoint,
+                'method': method,
+                'status': status,
+                'start_ms': round((started - self.start) * 1000, 3),
+                'ms': round(seconds * 1000, 3),
+            })
+
+    def to_dict(self, branch: Optional[str] = None, typing_delay_ms: Optional[int] = None) -> Dict[str, Any]:
+        with self._lock:
+            stages = {stage: {'calls': calls, 'ms': round(seconds * 1000, 3)}
+                      for stage, (calls, seconds) in self.stages.items()}
+            backend_calls = sorted(self.backend_calls, key=lambda call: call['start_ms'])
+        return {
+            'total_ms': round((time.perf_counter() - self.start) * 1000, 3),
+            'branch': branch,
+            'stages': stages,
+            'backend': {'calls': len(backend_calls), 'ms': round(sum(call['ms'] for call in backend_calls), 3)},
+            'backend_calls': backend_calls,
+            # Shown by the client before the reply appears; not spent on the server
+            'client_typing_delay_ms': typing_delay_ms,
+        }
+
+
+def current_profile() -> Optional[TurnProfile]:
+    """The profile of the current turn, if the client asked for one."""
+    turn = current_turn()
+    return turn.profile if turn is not None else None
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a block as a turn stage, in the stage histogram and the turn's profile."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.labels(stage=name).observe(elapsed)
+        profile = current_profile()
+        if profile is not None:
+            profile.add_stage(name, elapsed)
+
+
+def timed_stage(name: str) -> Callable:
+    """Decorator form of `stage`."""
+    histogram = STAGE_SECONDS.labels(stage=name)
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                histogram.observe(elapsed)
+                profile = current_profile()
+                if profile is not None:
+                    profile.add_stage(name, elapsed)
+        return wrapper
+    return decorator
+
+
+def record_backend_call(endpoint: str, method: str, status: Optional[int], started: float, seconds: float) -> None:
+    """Add a backend request to the current turn's profile, if any."""
+    profile = current_profile()
+    if profile is not None:
+        profile.add_backend_call(endpoint, method, status, started, seconds)
+
+
+class ProfileSampler:
+    """
+    Runs a sampled fraction of turns under cProfile and writes each profile
+    to `directory` as a pstats file (<time>-<pid>-<id>-<branch>.prof), for
+    snakeviz, gprof2dot or flameprof. Only the thread answering the turn is
+    profiled; fan-out backend calls show up as time spent waiting on them.
+    """
+    def __init__(self, rate: float = PROFILE_SAMPLE_RATE, directory: str = PROFILE_DIR):
+        self.logger = logging.getLogger(__name__)
+        self.rate = rate
+        self.directory = directory
+
+    @contextmanager
+    def sample(self) -> Iterator[Optional[cProfile.Profile]]:
+        if self.rate <= 0 or random.random() >= self.rate:
+            yield None
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            # Another profiler is active in this thread
+            self.logger.debug(f"Profile sample skipped: {e}")
+            yield None
+            return
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+            self._dump(profiler)
+
+    def _dump(self, profiler: cProfile.Profile) -> None:
+        turn = current_turn()
+        branch = (turn.branch if turn is not None else None) or 'unknown'
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{uuid.uuid4().hex[:8]}-{branch}.prof"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            profiler.dump_stats(os.path.join(self.directory, name))
+        except OSError as e:
+            self.logger.warning(f"Could not write profile {name}: {e}")
@@ -0,0 +1,194 @@
+import logging
+import random
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import requests
+
+from config import (
+    BACKEND_BREAKER_FAILURES,
+    BACKEND_BREAKER_RESET,
+    BACKEND_RETRY_MAX,
+    BACKEND_RETRY_BACKOFF,
+    BACKEND_RETRY_BACKOFF_MAX,
+    BACKEND_RETRY_BUDGET_RATIO,
+    BACKEND_RETRY_BUDGET_RESERVE,
+)
+from metrics import BACKEND_RETRIES, CIRCUIT_TRANSITIONS
+from turn_context import time_left
+
+# Statuses worth retrying: the backend or a proxy in front of it is briefly unavailable
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """A request was not sent because its endpoint's circuit is open."""
+
+
+class DeadlineExceeded(requests.Timeout):
+    """A request was not sent because the turn's latency budget is spent."""
+
+
+def deadline_timeout(timeout: Tuple[float, float]) -> Tuple[float, float]:
+    """
+    The (connect, read) timeout cut down to what is left of the current turn's
+    deadline, if it has one. Raises DeadlineExceeded once the deadline has passed.
+    """
+    remaining = time_left()
+    if remaining is None:
+        return timeout
+    if remaining <= 0:
+        raise DeadlineExceeded("Turn deadline exceeded")
+    connect, read = timeout
+    return min(connect, remaining), min(read, remaining)
+
+
+class CircuitBreaker:
+    """
+    Fails requests to one endpoint fast while it keeps failing.
+
+    After `failure_threshold` failures in a row the circuit opens and requests are
+    refused for `reset_timeout` seconds. Then one trial request is let through
+    (half-open): its success closes the circuit, its failure opens it again.
+    """
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = BACKEND_BREAKER_FAILURES,
+                 reset_timeout: float = BACKEND_BREAKER_RESET, clock=time.monotonic):
+        self.logger = logging.getLogger(__name__)
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if self.clock() - self.opened_at < self.reset_timeout:
+                    return False
+                self._transition(self.HALF_OPEN)
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._trial_in_flight = False
+            if self.state != self.CLOSED:
+                self._transition(self.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                self.opened_at = self.clock()
+                self._transition(self.OPEN)
+
+    def release(self) -> None:
+        """The request let through ended without telling whether the endpoint is healthy."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def _transition(self, state: str) -> None:
+        self.logger.warning(f"Backend circuit for {self.name}: {self.state} -> {state}")
+        self.state = state
+        CIRCUIT_TRANSITIONS.inc(endpoint=self.name, state=state)
+
+
+class CircuitBreakers:
+    """One CircuitBreaker per backend endpoint name, created on first use."""
+    def __init__(self, failure_threshold: int = BACKEND_BREAKER_FAILURES,
+                 reset_timeout: float = BACKEND_BREAKER_RESET, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    endpoint, CircuitBreaker(endpoint, self.failure_threshold, self.reset_timeout, self.clock))
+        return breaker
+
+    def states(self) -> Dict[str, str]:
+        return {name: breaker.state for name, breaker in sorted(self._breakers.items())}
+
+
+class RetryBudget:
+    """
+    Caps retries at a fraction of request volume, so retries can't multiply the
+    load on a backend that is already failing. Each request earns `ratio` of a
+    retry and each retry spends one; at most `reserve` retries are banked.
+    """
+    def __init__(self, ratio: float = BACKEND_RETRY_BUDGET_RATIO, reserve: float = BACKEND_RETRY_BUDGET_RESERVE):
+        self.ratio = ratio
+        self.reserve = reserve
+        self.balance = reserve
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self.balance = min(self.reserve, self.balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self.balance < 1:
+                return False
+            self.balance -= 1
+            return True
+
+
+class RetryPolicy:
+    """
+    When to retry a backend request, and after how long. Only GETs are retried
+    (they are idempotent), after a connection error, a timeout or a 502/503/504,
+    at most `max_retries` times with full-jitter exponential backoff, while the
+    retry budget and the turn's deadline allow it.
+    """
+    def __init__(self, max_retries: int = BACKEND_RETRY_MAX, backoff: float = BACKEND_RETRY_BACKOFF,
+                 max_backoff: float = BACKEND_RETRY_BACKOFF_MAX, budget: Optional[RetryBudget] = None,
+                 rng: Optional[random.Random] = None):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.budget = budget or RetryBudget()
+        self.rng = rng or random.Random()
+
+    def delay(self, method: str, endpoint: str, attempt: int, response: Optional[requests.Response],
+              error: Optional[Exception]) -> Optional[float]:
+        """
+        Seconds to wait before retrying a request whose `attempt`-th try (from 0)
+        ended with `response` or `error`, or None if it shouldn't be retried.
+        """
+        if method != 'GET' or attempt >= self.max_retries:
+            return None
+        if error is not None:
+            if isinstance(error, (CircuitOpenError, DeadlineExceeded)) or \
+                    not isinstance(error, (requests.ConnectionError, requests.Timeout)):
+                return None
+        elif response is None or response.status_code not in RETRY_STATUSES:
+            return None
+        delay = self.rng.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        remaining = time_left()
+        if remaining is not None and remaining <= delay:
+            return None
+        if not self.budget.withdraw():
+            BACKEND_RETRIES.inc(endpoint=endpoint, outcome='budget_exhausted')
+            return None
+        BACKEND_RETRIES.inc(endpoint=endpoint, outcome='sent')
+        return delay
@@ -1,4 +1,9 @@
+import logging
 import uvicorn
+from config import AI_WORKERS, SESSION_BACKEND
 
 if __name__ == "__main__":
-    uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=False)
+    if AI_WORKERS > 1 and SESSION_BACKEND == "memory":
+        logging.warning("AI_WORKERS > 1 with SESSION_BACKEND=memory: each worker keeps its own sessions. "
+                        "Set SESSION_BACKEND=sqlite to share them.")
+    uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=False, workers=AI_WORKERS)
@@ -0,0 +1,359 @@
+import abc
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, time as dt_time
+from typing import Any, Dict, Iterator, Optional
+
+from config import SESSION_MAX_COUNT, SESSION_IDLE_TTL, SESSION_BACKEND, SESSION_SQLITE_PATH
+
+
+class SessionLoadError(Exception):
+    """The session store could not be read; unlike a missing session, the stored one may still exist."""
+
+
+class SessionStore:
+    """
+    Bounded session_id -> session map with LRU and idle-TTL eviction.
+
+    Drop-in for the plain dict AIModel used to keep sessions in: supports
+    `in`, `[]`, `[]=`, `get`, `pop`, `del` and `len`. Reading a session marks
+    it as recently used. Sessions idle for more than `idle_ttl` seconds are
+    dropped, and the least recently used sessions are dropped once
+    `max_sessions` is exceeded.
+    """
+    def __init__(self, max_sessions: int = SESSION_MAX_COUNT, idle_ttl: float = SESSION_IDLE_TTL):
+        self.logger = logging.getLogger(__name__)
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self._sessions: "OrderedDict[str, list]" = OrderedDict()  # session_id -> [session, last_access]
+        self._lock = threading.RLock()
+        self.created = 0
+        self.evicted_lru = 0
+        self.evicted_idle = 0
+
+    def _expired(self, last_access: float, now: float) -> bool:
+        return self.idle_ttl > 0 and now - last_access > self.idle_ttl
+
+    def _evict(self, now: float) -> None:
+        # Least recently used sessions are at the front, so idle ones are found first
+        while self._sessions:
+            session_id, (_, last_access) = next(iter(self._sessions.items()))
+            if not self._expired(last_access, now):
+                break
+            del self._sessions[session_id]
+            self.evicted_idle += 1
+        while len(self._sessions) > self.max_sessions:
+            session_id, _ = self._sessions.popitem(last=False)
+            self.evicted_lru += 1
+            self.logger.debug(f"Evicted least recently used session {session_id}")
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return False
+            if self._expired(entry[1], time.monotonic()):
+                del self._sessions[session_id]
+                self.evicted_idle += 1
+                return False
+            return True
+
+    def __getitem__(self, session_id: str) -> Any:
+        with self._lock:
+            entry = self._sessions[session_id]
+            entry[1] = time.monotonic()
+            self._sessions.move_to_end(session_id)
+            return entry[0]
+
+    def __setitem__(self, session_id: str, session: Any) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if session_id not in self._sessions:
+                self.created += 1
+            self._sessions[session_id] = [session, now]
+            self._sessions.move_to_end(session_id)
+            self._evict(now)
+
+    def __delitem__(self, session_id: str) -> None:
+        with self._lock:
+            del self._sessions[session_id]
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._sessions))
+
+    def get(self, session_id: str, default: Optional[Any] = None) -> Any:
+        with self._lock:
+            if session_id in self:
+                return self[session_id]
+            return default
+
+    def pop(self, session_id: str, default: Optional[Any] = None) -> Any:
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            return entry[0] if entry is not None else default
+
+    def evict_idle(self) -> None:
+        """Drop sessions that have been idle longer than the TTL."""
+        with self._lock:
+            self._evict(time.monotonic())
+
+    def stats(self) -> Dict[str, Any]:
+        """Session counts and eviction metrics."""
+        return {
+            'active': len(self._sessions),
+            'max_sessions': self.max_sessions,
+            'idle_ttl_seconds': self.idle_ttl,
+            'created': self.created,
+            'evicted_lru': self.evicted_lru,
+            'evicted_idle': self.evicted_idle,
+        }
+
+
+class SessionBackend(abc.ABC):
+    """
+    Where conversation state is kept between turns.
+
+    AIModel loads a session before a turn and saves it afterwards. Backends
+    with `shared = True` keep state outside the process, so it survives
+    restarts and is seen by every worker. `store` holds the sessions of the
+    turns served by this process and is what AIModel.sessions points to.
+    """
+    name = 'base'
+    shared = False
+    store: SessionStore
+
+    @abc.abstractmethod
+    def load(self, session_id: str) -> Optional[Any]:
+        """The saved session, or None if there is none. Raises SessionLoadError if the store can't be read."""
+
+    @abc.abstractmethod
+    def save(self, session_id: str, session: Any) -> None:
+        """Store the session after a turn."""
+
+    @abc.abstractmethod
+    def delete(self, session_id: str) -> None:
+        """Forget the session."""
+
+    def stats(self) -> Dict[str, Any]:
+        return {'backend': self.name}
+
+
+class InMemorySessionBackend(SessionBackend):
+    """
+    Sessions kept as live objects in a SessionStore of this process.
+    """
+    name = 'memory'
+
+    def __init__(self, store: Optional[SessionStore] = None):
+        self.store = store if store is not None else SessionStore()
+
+    def load(self, session_id: str) -> Optional[Any]:
+        return self.store.get(session_id)
+
+    def save(self, session_id: str, session: Any) -> None:
+        self.store[session_id] = session
+
+    def delete(self, session_id: str) -> None:
+        self.store.pop(session_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {'backend': self.name, **self.store.stats()}
+
+
+# Tag of the JSON object standing in for a value JSON has no type for
+TYPE_TAG = '__type__'
+
+
+def encode_state(value: Any) -> Any:
+    """
+    Session state as plain JSON values. Datetimes, dates, times, tuples, sets
+    and frozensets are written as tagged objects so decode_state() gives them
+    back with their type; any other non-JSON value raises TypeError.
+    """
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, dict):
+        encoded = {}
+        for key, item in value.items():
+            if not isinstance(key, str):
+                raise TypeError(f"Session state keys must be strings, got {key!r}")
+            encoded[key] = encode_state(item)
+        if TYPE_TAG in encoded:
+            raise TypeError(f"Session state key {TYPE_TAG!r} is reserved")
+        return encoded
+    if isinstance(value, list):
+        return [encode_state(item) for item in value]
+    # datetime before date: datetime is a date subclass
+    if isinstance(value, datetime):
+        return {TYPE_TAG: 'datetime', 'v': value.isoformat()}
+    if isinstance(value, date):
+        return {TYPE_TAG: 'date', 'v': value.isoformat()}
+    if isinstance(value, dt_time):
+        return {TYPE_TAG: 'time', 'v': value.isoformat()}
+    if isinstance(value, tuple):
+        return {TYPE_TAG: 'tuple', 'v': [encode_state(item) for item in value]}
+    if isinstance(value, (set, frozenset)):
+        items = sorted((encode_state(item) for item in value), key=json.dumps)
+        return {TYPE_TAG: type(value).__name__, 'v': items}
+    raise TypeError(f"Cannot store {type(value).__name__} value {value!r} in a shared session")
+
+
+_DECODERS = {
+    'datetime': datetime.fromisoformat,
+    'date': date.fromisoformat,
+    'time': dt_time.fromisoformat,
+    'tuple': tuple,
+    'set': set,
+    'frozenset': frozenset,
+}
+
+
+def decode_state(obj: Dict[str, Any]) -> Any:
+    """json.loads object_hook reversing encode_state()."""
+    tag = obj.get(TYPE_TAG)
+    if tag is None:
+        return obj
+    try:
+        decoder = _DECODERS[tag]
+    except KeyError:
+        raise ValueError(f"Unknown session value type {tag!r}") from None
+    return decoder(obj['v'])
+
+
+class SQLiteSessionBackend(SessionBackend):
+    """
+    Sessions stored as compact JSON in a local SQLite database in WAL mode,
+    shared by every worker process on the host.
+
+    `session_class` must provide `to_dict()` and `from_dict(data)`.
+    Rows idle for more than `idle_ttl` seconds are ignored on load, and idle
+    or least recently saved rows beyond `max_sessions` are pruned every
+    `prune_every` saves.
+    """
+    name = 'sqlite'
+    shared = True
+
+    def __init__(self, path: str, session_class: Any, idle_ttl: float = SESSION_IDLE_TTL,
+                 max_sessions: int = SESSION_MAX_COUNT, prune_every: int = 500):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.session_class = session_class
+        self.idle_ttl = idle_ttl
+        self.max_sessions = max_sessions
+        self.prune_every = prune_every
+        self.store = SessionStore(max_sessions=max_sessions, idle_ttl=idle_ttl)
+        self._local = threading.local()  # sqlite3 connections are per thread
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.saves = 0
+        self.errors = 0
+        self.pruned = 0
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "session_id TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._connection().execute("CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions(updated_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def dumps(state: Dict[str, Any]) -> str:
+        return json.dumps(encode_state(state), separators=(',', ':'), ensure_ascii=False)
+
+    @staticmethod
+    def parse(data: str) -> Dict[str, Any]:
+        return json.loads(data, object_hook=decode_state)
+
+    def load(self, session_id: str) -> Optional[Any]:
+        try:
+            row = self._connection().execute(
+                "SELECT data, updated_at FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            self.errors += 1
+            self.logger.warning(f"Failed to load session {session_id}: {e}")
+            raise SessionLoadError(f"Failed to load session {session_id}: {e}") from e
+        self.loads += 1
+        if row is None or (self.idle_ttl > 0 and time.time() - row[1] > self.idle_ttl):
+            return None
+        return self.session_class.from_dict(self.parse(row[0]))
+
+    def save(self, session_id: str, session: Any) -> None:
+        """Store the session; failures, including values that can't be serialized, are logged and counted."""
+        try:
+            self._connection().execute(
+                "INSERT INTO sessions (session_id, data, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(session_id) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                (session_id, self.dumps(session.to_dict()), time.time())
+            )
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            self.errors += 1
+            self.logger.warning(f"Failed to save session {session_id}: {e}")
+            return
+        with self._lock:
+            self.saves += 1
+            prune = self.saves % self.prune_every == 0
+        if prune:
+            self.prune()
+
+    def delete(self, session_id: str) -> None:
+        self._connection().execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def prune(self) -> None:
+        """Delete idle rows and the least recently saved rows beyond max_sessions."""
+        try:
+            conn = self._connection()
+            removed = 0
+            if self.idle_ttl > 0:
+                removed += conn.execute("DELETE FROM sessions WHERE updated_at < ?",
+                                        (time.time() - self.idle_ttl,)).rowcount
+            removed += conn.execute(
+                "DELETE FROM sessions WHERE session_id IN "
+                "(SELECT session_id FROM sessions ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_sessions,)
+            ).rowcount
+            self.pruned += removed
+        except sqlite3.Error as e:
+            self.errors += 1
+            self.logger.warning(f"Failed to prune sessions: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            stored = self._connection().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        except sqlite3.Error:
+            stored = None
+        return {
+            'backend': self.name,
+            'path': self.path,
+            'stored': stored,
+            'max_sessions': self.max_sessions,
+            'idle_ttl_seconds': self.idle_ttl,
+            'loads': self.loads,
+            'saves': self.saves,
+            'pruned': self.pruned,
+            'errors': self.errors,
+        }
+
+
+def create_session_backend(session_class: Any, backend: str = SESSION_BACKEND) -> SessionBackend:
+    """Session backend selected by SESSION_BACKEND ("memory" or "sqlite")."""
+    if backend == 'sqlite':
+        return SQLiteSessionBackend(SESSION_SQLITE_PATH, session_class)
+    if backend != 'memory':
+        raise ValueError(f"Unknown SESSION_BACKEND {backend!r}, expected 'memory' or 'sqlite'")
+    return InMemorySessionBackend()
@@ -0,0 +1,169 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from config import SLOT_CACHE_MAX_AGE, SLOT_CACHE_TTL, SLOT_CACHE_STALE_TTL
+from metrics import CACHE_LOOKUPS, SLOT_CACHE_AGE
+from slot_index import SlotRecord
+
+
+class _StationSlots:
+    __slots__ = ('slots', 'loaded_at', 'refreshing')
+
+    def __init__(self, slots: List[SlotRecord], loaded_at: float):
+        self.slots = slots
+        self.loaded_at = loaded_at
+        self.refreshing = False
+
+
+class StationSlotCache:
+    """
+    Short-lived cache of each station's slot list (/api/slots/station/{id}).
+
+    A list younger than `ttl` seconds is served as is (hit). Up to `stale_ttl`
+    seconds after that it is still served (stale), while one background refresh
+    per station reloads it. Older lists and stations not cached are loaded by
+    the caller (miss). Callers that allow stale lists are served them up to
+    `max_age` seconds old. `invalidate_slot` drops the list holding a slot the
+    user has just booked, and a refresh that started before an invalidation is
+    discarded. The cache is per process: other workers keep their copy until it
+    expires, so the booking user's session remembers the slot too (see AIModel).
+    A `ttl` of 0 disables the cache.
+    """
+    def __init__(self, ttl: float = SLOT_CACHE_TTL, stale_ttl: float = SLOT_CACHE_STALE_TTL,
+                 max_age: float = SLOT_CACHE_MAX_AGE):
+        self.logger = logging.getLogger(__name__)
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_age = max_age
+        self._entries: Dict[str, _StationSlots] = {}
+        # slot _id -> station key of the cached list holding it
+        self._station_of_slot: Dict[str, str] = {}
+        # Bumped by invalidate(); loads store their result only if it is unchanged
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # Refreshes run outside the requesting turn's context (no deadline, no request memo)
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix='slot-refresh')
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.invalidations = 0
+
+    def get(self, station_id: str, load: Callable[[], List[SlotRecord]], allow_stale: bool = False) -> List[SlotRecord]:
+        """
+        The slot list of `station_id`. `load` fetches it from the backend and may
+        raise; it is called on this thread on a miss, or in the background to
+        refresh a stale list. With `allow_stale`, a cached list up to `max_age`
+        is served as stale (for callers that update availability themselves).
+        """
+        if self.ttl <= 0:
+            return load()
+        slots, generation = self._lookup(station_id, load, allow_stale)
+        if slots is None:
+            slots = load()
+            self._store(station_id, slots, generation)
+        return slots
+
+    async def get_async(self, station_id: str, load: Callable[[], List[SlotRecord]],
+                        load_async: Callable[[], Awaitable[List[SlotRecord]]],
+                        allow_stale: bool = False) -> List[SlotRecord]:
+        """get() for the event loop: a miss awaits `load_async`; stale lists are still refreshed with `load`."""
+        if self.ttl <= 0:
+            return await load_async()
+        slots, generation = self._lookup(station_id, load, allow_stale)
+        if slots is None:
+            slots = await load_async()
+            self._store(station_id, slots, generation)
+        return slots
+
+    def _lookup(self, station_id: str, load: Callable[[], List[SlotRecord]],
+                allow_stale: bool) -> Tuple[Optional[List[SlotRecord]], int]:
+        """The cached list (None on a miss) and the generation a loaded list must be stored with."""
+        servable = max(self.max_age, self.ttl + self.stale_ttl) if allow_stale else self.ttl + self.stale_ttl
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(station_id)
+            age = now - entry.loaded_at if entry is not None else None
+            if age is not None and age < self.ttl:
+                self.hits += 1
+                result = 'hit'
+            elif age is not None and age < servable:
+                self.stale_hits += 1
+                result = 'stale'
+                if not entry.refreshing:
+                    entry.refreshing = True
+                    self._refresher.submit(self._refresh, station_id, entry, load, self._generations.get(station_id, 0))
+            else:
+                self.misses += 1
+                result = 'miss'
+            generation = self._generations.get(station_id, 0)
+        CACHE_LOOKUPS.inc(cache='station_slots', result=result)
+        if result == 'miss':
+            return None, generation
+        SLOT_CACHE_AGE.observe(age, result=result)
+        return entry.slots, generation
+
+    def _refresh(self, station_id: str, entry: _StationSlots, load: Callable[[], List[SlotRecord]],
+                 generation: int) -> None:
+        try:
+            slots = load()
+        except Exception as e:
+            self.logger.warning(f"Slot list refresh failed for station {station_id}, serving stale data: {e}")
+            entry.refreshing = False
+            return
+        self.refreshes += 1
+        if not self._store(station_id, slots, generation):
+            entry.refreshing = False
+
+    def _store(self, station_id: str, slots: List[SlotRecord], generation: int) -> bool:
+        with self._lock:
+            if self._generations.get(station_id, 0) != generation:
+                return False
+            old = self._entries.get(station_id)
+            if old is not None:
+                for slot in old.slots:
+                    self._station_of_slot.pop(slot._id, None)
+            self._entries[station_id] = _StationSlots(slots, time.monotonic())
+            for slot in slots:
+                if slot._id:
+                    self._station_of_slot[slot._id] = station_id
+            return True
+
+    def invalidate(self, station_id: Optional[str] = None) -> None:
+        """Drop one station's slot list, or all of them."""
+        with self._lock:
+            station_ids = [station_id] if station_id is not None else list(self._entries)
+            for key in station_ids:
+                self._generations[key] = self._generations.get(key, 0) + 1
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    self.invalidations += 1
+                    for slot in entry.slots:
+                        self._station_of_slot.pop(slot._id, None)
+
+    def invalidate_slot(self, slot_object_id: str) -> None:
+        """Drop the cached slot list holding the slot with this Mongo _id, if any."""
+        station_id = self._station_of_slot.get(slot_object_id)
+        if station_id is not None:
+            self.invalidate(station_id)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        now = time.monotonic()
+        with self._lock:
+            ages = [now - entry.loaded_at for entry in self._entries.values()]
+        return {
+            'stations': len(ages),
+            'ttl': self.ttl,
+            'stale_ttl': self.stale_ttl,
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'hit_ratio': round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            'refreshes': self.refreshes,
+            'invalidations': self.invalidations,
+            'max_age_seconds': round(max(ages), 3) if ages else 0.0,
+        }
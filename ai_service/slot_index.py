@@ -0,0 +1,138 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+from config import SLOT_INDEX_TTL, SLOT_INDEX_MAX_ENTRIES
+from metrics import CACHE_LOOKUPS
+
+_HITS = CACHE_LOOKUPS.labels(cache='slot_index', result='hit')
+_MISSES = CACHE_LOOKUPS.labels(cache='slot_index', result='miss')
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class SlotRecord:
+    """
+    The fields of a backend slot that listings and bookings use. The station is
+    kept as an interned stationId, so the many slots of one station share one
+    string; station name and address are added only when the slot is serialized
+    for a response (`to_dict`). `stationRef` is the slot's own `stationId`
+    field as the backend returned it (the station's _id), kept so serialized
+    slots keep the backend's JSON shape.
+    """
+    __slots__ = ('_id', 'slotId', 'price', 'type', 'availability', 'stationId',
+                 'stationRef', 'status', 'images', 'createdAt', 'updatedAt')
+
+    def __init__(self, _id: Optional[str], slotId: str, price: Any = None, type: Optional[str] = None,
+                 availability: Optional[str] = None, stationId: Optional[str] = None,
+                 stationRef: Optional[str] = None, status: Optional[str] = None, images: Optional[list] = None,
+                 createdAt: Optional[str] = None, updatedAt: Optional[str] = None):
+        self._id = _id
+        self.slotId = slotId
+        self.price = price
+        self.type = _intern(type)
+        self.availability = _intern(availability)
+        self.stationId = _intern(stationId)
+        self.stationRef = _intern(stationRef)
+        self.status = _intern(status)
+        self.images = images
+        self.createdAt = createdAt
+        self.updatedAt = updatedAt
+
+    @classmethod
+    def from_slot(cls, slot: dict, station_id: Optional[str] = None) -> 'SlotRecord':
+        """Build from a backend slot dict. `station_id` is the station the slot was fetched for."""
+        return cls(slot.get('_id'), slot.get('slotId'), slot.get('price'), slot.get('type'),
+                   slot.get('availability'), station_id or slot.get('stationId'),
+                   slot.get('stationId'), slot.get('status'), slot.get('images'),
+                   slot.get('createdAt'), slot.get('updatedAt'))
+
+    def with_availability(self, availability: str) -> 'SlotRecord':
+        """A copy of this record with another availability."""
+        return SlotRecord(self._id, self.slotId, self.price, self.type, availability, self.stationId,
+                          self.stationRef, self.status, self.images, self.createdAt, self.updatedAt)
+
+    def to_dict(self, station: Optional[dict] = None) -> Dict[str, Any]:
+        """
+        The slot in the JSON shape of slot listings: the backend slot's fields,
+        in the backend's order, plus `station`'s name and address. Fields the
+        backend did not return are left out.
+        """
+        data = {'_id': self._id, 'slotId': self.slotId}
+        if self.stationRef is not None:
+            data['stationId'] = self.stationRef
+        data['type'] = self.type
+        data['price'] = self.price
+        if self.status is not None:
+            data['status'] = self.status
+        data['availability'] = self.availability
+        for key in ('images', 'createdAt', 'updatedAt'):
+            value = getattr(self, key)
+            if value is not None:
+                data[key] = value
+        if station is not None or self.stationId:
+            data['stationName'] = station.get('stationName', 'Unknown') if station else 'Unknown'
+            data['stationAddress'] = station.get('address', 'Unknown') if station else 'Unknown'
+        return data
+
+
+class SlotIndex:
+    """
+    Cache of slotId -> slot summary used to resolve bookings by slotId.
+
+    It is fed by the per-station slot fetches the assistant already makes, so
+    booking a slot the user has just seen needs no extra backend call. Records
+    are shared SlotRecords and must not be modified by callers. Entries
+    expire after `ttl` seconds. The least recently added entries are dropped
+    once `max_entries` is reached.
+    """
+    def __init__(self, ttl: float = SLOT_INDEX_TTL, max_entries: int = SLOT_INDEX_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # slotId -> (added_at, SlotRecord)
+        self._lock = threading.Lock()
+
+    def add(self, slot: dict, station_id: Optional[str] = None) -> Optional[SlotRecord]:
+        """
+        Index one backend slot dict. `station_id` is the station the slot was fetched for.
+        Returns its SlotRecord, or None for a slot without a slotId.
+        """
+        if not slot.get('slotId'):
+            return None
+        record = SlotRecord.from_slot(slot, station_id)
+        if record._id:
+            with self._lock:
+                self._entries.pop(record.slotId, None)
+                self._entries[record.slotId] = (time.monotonic(), record)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return record
+
+    def add_slots(self, slots: Iterable[dict], station_id: Optional[str] = None) -> List[SlotRecord]:
+        """Index every slot from a per-station fetch and return their records, in order."""
+        records = (self.add(slot, station_id) for slot in slots)
+        return [record for record in records if record is not None]
+
+    def get(self, slot_id: str) -> Optional[SlotRecord]:
+        """Get the cached record for a slotId, or None if unknown or expired."""
+        record = None
+        with self._lock:
+            entry = self._entries.get(slot_id)
+            if entry is not None:
+                added_at, record = entry
+                if time.monotonic() - added_at > self.ttl:
+                    del self._entries[slot_id]
+                    record = None
+        (_MISSES if record is None else _HITS).inc()
+        return record
+
+    def discard(self, slot_id: str) -> None:
+        with self._lock:
+            self._entries.pop(slot_id, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
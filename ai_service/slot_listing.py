@@ -0,0 +1,92 @@
+import uuid
+from typing import Any, Dict, List, Optional
+
+from config import SLOT_PAGE_SIZE, SLOT_PAGE_SIZE_MAX, SLOT_RESULTS_TOP_K
+from slot_index import SlotRecord
+
+
+def clamp_page_size(page_size: Optional[int]) -> int:
+    """Requested page size limited to 1..SLOT_PAGE_SIZE_MAX, SLOT_PAGE_SIZE if not given."""
+    if not page_size:
+        return SLOT_PAGE_SIZE
+    return max(1, min(int(page_size), SLOT_PAGE_SIZE_MAX))
+
+
+class SlotListing:
+    """
+    Compact, session-stored state of the last slot listing shown to a user:
+    the ranked slotIds (top SLOT_RESULTS_TOP_K), how many were free, and the
+    page being viewed. Slot details are not kept; pages are rebuilt from the
+    slot index.
+
+    Positions are 1-based over the whole listing ("book slot 23" is the 23rd
+    result, on whichever page it was shown); "first"/"last" style references
+    are relative to the page being viewed.
+    """
+    CONTEXT_KEY = 'slot_listing'
+
+    def __init__(self, ids: List[str], free: int, page_size: int, offset: int = 0,
+                 listing_id: Optional[str] = None, total: Optional[int] = None):
+        self.ids = ids
+        self.free = free
+        self.page_size = page_size
+        self.offset = offset
+        self.listing_id = listing_id or uuid.uuid4().hex[:8]
+        self.total = len(ids) if total is None else total
+
+    @classmethod
+    def from_slots(cls, slots: List[SlotRecord], page_size: Optional[int] = None) -> 'SlotListing':
+        ranked = [slot.slotId for slot in slots]
+        free = sum(1 for slot in slots if slot.availability == 'Free')
+        return cls(ranked[:SLOT_RESULTS_TOP_K], free, clamp_page_size(page_size), total=len(ranked))
+
+    @classmethod
+    def load(cls, context: Dict[str, Any]) -> Optional['SlotListing']:
+        """The listing stored in a session context, if any."""
+        data = context.get(cls.CONTEXT_KEY)
+        if not data:
+            return None
+        return cls(data['ids'], data['free'], data['size'], data['offset'], data['id'], data.get('total'))
+
+    def save(self, context: Dict[str, Any]) -> None:
+        context[self.CONTEXT_KEY] = {
+            'id': self.listing_id, 'ids': self.ids, 'free': self.free,
+            'size': self.page_size, 'offset': self.offset, 'total': self.total,
+        }
+
+    def cursor(self, offset: int) -> str:
+        return f"{self.listing_id}.{offset}"
+
+    def offset_for(self, cursor: str) -> Optional[int]:
+        """Offset a cursor points to, or None if it belongs to another (older) listing."""
+        listing_id, _, offset = cursor.partition('.')
+        if listing_id != self.listing_id or not offset.isdigit():
+            return None
+        return min(int(offset), max(len(self.ids) - 1, 0))
+
+    def page_ids(self) -> List[str]:
+        return self.ids[self.offset:self.offset + self.page_size]
+
+    def page_info(self) -> Dict[str, Any]:
+        """Pagination metadata returned with each page."""
+        next_offset = self.offset + self.page_size
+        return {
+            'offset': self.offset,
+            'page_size': self.page_size,
+            'total': self.total,
+            'next_cursor': self.cursor(next_offset) if next_offset < len(self.ids) else None,
+            'prev_cursor': self.cursor(max(self.offset - self.page_size, 0)) if self.offset > 0 else None,
+        }
+
+    def at_position(self, position: int) -> Optional[str]:
+        """slotId at a 1-based position in the whole listing."""
+        if 1 <= position <= len(self.ids):
+            return self.ids[position - 1]
+        return None
+
+    def on_page(self, index: int) -> Optional[str]:
+        """slotId at an index of the current page (negative counts from the end)."""
+        page = self.page_ids()
+        if page and -len(page) <= index < len(page):
+            return page[index]
+        return None
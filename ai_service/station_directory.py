@@ -0,0 +1,140 @@
+import bisect
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from config import STATION_DIRECTORY_TTL
+
+
+class _StationIndex:
+    """
+    Immutable snapshot of the station list and its lookup indexes.
+    """
+    def __init__(self, stations: List[dict]):
+        self.stations = stations
+        self.loaded_at = time.monotonic()
+        self.by_name: Dict[str, dict] = {}
+        self.by_id: Dict[str, dict] = {}
+        named = []
+        for position, station in enumerate(stations):
+            name = station.get('stationName')
+            if name and isinstance(name, str):
+                key = name.lower()
+                # Keep the first station for duplicate names, like a linear scan would
+                self.by_name.setdefault(key, station)
+                named.append((key, position))
+            for id_field in ('stationId', '_id'):
+                station_id = station.get(id_field)
+                if station_id:
+                    self.by_id.setdefault(str(station_id), station)
+        named.sort()
+        # Sorted lowercase names with their position in the backend list, for prefix search
+        self.prefix_names = [key for key, _ in named]
+        self.prefix_positions = [position for _, position in named]
+
+
+class StationDirectory:
+    """
+    In-process cache of the backend station list (/api/stations).
+
+    Resolves station names and IDs without a network hop:
+    - exact lowercase name -> station (hash index)
+    - name prefix -> station (sorted index, binary search)
+    - stationId or Mongo _id -> station (hash index)
+
+    The list is refreshed when it is older than `ttl` seconds. Only one thread
+    refreshes at a time; the others keep using the previous snapshot.
+    """
+    def __init__(self, backend, ttl: float = STATION_DIRECTORY_TTL):
+        self.logger = logging.getLogger(__name__)
+        self.backend = backend
+        self.ttl = ttl
+        self._index: Optional[_StationIndex] = None
+        self._refresh_lock = threading.Lock()
+
+    def refresh(self) -> None:
+        """
+        Reload the station list from the backend. Raises requests.RequestException on failure.
+        """
+        response = self.backend.get('stations', "/api/stations")
+        response.raise_for_status()
+        stations = response.json()
+        self._index = _StationIndex(stations if isinstance(stations, list) else [])
+        self.logger.info(f"Station directory refreshed with {len(self._index.stations)} stations")
+
+    async def ensure_async(self, client) -> None:
+        """
+        Load the station list with an AsyncBackendClient if it is missing or older
+        than the TTL, so the lookups below answer without a blocking request.
+        A failed reload of a stale list keeps the old one; a failed first load raises.
+        """
+        index = self._index
+        if index is not None and time.monotonic() - index.loaded_at < self.ttl:
+            return
+        try:
+            response = await client.get('stations', "/api/stations")
+            response.raise_for_status()
+        except Exception as e:
+            if index is None:
+                raise
+            self.logger.warning(f"Station directory refresh failed, serving stale data: {e}")
+            return
+        stations = response.json()
+        self._index = _StationIndex(stations if isinstance(stations, list) else [])
+        self.logger.info(f"Station directory refreshed with {len(self._index.stations)} stations")
+
+    def invalidate(self) -> None:
+        """Force a reload on the next lookup."""
+        self._index = None
+
+    def _current(self) -> _StationIndex:
+        index = self._index
+        if index is not None and time.monotonic() - index.loaded_at < self.ttl:
+            return index
+        if index is None:
+            # Nothing to serve yet: wait for whoever is loading
+            with self._refresh_lock:
+                if self._index is None:
+                    self.refresh()
+                return self._index
+        # Stale: one caller refreshes, the rest serve the old snapshot
+        if self._refresh_lock.acquire(blocking=False):
+            try:
+                if self._index is index:
+                    self.refresh()
+            except Exception as e:
+                self.logger.warning(f"Station directory refresh failed, serving stale data: {e}")
+            finally:
+                self._refresh_lock.release()
+        return self._index or index
+
+    def stations(self) -> List[dict]:
+        """All stations, in backend order."""
+        return list(self._current().stations)
+
+    def get(self, station_id: str) -> Optional[dict]:
+        """Find a station by stationId or Mongo _id."""
+        return self._current().by_id.get(str(station_id))
+
+    def find_by_name(self, name: str) -> Optional[dict]:
+        """Find a station whose name matches exactly, ignoring case."""
+        return self._current().by_name.get(name.lower())
+
+    def find_by_prefix(self, prefix: str) -> Optional[dict]:
+        """
+        Find the first station (in backend order) whose name starts with `prefix`, ignoring case.
+        """
+        index = self._current()
+        prefix = prefix.lower()
+        names = index.prefix_names
+        start = bisect.bisect_left(names, prefix)
+        best = None
+        # Names sharing the prefix are contiguous in sorted order
+        for i in range(start, len(names)):
+            if not names[i].startswith(prefix):
+                break
+            position = index.prefix_positions[i]
+            if best is None or position < best:
+                best = position
+        return index.stations[best] if best is not None else None
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script for the async execution mode: turns answered on the event loop with the async backend client
+"""
+
+import asyncio
+import time
+from ai_model import AIModel
+from fake_backend import FakeBackend, SyntheticData, parse_route_faults
+from metrics import FALLBACKS, STAGE_SECONDS
+
+BOOKING_SCRIPT = ["hello", "Show parking stations in Bangalore", "yes", "car", "tomorrow", "from 2:00pm to 5:00pm",
+                  "book slot 1 tomorrow from 2:00pm to 5:00pm", "yes", "coupon", "yes"]
+
+
+def make_model(backend: FakeBackend) -> AIModel:
+    return AIModel(backend=backend.client(), async_backend=backend.async_client())
+
+
+def test_async_turns_match_sync_turns():
+    """The booking flow takes the same path in both modes, and the booking POST is sent once"""
+    sync_backend = FakeBackend(SyntheticData(stations=6, slots_per_station=8))
+    async_backend = FakeBackend(SyntheticData(stations=6, slots_per_station=8))
+    sync_model, async_model = make_model(sync_backend), make_model(async_backend)
+
+    async def run_async():
+        results = [await async_model.get_ai_response_async("async@example.com", text, "token-1")
+                   for text in BOOKING_SCRIPT]
+        await async_model.aclose()
+        return results
+
+    async_results = asyncio.run(run_async())
+    for text, async_result in zip(BOOKING_SCRIPT, async_results):
+        sync_result = sync_model.get_ai_response("sync@example.com", text, "token-1")
+        print(f"{text!r}: {async_result['intent']}")
+        assert async_result['intent'] == sync_result['intent'], text
+        assert len(async_result.get('data') or []) == len(sync_result.get('data') or []), text
+    assert 'Booking confirmed' in async_results[-1]['response']
+    assert async_backend.stats()['requests']['create_booking'] == 1
+    assert async_backend.stats()['bookings'] == 1
+    # The sync client of the async model never sent anything itself
+    assert async_backend.stats()['requests'] == sync_backend.stats()['requests']
+    print("Async/sync parity tests passed")
+
+
+def test_concurrent_turns_share_the_loop():
+    """Slow backend calls of many turns overlap on one thread; counters count each turn once"""
+    backend = FakeBackend(SyntheticData(stations=12, slots_per_station=4),
+                          route_faults=parse_route_faults("stations_search=50,slots_by_station=50,stations=50"))
+    model = make_model(backend)
+    before = FALLBACKS.value(intent='unknown')
+
+    async def run_concurrently():
+        start = time.perf_counter()
+        results = await asyncio.gather(*(model.get_ai_response_async(f"user{i}", "Show car slots in Chennai")
+                                         for i in range(50)))
+        elapsed = time.perf_counter() - start
+        unknown = await model.get_ai_response_async("user-x", "qwerty zxcv")
+        await model.aclose()
+        return results, elapsed, unknown
+
+    results, elapsed, unknown = asyncio.run(run_concurrently())
+    print(f"50 turns in {elapsed * 1000:.0f} ms")
+    assert all(result['intent'] == 'view_slots_filtered' and result['data'] for result in results)
+    # Each turn waits on the city search, then on its stations' slots: two rounds, not 50 x 3 calls in a row
+    assert elapsed < 1.5
+    assert unknown['intent'] == 'unknown'
+    assert FALLBACKS.value(intent='unknown') == before + 1
+    print("Concurrent async turn tests passed")
+
+
+def test_async_turn_runs_once():
+    """A turn that waits on several backend rounds parses its text and creates its session once"""
+    backend = FakeBackend(SyntheticData(stations=4, slots_per_station=3))
+    model = make_model(backend)
+    parses = STAGE_SECONDS.count(stage='parse_intent')
+
+    async def run():
+        result = await model.get_ai_response_async("once@example.com", "Show car slots in Chennai")
+        await model.aclose()
+        return result
+
+    result = asyncio.run(run())
+    assert result['intent'] == 'view_slots_filtered' and result['data']
+    assert STAGE_SECONDS.count(stage='parse_intent') == parses + 1
+    assert model.sessions.stats()['created'] == 1
+    print("Single async run tests passed")
+
+
+def test_proxy_to_backend_async():
+    """/process_intent's proxy runs on the loop too"""
+    backend = FakeBackend(SyntheticData(stations=3, slots_per_station=2))
+    model = make_model(backend)
+
+    async def run():
+        result = await model.proxy_to_backend_async({'intent': 'navigate_search_stations', 'entities': {}})
+        await model.aclose()
+        return result
+
+    result = asyncio.run(run())
+    assert result['status'] == 'success' and len(result['data']) == 3
+    print("Async proxy tests passed")
+
+
+if __name__ == "__main__":
+    test_async_turns_match_sync_turns()
+    test_concurrent_turns_share_the_loop()
+    test_async_turn_runs_once()
+    test_proxy_to_backend_async()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script for batch chat processing: per-session ordering and shared backend GETs
+"""
+
+import json
+import threading
+import time
+from collections import Counter
+import requests
+from ai_handler import AIHandler
+from ai_model import AIModel
+from backend_client import BackendClient, RequestMemo, memo_scope
+from resilience import RetryPolicy
+
+STATIONS = [{'_id': f'oid{i}', 'stationId': f'ST{i:03d}', 'stationName': f'Station {i}',
+             'name': f'Station {i}', 'address': f'Road {i}', 'city': 'bangalore'} for i in range(3)]
+SLOTS = [{'_id': f'slot{i}', 'slotId': f'SL{i}', 'type': 'Car', 'price': 20, 'availability': 'Free'} for i in range(4)]
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, data):
+        self.text = json.dumps(data)
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class CountingSession:
+    """Replaces the client's requests.Session and counts GETs per path"""
+    def __init__(self):
+        self.calls = Counter()
+        self.lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        path = url.split('://', 1)[1].split('/', 1)[1]
+        with self.lock:
+            self.calls[path] += 1
+        time.sleep(0.02)
+        if path.startswith('api/stations/search/'):
+            return FakeResponse({'success': True, 'stations': STATIONS})
+        if path == 'api/stations':
+            return FakeResponse(STATIONS)
+        if path.startswith('api/slots/station/'):
+            return FakeResponse(SLOTS)
+        return FakeResponse({})
+
+
+def test_chat_batch():
+    """Sessions keep their own order and identical slot/station GETs are sent once"""
+    client = BackendClient(base_url='http://backend.test')
+    client.session = CountingSession()
+    handler = AIHandler(model=AIModel(backend=client))
+
+    items = []
+    for n in range(6):
+        for text in ["hello", "Show car slots in Bangalore", "What can you do?"]:
+            items.append({'session_id': f'kiosk-{n}', 'text': text, 'token': ""})
+
+    result = handler.process_batch(items)
+    print(f"Batch: {result['sessions']} sessions, {result['backend_requests']} backend requests, "
+          f"{result['deduplicated_requests']} deduplicated")
+    print(f"GETs by path: {dict(client.session.calls)}")
+
+    assert result['status'] == 'success' and len(result['results']) == len(items)
+    for item, response in zip(items, result['results']):
+        assert 'response' in response, (item, response)
+    for n in range(6):
+        history = handler.model.sessions[f'kiosk-{n}'].history
+        assert [turn['user'] for turn in history] == ["hello", "Show car slots in Bangalore", "What can you do?"]
+    assert all(count == 1 for count in client.session.calls.values()), client.session.calls
+    assert result['deduplicated_requests'] > 0
+
+    # Outside a batch nothing is memoized
+    handler.process_text("Show car slots in Bangalore", "single")
+    assert client.session.calls['api/stations/search/bangalore'] == 2
+
+    too_many = handler.process_batch([{'session_id': 's', 'text': 'hi'}] * 10 ** 6)
+    assert too_many['status'] == 'error'
+    print("Batch chat tests passed")
+
+
+def test_batch_memo_scope():
+    """Only listed endpoints are reused, failures are not kept, and a POST clears the memo"""
+    client = BackendClient(base_url='http://backend.test', retries=RetryPolicy(max_retries=0))
+    client.session = CountingSession()
+    failures = iter([requests.ConnectionError("reset")])
+
+    def flaky_request(method, url, **kwargs):
+        if url.endswith('/api/stations'):
+            failure = next(failures, None)
+            if failure is not None:
+                raise failure
+        return CountingSession.request(client.session, method, url, **kwargs)
+    client.session.request = flaky_request
+
+    with memo_scope(RequestMemo(frozenset({'stations'}))) as memo:
+        try:
+            client.get('stations', '/api/stations')
+        except requests.ConnectionError:
+            pass
+        client.get('stations', '/api/stations')
+        client.get('stations', '/api/stations')
+        client.get('slots_by_station', '/api/slots/station/oid1')
+        client.get('slots_by_station', '/api/slots/station/oid1')
+        client.post('create_booking', '/api/bookings', json={'slot': 'slot1'})
+        client.get('stations', '/api/stations')
+    calls = client.session.calls
+    assert calls['api/stations'] == 2 and calls['api/slots/station/oid1'] == 2, calls
+    assert (memo.sent, memo.reused) == (3, 1)
+    print("Batch memo scope tests passed")
+
+
+if __name__ == "__main__":
+    test_chat_batch()
+    test_batch_memo_scope()
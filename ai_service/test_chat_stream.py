@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script for streamed chat turns: event order and per-station slot batches
+"""
+
+import json
+import time
+from ai_handler import AIHandler
+from ai_model import AIModel
+from backend_client import BackendClient
+
+STATIONS = [{'_id': f'oid{i}', 'stationId': f'ST{i:03d}', 'stationName': f'Station {i}',
+             'name': f'Station {i}', 'address': f'Road {i}', 'city': 'bangalore'} for i in range(3)]
+# The first station answers last
+STATION_DELAYS = {'ST000': 0.3, 'ST001': 0.05, 'ST002': 0.1}
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, data):
+        self.text = json.dumps(data)
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class SlowStationSession:
+    """Replaces the client's requests.Session; each station's slots take a different time"""
+    def request(self, method, url, **kwargs):
+        path = url.split('://', 1)[1].split('/', 1)[1]
+        if path.startswith('api/stations/search/'):
+            return FakeResponse({'success': True, 'stations': STATIONS})
+        if path.startswith('api/slots/station/'):
+            station_id = path.rsplit('/', 1)[1]
+            time.sleep(STATION_DELAYS[station_id])
+            return FakeResponse([{'_id': f'{station_id}-s{i}', 'slotId': f'{station_id}-SL{i}', 'type': 'Car',
+                                  'price': 20, 'availability': 'Free'} for i in range(2)])
+        return FakeResponse({})
+
+
+def test_chat_stream():
+    """Intent first, slot batches in completion order, then follow-up and the full result"""
+    client = BackendClient(base_url='http://backend.test')
+    client.session = SlowStationSession()
+    handler = AIHandler(model=AIModel(backend=client))
+
+    start = time.perf_counter()
+    events = []
+    for event, payload in handler.stream_text("Show car slots in Bangalore", "stream-1"):
+        events.append((event, json.loads(payload), time.perf_counter() - start))
+        print(f"{events[-1][2] * 1000:6.0f} ms  {event}")
+
+    names = [event for event, _, _ in events]
+    assert names == ['intent', 'slots', 'slots', 'slots', 'followup', 'done'], names
+    assert events[0][1]['intent'] == 'view_slots_filtered'
+    assert [data['stationId'] for _, data, _ in events[1:4]] == ['ST001', 'ST002', 'ST000']
+    # The fastest station's slots arrive well before the slowest station is done
+    assert events[1][2] < events[3][2] - 0.15
+
+    done = events[-1][1]
+    assert [slot['slotId'] for slot in done['data']][:2] == ['ST000-SL0', 'ST000-SL1'], "data keeps station order"
+    assert done['response'].endswith(events[4][1]['question'])
+
+    # A turn that needs no backend data still gets intent and done
+    names = [event for event, _ in handler.stream_text("hello", "stream-2")]
+    assert names[0] == 'intent' and names[-1] == 'done', names
+    print("Chat stream tests passed")
+
+
+def test_streamed_slots_match_the_listing():
+    """Streamed slot batches leave out slots the session booked and hold at most a page"""
+    client = BackendClient(base_url='http://backend.test')
+    client.session = SlowStationSession()
+    model = AIModel(backend=client)
+    handler = AIHandler(model=model)
+    handler.process_text("hello", "stream-3")
+    model.sessions["stream-3"].context['booked_slots'] = {'ST001-s0': time.time()}
+
+    batches = {json.loads(payload)['stationId']: json.loads(payload)
+               for event, payload in handler.stream_text("Show car slots in Bangalore", "stream-3", page_size=1)
+               if event == 'slots'}
+    assert [slot['slotId'] for slot in batches['ST001']['slots']] == ['ST001-SL1'], "booked slot left out"
+    assert batches['ST001']['total'] == 1
+    assert [slot['slotId'] for slot in batches['ST000']['slots']] == ['ST000-SL0'], "capped at the page size"
+    assert batches['ST000']['total'] == 2
+    print("Streamed slot batch tests passed")
+
+
+if __name__ == "__main__":
+    test_chat_stream()
+    test_streamed_slots_match_the_listing()
@@ -1,4 +1,6 @@
+import re
 from ai_model import AIModel
+from intents import ENTITY_RULES
 
 # Use the extract_entities method from AIModel
 ai_model = AIModel()
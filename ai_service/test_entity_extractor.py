@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test script for the compiled entity extractor.
+Checks that it returns exactly the same entities (and key order) as the original rule loop.
+"""
+
+import random
+import re
+from intents import ENTITY_RULES, CITY_CORRECTIONS
+from entity_extractor import EntityExtractor
+
+
+def legacy_extract_entities(text: str) -> dict:
+    """The original AIModel.extract_entities implementation"""
+    entities = {}
+    text_lower = text.lower()
+
+    cities = ['bangalore', 'delhi', 'mumbai', 'chennai', 'kolkata', 'hyderabad', 'pune', 'ahmedabad', 'jaipur', 'surat']
+    for city in cities:
+        if city in text_lower:
+            entities['city'] = city
+            break
+
+    vehicle_types = ['car', 'cars', 'bike', 'bikes', 'scooter', 'scooters',
+                     'motorcycle', 'motorcycles', 'vehicle', 'vehicles']
+    for vehicle in vehicle_types:
+        if vehicle in text_lower:
+            entities['vehicle_type'] = vehicle.rstrip('s')
+            break
+
+    parking_types = ['available', 'empty', 'vacant', 'free', 'occupied', 'full']
+    for parking_type in parking_types:
+        if parking_type in text_lower:
+            entities['availability'] = parking_type
+            break
+
+    if re.search(r'this.*station[s]?', text, re.IGNORECASE) or re.search(r'\bthis\b', text, re.IGNORECASE):
+        entities['station'] = 'this'
+    else:
+        station_match = re.search(r'(\w+) station', text, re.IGNORECASE)
+        if station_match:
+            value = station_match.group(1).lower()
+            if value not in ['parking']:
+                entities['station'] = value
+
+    for entity, regex in ENTITY_RULES.items():
+        if entity == 'time_range':
+            continue
+        match = re.search(regex, text, re.IGNORECASE)
+        if match:
+            value = match.group(1).lower()
+            if entity == 'city' and value in CITY_CORRECTIONS:
+                value = CITY_CORRECTIONS[value]
+            if entity == 'city' and 'station' in entities and value == entities['station']:
+                continue
+            entities[entity] = value
+
+    time_range_match = re.search(ENTITY_RULES['time_range'], text, re.IGNORECASE)
+    if time_range_match:
+        entities['start_time'] = time_range_match.group(1).lower()
+        entities['end_time'] = time_range_match.group(2).lower()
+
+    vehicle_patterns = [
+        r'\b(bike|car|motorcycle|scooter|truck|van|vehicle)\b.*\b(slots?|parking)\b',
+        r'\b(slots?|parking)\b.*\b(bike|car|motorcycle|scooter|truck|van|vehicle)\b',
+        r'for (bike|car|motorcycle|scooter|truck|van|vehicle)\b'
+    ]
+    for pattern in vehicle_patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            for group in match.groups():
+                if group and group.lower() in ['bike', 'car', 'motorcycle', 'scooter', 'truck', 'van', 'vehicle']:
+                    entities['vehicle_type'] = group.lower()
+                    break
+            break
+
+    return entities
+
+
+def test_entity_extractor():
+    """Compare entities on fixed utterances and random fragment combinations"""
+    extractor = EntityExtractor()
+
+    fixed_cases = [
+        "", "hello", "Show car slots in Bangalore", "Show slots at this station",
+        "Book car slot at MG Road station for 2 hours tomorrow at 3pm", "from 10am to 11pm",
+        "10 am to 11 am", "Tomorrow 2pm to 5pm", "15/12/24", "book sl12", "Book slot #5 @ 2pm!",
+        "this parking station", "in banglore", "bangalore station in bangalore", "CARS and Bikes",
+        "motorcycles for van parking", "amount 500 booking 12 vehicle KA01", "start time: 10:00am end time: 12pm",
+        "date: 15-12-2024 on tomorrow", "Show stations in DELHI and mumbai", "thistle stations",
+        "show scooter slots near jaipur", "Ｔｏｍｏｒｒｏｗ at ２pm", "K slot in ſurat",
+    ]
+
+    fragments = [
+        "show", "book", "slot", "slots", "station", "stations", "parking", "in", "at", "for", "to", "from",
+        "this", "the", "bangalore", "banglore", "delhi", "mg", "road", "car", "cars", "bike", "van", "truck",
+        "vehicle", "available", "free", "full", "tomorrow", "today", "2pm", "10:30 am", "3", "sl7", "slot 4",
+        "15-12-2024", "1/2/25", "hours", "2 hours", "booking", "amount", "start time", "end time", "date:",
+        "on", "-", "/", "!", "#", "Today", "FROM", "To", "Station", "Car",
+    ]
+    rng = random.Random(7)
+    random_cases = []
+    for _ in range(5000):
+        words = [rng.choice(fragments) for _ in range(rng.randint(1, 9))]
+        separator = rng.choice([" ", " ", " ", "", "  "])
+        random_cases.append(separator.join(words))
+
+    mismatches = 0
+    for text in fixed_cases + random_cases:
+        expected = legacy_extract_entities(text)
+        actual = extractor.extract(text)
+        if list(expected.items()) != list(actual.items()):
+            mismatches += 1
+            print(f"Mismatch for {text!r}: expected {expected}, got {actual}")
+
+    print(f"Checked {len(fixed_cases) + len(random_cases)} utterances, mismatches: {mismatches}")
+    assert mismatches == 0
+
+
+if __name__ == "__main__":
+    test_entity_extractor()
+    print("Entity extractor tests passed")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script for the fake backend: synthetic data, routes, injected faults and a booking through AIModel
+"""
+
+import time
+import requests
+from ai_model import AIModel
+from fake_backend import FakeBackend, Fault, SyntheticData, parse_route_faults
+from resilience import RetryPolicy
+
+
+def test_synthetic_routes():
+    """Stations and slots at the requested scale, served on the backend's routes"""
+    backend = FakeBackend(SyntheticData(stations=12, slots_per_station=30, cities=('bangalore', 'pune')))
+    client = backend.client()
+    assert len(client.get('stations', "/api/stations").json()) == 12
+
+    found = client.get('stations_search', "/api/stations/search/Bangalore").json()
+    assert found['success'] and len(found['stations']) == 6
+    assert all(station['city'] == 'bangalore' for station in found['stations'])
+
+    station = client.get('station_detail', "/api/stations/ST002").json()
+    assert station['stationName'] and station['city'] == 'pune'
+    slots = client.get('slots_by_station', "/api/slots/station/ST002").json()
+    assert len(slots) == 30 and all(slot['stationId'] == station['_id'] for slot in slots)
+    assert len(client.get('slots', "/api/slots").json()) == 360
+    assert client.get('slot_detail', f"/api/slots/slot/{slots[0]['slotId']}").json() == slots[0]
+    assert client.get('station_detail', "/api/stations/ST999").status_code == 404
+
+    user = client.get('user_by_email', "/api/users/email/a%40b.com").json()
+    assert user['email'] == 'a@b.com' and len(user['_id']) == 24
+    assert client.get('user_vehicles', "/api/user/vehicles").status_code == 401
+    vehicles = client.get('user_vehicles', "/api/user/vehicles", headers={'Authorization': 'Bearer t1'}).json()
+    assert vehicles['vehicles'][0]['isPrimary']
+    print(backend.stats())
+    print("Synthetic route tests passed")
+
+
+def test_injected_faults():
+    """Latency and jitter are applied per route; error rates answer 503; slow routes time out"""
+    faults = parse_route_faults("slots_by_station=40:10,stations=0:0:1,user_by_email=500")
+    assert faults['slots_by_station'].latency_ms == 40 and faults['slots_by_station'].jitter_ms == 10
+    backend = FakeBackend(SyntheticData(stations=2, slots_per_station=2), route_faults=faults, seed=1)
+    client = backend.client(retries=RetryPolicy(max_retries=0))
+
+    start = time.perf_counter()
+    client.get('slots_by_station', "/api/slots/station/ST001")
+    assert 0.03 <= time.perf_counter() - start < 0.2
+    assert client.get('stations', "/api/stations").status_code == 503
+    assert backend.stats()['injected_errors'] == {'stations': 1}
+    try:
+        client.get('user_by_email', "/api/users/email/x@y.z", timeout=(1, 0.05))
+        assert False, "expected a read timeout"
+    except requests.ReadTimeout:
+        pass
+
+    rng_backend = FakeBackend(SyntheticData(stations=1, slots_per_station=1), error_rate=0.25, seed=7)
+    failures = sum(rng_backend.handle('GET', "/api/stations")[0] == 503 for _ in range(2000))
+    assert 400 < failures < 600, failures
+    assert Fault(10, 20).delay(rng_backend.rng) >= 0
+    print("Injected fault tests passed")
+
+
+def test_booking_against_fake_backend():
+    """The booking collection flow books a synthetic slot; the same slot and time again is a 409"""
+    backend = FakeBackend(SyntheticData(stations=6, slots_per_station=8))
+    model = AIModel(backend=backend.client())
+    session = "fake@example.com"
+    script = ["Show parking stations in Bangalore", "yes", "car", "tomorrow", "from 2:00pm to 5:00pm"]
+    for text in script:
+        result = model.get_ai_response(session, text, "token-1")
+    assert result['intent'] == 'view_slots_filtered' and result['data'], result
+
+    for text in ["book slot 1 tomorrow from 2:00pm to 5:00pm", "yes", "coupon"]:
+        result = model.get_ai_response(session, text, "token-1")
+    result = model.get_ai_response(session, "yes", "token-1")
+    print(result['response'])
+    assert 'Booking confirmed' in result['response']
+    assert backend.stats()['bookings'] == 1
+
+    slot_oid, = backend.bookings
+    start = time.strftime('%Y-%m-%dT14:00:00', time.localtime(time.time() + 86400))
+    status, _ = backend.handle('POST', f"/api/slots/{slot_oid}/bookings", headers={'Authorization': 'Bearer token-1'},
+                               body={'slotId': slot_oid, 'bookingStartTime': start, 'durationHours': 1,
+                                     'vehicleId': backend.vehicles_for('token-1')[0]['_id'],
+                                     'paymentMethod': 'coupon', 'amountPaid': 0})
+    assert status == 409
+    print("Fake backend booking tests passed")
+
+
+if __name__ == "__main__":
+    test_synthetic_routes()
+    test_injected_faults()
+    test_booking_against_fake_backend()
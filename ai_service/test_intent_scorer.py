@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test script for the inverted-index intent scorer.
+Checks that it gives exactly the same scores as the original keyword loop.
+"""
+
+import random
+from intents import INTENTS
+from intent_scorer import IntentScorer
+
+
+def legacy_scores(preprocessed: list) -> dict:
+    """The original scoring loop from parse_intent"""
+    intent_scores = {}
+    for intent_name, intent_data in INTENTS.items():
+        score = 0
+        for keyword in intent_data['keywords']:
+            words = keyword.split()
+            if all(word in preprocessed for word in words):
+                score += len(words)
+        if score > 0:
+            intent_scores[intent_name] = score
+    return intent_scores
+
+
+def test_intent_scorer():
+    """Compare scores (values and key order) on fixed and random token lists"""
+    scorer = IntentScorer(INTENTS)
+
+    fixed_cases = [
+        [],
+        ['show', 'slots'],
+        ['show', 'car', 'slots', 'bangalore'],
+        ['book', 'slot', '3'],
+        ['parking', 'stations', 'delhi'],
+        ['view', 'slots', 'view', 'slots'],
+        ['good', 'morning'],
+        ['sign', 'help', 'options'],
+        ['unknown', 'query'],
+    ]
+
+    vocabulary = sorted({word for data in INTENTS.values() for keyword in data['keywords'] for word in keyword.split()})
+    vocabulary += ['bangalore', 'tomorrow', '2pm', 'random', 'words']
+    rng = random.Random(42)
+    random_cases = [[rng.choice(vocabulary) for _ in range(rng.randint(1, 8))] for _ in range(2000)]
+
+    mismatches = 0
+    for tokens in fixed_cases + random_cases:
+        expected = legacy_scores(tokens)
+        actual = scorer.score(tokens)
+        if list(expected.items()) != list(actual.items()):
+            mismatches += 1
+            print(f"Mismatch for {tokens}: expected {expected}, got {actual}")
+
+    print(f"Checked {len(fixed_cases) + len(random_cases)} token lists, mismatches: {mismatches}")
+    assert mismatches == 0
+
+
+if __name__ == "__main__":
+    test_intent_scorer()
+    print("Intent scorer tests passed")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test script for the Prometheus metrics: exposition format and what a chat turn records
+"""
+
+from ai_model import AIModel
+from fake_backend import FakeBackend, SyntheticData, parse_route_faults
+from resilience import RetryPolicy
+from metrics import (MetricsRegistry, REGISTRY, STAGE_SECONDS, TURN_SECONDS, BACKEND_SECONDS, INTENT_TURNS,
+                     FALLBACKS, CLARIFICATIONS, BACKEND_ERRORS, CACHE_LOOKUPS)
+
+
+def test_exposition_format():
+    """Histograms have cumulative buckets, sum and count; label values are escaped"""
+    registry = MetricsRegistry()
+    latency = registry.histogram('demo_seconds', 'Demo latency', ('stage',), buckets=(0.1, 1.0))
+    calls = registry.counter('demo_total', 'Demo calls', ('name',))
+    latency.observe(0.05, stage='a')
+    latency.observe(0.5, stage='a')
+    latency.observe(5, stage='a')
+    calls.inc(name='say "hi"')
+    calls.labels(name='say "hi"').inc(2)
+
+    text = registry.render()
+    print(text)
+    assert '# TYPE demo_seconds histogram' in text
+    assert 'demo_seconds_bucket{stage="a",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{stage="a",le="1.0"} 2' in text
+    assert 'demo_seconds_bucket{stage="a",le="+Inf"} 3' in text
+    assert 'demo_seconds_sum{stage="a"} 5.55' in text
+    assert 'demo_seconds_count{stage="a"} 3' in text
+    assert 'demo_total{name="say \\"hi\\""} 3' in text
+    print("Exposition format tests passed")
+
+
+def test_turn_metrics():
+    """A chat turn records stage, branch and backend latencies and the matching counters"""
+    # One station in Bangalore, whose slots always fail with a 503; without retries,
+    # so each fetch is one backend request
+    backend = FakeBackend(SyntheticData(stations=1, cities=('bangalore',)),
+                          route_faults=parse_route_faults("slots_by_station=0:0:1"))
+    model = AIModel(backend=backend.client(retries=RetryPolicy(max_retries=0)))
+
+    before = {
+        'parse': STAGE_SECONDS.count(stage='parse_intent'),
+        'branch': TURN_SECONDS.count(branch='view_slots_filtered'),
+        'backend': BACKEND_SECONDS.count(endpoint='slots_by_station', method='GET'),
+        'intent': INTENT_TURNS.value(intent='view_slots_filtered'),
+        'errors': BACKEND_ERRORS.value(endpoint='slots_by_station', reason='http_503'),
+        'unknown': FALLBACKS.value(intent='unknown'),
+        'clarify': CLARIFICATIONS.value(kind='location'),
+        'nlu_hit': CACHE_LOOKUPS.value(cache='nlu', result='hit'),
+    }
+    model.get_ai_response("metrics-1", "Show car slots in Bangalore")
+    model.get_ai_response("metrics-2", "Show car slots in Bangalore")
+    model.get_ai_response("metrics-3", "qwerty zxcv")
+    model.get_ai_response("metrics-4", "show slots")
+
+    assert STAGE_SECONDS.count(stage='parse_intent') >= before['parse'] + 4
+    assert TURN_SECONDS.count(branch='view_slots_filtered') == before['branch'] + 2
+    assert BACKEND_SECONDS.count(endpoint='slots_by_station', method='GET') == before['backend'] + 2
+    assert INTENT_TURNS.value(intent='view_slots_filtered') == before['intent'] + 2
+    assert BACKEND_ERRORS.value(endpoint='slots_by_station', reason='http_503') == before['errors'] + 2
+    assert FALLBACKS.value(intent='unknown') == before['unknown'] + 1
+    assert CLARIFICATIONS.value(kind='location') == before['clarify'] + 1
+    assert CACHE_LOOKUPS.value(cache='nlu', result='hit') >= before['nlu_hit'] + 1
+
+    text = REGISTRY.render()
+    assert 'ai_turn_seconds_count{branch="view_slots_filtered"}' in text
+    assert 'ai_backend_request_seconds_bucket{endpoint="slots_by_station",method="GET",le="+Inf"}' in text
+    print("Turn metrics tests passed")
+
+
+if __name__ == "__main__":
+    test_exposition_format()
+    test_turn_metrics()
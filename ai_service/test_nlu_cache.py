@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test script for the NLU result cache: cached parses must match uncached ones,
+including context boosts applied per session.
+"""
+
+from ai_model import AIModel, SessionContext
+from bench_nlu import CORPUS
+from nlu_cache import NLUCache
+
+CONTEXTS = [
+    {},
+    {'last_slots': [{'slotId': 'SL1'}]},
+    {'last_station': 'mg road parking'},
+    {'pending_booking': {'slot_id': 'SL1'}},
+    {'preferred_city': 'bangalore', 'preferred_vehicle': 'car'},
+]
+
+
+def test_nlu_cache():
+    """Parse every utterance under several session contexts, with and without the cache"""
+    cached = AIModel()
+    uncached = AIModel()
+    uncached.nlu_cache = NLUCache(max_entries=0)
+
+    for model in (cached, uncached):
+        for n, context in enumerate(CONTEXTS):
+            session = SessionContext()
+            session.context = dict(context)
+            if n % 2:
+                session.add_to_history("show slots", "Here are the available slots")
+            model.sessions[f"ctx-{n}"] = session
+
+    for _ in range(2):
+        for text in CORPUS + [text.upper() + "  " for text in CORPUS]:
+            for n in range(len(CONTEXTS)):
+                expected = uncached.parse_intent(text, f"ctx-{n}")
+                actual = cached.parse_intent(text, f"ctx-{n}")
+                assert expected == actual, (text, n, expected, actual)
+                # Results handed out must not share state with the cache
+                actual['entities']['city'] = 'changed'
+
+    stats = cached.nlu_cache.stats()
+    print(f"NLU cache stats: {stats}")
+    assert stats['size'] == len({NLUCache.normalize(text) for text in CORPUS})
+    assert stats['hits'] > stats['misses']
+
+    small = NLUCache(max_entries=2)
+    cached.nlu_cache = small
+    for text in ["hello", "hi", "hey", "hello"]:
+        cached.analyze_text(text)
+    assert len(small) == 2 and small.stats()['evictions'] == 2
+    print("NLU cache tests passed")
+
+
+if __name__ == "__main__":
+    test_nlu_cache()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test script for live slot occupancy: sensor event ingestion, availability from the map, and the sensor simulator
+"""
+
+import random
+import time
+from ai_model import AIModel
+from fake_backend import FakeBackend, SyntheticData, parse_route_faults
+from occupancy import OccupancyMap
+from occupancy_simulator import batches, replay, sensor_stream
+from slot_index import SlotRecord
+
+
+def test_ingest_sensor_events():
+    """Events set slot bits; late, malformed and oversized input is rejected"""
+    occupancy = OccupancyMap(max_batch=100)
+    events = [{'stationId': 'ST001', 'slotId': f"ST001-S{i:03d}", 'occupied': i % 2 == 0, 'ts': 100}
+              for i in range(1, 11)]
+    assert occupancy.ingest(events) == {'status': 'success', 'applied': 10, 'stale': 0, 'invalid': 0}
+    result = occupancy.ingest([
+        {'stationId': 'ST001', 'slotId': 'ST001-S001', 'occupied': 'Occupied', 'ts': 101},
+        {'stationId': 'ST001', 'slotId': 'ST001-S002', 'occupied': True, 'ts': 99},
+        {'stationId': 'ST001', 'slotId': 'ST001-S003', 'occupied': 'maybe'},
+        {'stationId': 'ST001', 'occupied': False},
+    ])
+    assert (result['applied'], result['stale'], result['invalid']) == (1, 1, 2), result
+    assert occupancy.ingest([events[0]] * 101)['status'] == 'error'
+    assert occupancy.stats() == {'stations': 1, 'live_stations': 1, 'slots': 10, 'occupied': 6}
+
+    slots = [SlotRecord(f"id{i}", f"ST001-S{i:03d}", availability='Free') for i in (1, 3, 11)]
+    applied = occupancy.apply('ST001', slots)
+    assert [slot.availability for slot in applied] == ['Booked', 'Free', 'Free']
+    assert applied[1] is slots[1] and slots[0].availability == 'Free'
+    assert occupancy.apply('ST002', slots) is slots
+    print("Sensor ingestion tests passed")
+
+
+def test_ingest_limits():
+    """Sensor clocks can't run far ahead, and the stations and slots tracked are bounded"""
+    occupancy = OccupancyMap(max_stations=2, max_slots_per_station=3)
+    # A reading far in the future counts as now, so later readings still apply
+    result = occupancy.ingest([{'stationId': 'ST001', 'slotId': 'ST001-S001', 'occupied': True, 'ts': 1e12}])
+    assert result['applied'] == 1
+    result = occupancy.ingest([
+        {'stationId': 'ST001', 'slotId': 'ST001-S001', 'occupied': False, 'ts': time.time() + 60},
+        {'stationId': 'ST001', 'slotId': 'ST001-S002', 'occupied': True, 'ts': float('inf')},
+        {'stationId': 'ST001', 'slotId': 'ST001-S002', 'occupied': True, 'ts': 'nan'},
+        {'stationId': 'ST001', 'slotId': 'S' * 65, 'occupied': True},
+    ])
+    assert (result['applied'], result['invalid']) == (1, 3), result
+    assert occupancy.apply('ST001', [SlotRecord('id1', 'ST001-S001', availability='Free')])[0].availability == 'Free'
+
+    events = [{'stationId': f"ST{n:03d}", 'slotId': f"ST{n:03d}-S{i:03d}", 'occupied': True, 'ts': time.time() + 60}
+              for n in range(1, 4) for i in range(1, 6)]
+    result = occupancy.ingest(events)
+    assert (result['applied'], result['invalid']) == (6, 9), result
+    assert occupancy.stats() == {'stations': 2, 'live_stations': 2, 'slots': 6, 'occupied': 6}
+    print("Sensor ingestion limit tests passed")
+
+
+def test_live_stations_skip_the_backend():
+    """While a station's sensors report, listings use them instead of waiting for its slots to be fetched again"""
+    backend = FakeBackend(SyntheticData(stations=1, slots_per_station=10, cities=('pune',), free_ratio=1),
+                          route_faults=parse_route_faults("slots_by_station=200"))
+    model = AIModel(backend=backend.client())
+    model.slot_cache.ttl, model.slot_cache.stale_ttl = 0.05, 0
+    model.occupancy.max_age = 0.3
+
+    first = model.get_ai_response("live-1", "Show car slots in Pune")
+    station_id = backend.data.stations[0]['stationId']
+    taken = [slot['slotId'] for slot in first['data'][:2]]
+    model.occupancy.ingest([{'stationId': station_id, 'slotId': slot_id, 'occupied': True} for slot_id in taken])
+
+    time.sleep(0.1)
+    start = time.perf_counter()
+    second = model.get_ai_response("live-2", "Show car slots in Pune")
+    # Served from the expired list with live availability; the list itself is refreshed in the background
+    assert time.perf_counter() - start < 0.1
+    assert model.slot_cache.stats()['stale_hits'] == 1
+    assert len(second['data']) == len(first['data']) - 2
+    assert not set(taken) & {slot['slotId'] for slot in second['data']}
+
+    # Sensors gone quiet: back to the backend
+    time.sleep(0.3)
+    before = backend.stats()['requests']['slots_by_station']
+    third = model.get_ai_response("live-3", "Show car slots in Pune")
+    assert len(third['data']) == len(first['data'])
+    assert backend.stats()['requests']['slots_by_station'] == before + 1
+    print("Live occupancy listing tests passed")
+
+
+def test_simulator_replay():
+    """A synthetic stream covers every slot, batches respect size and time, and replays into the map"""
+    data = SyntheticData(stations=5, slots_per_station=12)
+    events = list(sensor_stream(data, 3600, random.Random(1), mean_stay=600, mean_gap=300, start=1000))
+    assert len(events) > data.slot_count()
+    assert [event['ts'] for event in events] == sorted(event['ts'] for event in events)
+    assert all(1000 <= event['ts'] <= 4600 for event in events)
+    for batch in batches(events, 50, 30):
+        assert len(batch) <= 50 and batch[-1]['ts'] - batch[0]['ts'] < 30
+
+    occupancy = OccupancyMap(max_age=60)
+    totals = replay(events, occupancy.ingest, batch_size=50, interval=30, speed=0)
+    print(totals)
+    assert totals['events'] == totals['applied'] == len(events)
+    stats = occupancy.stats()
+    assert stats['stations'] == 5 and stats['slots'] == data.slot_count()
+    # Roughly mean_stay / (mean_stay + mean_gap) of the slots are occupied
+    assert 0.4 < stats['occupied'] / stats['slots'] < 0.9, stats
+
+    # Paced replay: 100 seconds of sensor time at 1000x takes about 0.1 s
+    start = time.perf_counter()
+    replay([event for event in events if event['ts'] <= 1100], occupancy.ingest, speed=1000)
+    assert 0.08 < time.perf_counter() - start < 0.5
+    print("Sensor simulator tests passed")
+
+
+if __name__ == "__main__":
+    test_ingest_sensor_events()
+    test_ingest_limits()
+    test_live_stations_skip_the_backend()
+    test_simulator_replay()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test script for request profiling: per-stage breakdown and sampled cProfile dumps
+"""
+
+import json
+import os
+import pstats
+import tempfile
+from ai_model import AIModel
+from fake_backend import FakeBackend, SyntheticData, parse_route_faults
+from profiling import ProfileSampler
+
+
+def make_model():
+    # Two stations in Bangalore whose slot fetches take 50 ms
+    backend = FakeBackend(SyntheticData(stations=2, slots_per_station=1, cities=('bangalore',), free_ratio=1),
+                          route_faults=parse_route_faults("slots_by_station=50"))
+    return AIModel(backend=backend.client())
+
+
+def test_profile_breakdown():
+    """A profiled turn reports its stages and backend calls; other turns don't carry a profile"""
+    model = make_model()
+    result = model.get_ai_response("profile-1", "Show car slots in Bangalore", profile=True)
+    profile = result['profile']
+    print(json.dumps(profile, indent=2))
+
+    assert profile['branch'] == 'view_slots_filtered'
+    for name in ('session_load', 'parse_intent', 'preprocess_text', 'extract_entities', 'session_save'):
+        assert profile['stages'][name]['calls'] >= 1, name
+    slot_calls = [call for call in profile['backend_calls'] if call['endpoint'] == 'slots_by_station']
+    assert len(slot_calls) == 2 and all(call['ms'] >= 50 and call['status'] == 200 for call in slot_calls)
+    assert profile['backend']['calls'] == 3
+    assert profile['total_ms'] >= 50
+    assert profile['client_typing_delay_ms'] == result['typing_delay_ms']
+
+    assert 'profile' not in model.get_ai_response("profile-1", "hello")
+    print("Profile breakdown tests passed")
+
+
+def test_sampled_cprofile_dumps():
+    """With a sample rate of 1 every turn writes a pstats file named after its branch"""
+    model = make_model()
+    with tempfile.TemporaryDirectory() as directory:
+        model.profile_sampler = ProfileSampler(rate=1.0, directory=directory)
+        model.get_ai_response("profile-2", "hello")
+        dumps = os.listdir(directory)
+        print(dumps)
+        assert len(dumps) == 1 and dumps[0].endswith('-greet.prof')
+        stats = pstats.Stats(os.path.join(directory, dumps[0]))
+        assert any(name == '_dialog_steps' for _, _, name in stats.stats)
+
+        model.profile_sampler = ProfileSampler(rate=0.0, directory=directory)
+        model.get_ai_response("profile-2", "hello")
+        assert len(os.listdir(directory)) == 1
+    print("Sampled profile tests passed")
+
+
+if __name__ == "__main__":
+    test_profile_breakdown()
+    test_sampled_cprofile_dumps()
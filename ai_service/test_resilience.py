@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Test script for backend resilience: circuit breakers, GET retries under a budget, and turn deadlines
+"""
+
+import asyncio
+import time
+import requests
+from ai_model import AIModel
+from fake_backend import FakeBackend, SyntheticData, parse_route_faults
+from resilience import CircuitBreakers, CircuitOpenError, RetryBudget, RetryPolicy
+from turn_context import TurnContext, turn_scope
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_circuit_breaker():
+    """An endpoint failing in a row is cut off, then let back in after one good trial request"""
+    backend = FakeBackend(SyntheticData(stations=3, slots_per_station=2), route_faults=parse_route_faults("stations=0:0:1"))
+    clock = FakeClock()
+    client = backend.client(breakers=CircuitBreakers(failure_threshold=3, reset_timeout=5, clock=clock),
+                            retries=RetryPolicy(max_retries=0))
+    for _ in range(3):
+        assert client.get('stations', "/api/stations").status_code == 503
+    assert client.breakers.states() == {'stations': 'open'}
+    try:
+        client.get('stations', "/api/stations")
+        assert False, "expected the open circuit to refuse the request"
+    except CircuitOpenError:
+        pass
+    assert backend.stats()['requests']['stations'] == 3
+    # Other endpoints are unaffected
+    assert client.get('slots_by_station', "/api/slots/station/ST001").status_code == 200
+
+    clock.now += 5
+    backend.route_faults.clear()
+    assert client.get('stations', "/api/stations").status_code == 200
+    assert client.breakers.states()['stations'] == 'closed'
+    print("Circuit breaker tests passed")
+
+
+def test_get_retries_and_budget():
+    """Failed GETs are retried until the budget runs out; POSTs never are"""
+    backend = FakeBackend(SyntheticData(stations=2, slots_per_station=2),
+                          route_faults=parse_route_faults("stations=0:0:1,create_booking=0:0:1"))
+    client = backend.client(breakers=CircuitBreakers(failure_threshold=100),
+                            retries=RetryPolicy(max_retries=2, backoff=0.001, budget=RetryBudget(ratio=0, reserve=3)))
+    sent = []
+    for _ in range(3):
+        before = backend.stats()['requests'].get('stations', 0)
+        assert client.get('stations', "/api/stations").status_code == 503
+        sent.append(backend.stats()['requests']['stations'] - before)
+    assert sent == [3, 2, 1], sent
+
+    client.post('create_booking', "/api/slots/x/bookings", json={})
+    assert backend.stats()['requests']['create_booking'] == 1
+
+    # A transient failure is hidden by a retry
+    flaky = FakeBackend(SyntheticData(stations=2, slots_per_station=2), error_rate=0.5, seed=3)
+    client = flaky.client(retries=RetryPolicy(max_retries=2, backoff=0.001, budget=RetryBudget(ratio=1, reserve=100)))
+    statuses = [client.get('stations', "/api/stations").status_code for _ in range(50)]
+    assert statuses.count(200) >= 40, statuses
+    print("Retry tests passed")
+
+
+def test_turn_deadline_returns_partial_slots():
+    """Once the turn's budget is spent, remaining station fetches are dropped and the answer says so"""
+    backend = FakeBackend(SyntheticData(stations=12, slots_per_station=4, cities=('chennai',)),
+                          route_faults=parse_route_faults("slots_by_station=300"))
+    model = AIModel(backend=backend.client())
+    model.turn_deadline = 0.45
+
+    start = time.perf_counter()
+    result = model.get_ai_response("deadline@example.com", "Show car slots in Chennai")
+    elapsed = time.perf_counter() - start
+    print(f"{elapsed * 1000:.0f} ms: {result['response']}")
+    assert elapsed < 1.0
+    assert result['intent'] == 'view_slots_filtered' and result['data']
+    assert result['degraded'] and "didn't respond in time" in result['response']
+    # Fetches cut short by the deadline don't count against the endpoint
+    assert model.backend.breakers.states()['slots_by_station'] == 'closed'
+
+    async_model = AIModel(backend=backend.client(), async_backend=backend.async_client())
+    async_model.turn_deadline = 0.2
+
+    async def run():
+        async_start = time.perf_counter()
+        async_result = await async_model.get_ai_response_async("deadline-async@example.com", "Show car slots in Chennai")
+        await async_model.aclose()
+        return async_result, time.perf_counter() - async_start
+
+    async_result, elapsed = asyncio.run(run())
+    print(f"{elapsed * 1000:.0f} ms: {async_result['response']}")
+    assert elapsed < 0.5
+    assert async_result['degraded'] and "12 of 12 stations" in async_result['response']
+    print("Turn deadline tests passed")
+
+
+def test_deadline_spares_bookings():
+    """A turn's deadline cuts GETs short but leaves a booking POST its full timeout"""
+    backend = FakeBackend(SyntheticData(stations=1, slots_per_station=1),
+                          route_faults=parse_route_faults("stations=200,create_booking=200"))
+    client = backend.client(retries=RetryPolicy(max_retries=0))
+    async_client = backend.async_client(retries=RetryPolicy(max_retries=0))
+    turn = TurnContext()
+    with turn_scope(turn):
+        turn.deadline = time.monotonic() + 0.1
+        try:
+            client.get('stations', "/api/stations")
+            assert False, "expected the deadline to cut the GET short"
+        except requests.Timeout:
+            pass
+        turn.deadline = time.monotonic() + 0.1
+        assert client.post('create_booking', "/api/slots/x/bookings", json={}).status_code < 500
+
+    async def run():
+        with turn_scope(turn):
+            turn.deadline = time.monotonic() + 0.1
+            try:
+                await async_client.get('stations', "/api/stations")
+                assert False, "expected the deadline to cut the GET short"
+            except requests.Timeout:
+                pass
+            turn.deadline = time.monotonic() + 0.1
+            response = await async_client.post('create_booking', "/api/slots/x/bookings", json={})
+        await async_client.aclose()
+        return response
+
+    assert asyncio.run(run()).status_code < 500
+    assert backend.stats()['requests']['create_booking'] == 2
+    print("Booking deadline tests passed")
+
+def test_deadline_on_booking_lookups():
+    """A booking whose vehicle lookup is cut short by the deadline asks to retry instead of reporting no vehicles"""
+    backend = FakeBackend(SyntheticData(stations=1, slots_per_station=1),
+                          route_faults=parse_route_faults("user_vehicles=300"))
+    pending = {'slot_id': 'ST001-S001', 'date': 'tomorrow', 'start_time': '10:00', 'end_time': '11:00',
+               'payment_method': 'coupon', 'awaiting_payment_method': True, 'awaiting_payment_confirmation': True}
+
+    model = AIModel(backend=backend.client(retries=RetryPolicy(max_retries=0)))
+    model.turn_deadline = 0.2
+    model.get_ai_response("vehicles@example.com", "hello")
+    model.sessions["vehicles@example.com"].context['pending_booking'] = dict(pending)
+    result = model.get_ai_response("vehicles@example.com", "yes", token="token")
+    print(result['response'])
+    assert result['degraded'] and "Couldn't reach the booking service" in result['response']
+    assert "No vehicles found" not in result['response']
+    assert model.sessions["vehicles@example.com"].context.get('pending_booking'), "kept for the retry"
+
+    async_model = AIModel(backend=backend.client(),
+                          async_backend=backend.async_client(retries=RetryPolicy(max_retries=0)))
+    async_model.turn_deadline = 0.2
+
+    async def run():
+        await async_model.get_ai_response_async("vehicles-async@example.com", "hello")
+        async_model.sessions["vehicles-async@example.com"].context['pending_booking'] = dict(pending)
+        async_result = await async_model.get_ai_response_async("vehicles-async@example.com", "yes", token="token")
+        await async_model.aclose()
+        return async_result
+
+    async_result = asyncio.run(run())
+    assert async_result['degraded'] and "Couldn't reach the booking service" in async_result['response']
+    assert backend.stats()['requests'].get('create_booking', 0) == 0
+    print("Booking lookup deadline tests passed")
+
+
+if __name__ == "__main__":
+    test_circuit_breaker()
+    test_get_retries_and_budget()
+    test_turn_deadline_returns_partial_slots()
+    test_deadline_spares_bookings()
+    test_deadline_on_booking_lookups()
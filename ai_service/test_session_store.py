@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script for the bounded session store (LRU and idle-TTL eviction)
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import date, datetime
+from session_store import SessionBackend, SessionStore, InMemorySessionBackend, SQLiteSessionBackend
+from ai_model import AIModel, SessionContext
+
+
+def test_session_store():
+    """Check dict-style access, LRU eviction, idle eviction and metrics"""
+    store = SessionStore(max_sessions=3, idle_ttl=0)
+    for session_id in ['a', 'b', 'c']:
+        store[session_id] = SessionContext()
+    store['a'].update_context('last_city', 'bangalore')  # 'a' becomes most recently used
+
+    store['d'] = SessionContext()
+    assert 'b' not in store, "least recently used session should be evicted"
+    assert 'a' in store and store['a'].get_context('last_city') == 'bangalore'
+    assert len(store) == 3
+    assert store.get('missing') is None
+    assert store.pop('c').history == []
+    assert 'c' not in store
+
+    stats = store.stats()
+    print(f"LRU stats: {stats}")
+    assert stats['evicted_lru'] == 1 and stats['created'] == 4 and stats['active'] == 2
+
+    idle_store = SessionStore(max_sessions=10, idle_ttl=0.05)
+    idle_store['old'] = SessionContext()
+    time.sleep(0.1)
+    idle_store['new'] = SessionContext()
+    assert 'old' not in idle_store and 'new' in idle_store
+    assert idle_store.stats()['evicted_idle'] == 1
+    print(f"Idle stats: {idle_store.stats()}")
+
+    # The model keeps working with a bounded store in place of its dict
+    model = AIModel(session_backend=InMemorySessionBackend(SessionStore(max_sessions=2)))
+    for session_id in ['s1', 's2', 's3']:
+        model.get_ai_response(session_id, "hello")
+    assert len(model.sessions) == 2 and 's1' not in model.sessions
+    print("Session store tests passed")
+
+
+def test_sqlite_session_backend():
+    """Two models sharing one SQLite file behave like two workers sharing sessions"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sessions.db')
+        worker_a = AIModel(session_backend=SQLiteSessionBackend(path, SessionContext))
+        worker_b = AIModel(session_backend=SQLiteSessionBackend(path, SessionContext))
+
+        worker_a.get_ai_response('shared', "hello")
+        worker_a.sessions['shared'].update_context('last_city', 'bangalore')
+        worker_a.session_backend.save('shared', worker_a.sessions['shared'])
+
+        session = worker_b.session_backend.load('shared')
+        assert session.get_context('last_city') == 'bangalore'
+        assert session.history[0]['user'] == "hello"
+
+        worker_b.get_ai_response('shared', "What can you do?")
+        # Worker A picks up the turn answered by worker B
+        worker_a.get_ai_response('shared', "hi")
+        history = worker_a.sessions['shared'].history
+        assert [turn['user'] for turn in history] == ["hello", "What can you do?", "hi"], history
+
+        # Idle rows are not resumed and are pruned
+        backend = SQLiteSessionBackend(path, SessionContext, idle_ttl=0.05, max_sessions=1)
+        time.sleep(0.1)
+        assert backend.load('shared') is None
+        backend.prune()
+        print(f"SQLite stats: {backend.stats()}")
+        assert backend.stats()['stored'] == 0
+
+        # Values JSON has no type for come back with their type; unknown ones are refused
+        session = SessionContext()
+        state = {'when': datetime(2026, 3, 1, 14, 30), 'day': date(2026, 3, 1), 'seen': {'ST2', 'ST1'},
+                 'range': (2, 5), 'nested': [{'tags': frozenset({'ev'})}]}
+        session.context.update(state)
+        worker_a.session_backend.save('typed', session)
+        assert worker_b.session_backend.load('typed').context == state
+        session.context['bad'] = object()
+        errors = worker_a.session_backend.errors
+        # Counted and logged, not raised: the turn that made a booking still answers
+        worker_a.session_backend.save('typed', session)
+        assert worker_a.session_backend.errors == errors + 1
+        assert worker_b.session_backend.load('typed').context == state
+
+        # A store that can't be read is not a missing session: the stored dialog survives
+        worker_b.get_ai_response('locked', "hello")
+        worker_b.sessions['locked'].update_context('pending_booking', {'slot_id': 'ST001-S001'})
+        worker_b.session_backend.save('locked', worker_b.sessions['locked'])
+
+        connection = worker_a.session_backend._connection()
+
+        class LockedReads:
+            def execute(self, sql, *args):
+                if sql.startswith("SELECT"):
+                    raise sqlite3.OperationalError("database is locked")
+                return connection.execute(sql, *args)
+        worker_a.session_backend._connection = LockedReads
+        worker_a.get_ai_response('locked', "What can you do?")
+        stored = worker_b.session_backend.load('locked')
+        assert stored.get_context('pending_booking') == {'slot_id': 'ST001-S001'}
+        assert [turn['user'] for turn in stored.history] == ["hello"]
+    try:
+        SessionBackend()
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("SessionBackend is abstract")
+    print("SQLite session backend tests passed")
+
+
+if __name__ == "__main__":
+    test_session_store()
+    test_sqlite_session_backend()
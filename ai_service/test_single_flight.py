@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test script for request coalescing: identical concurrent backend GETs share one in-flight request
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from ai_model import AIModel
+from fake_backend import FakeBackend, SyntheticData, parse_route_faults
+from metrics import BACKEND_COALESCED
+from resilience import DeadlineExceeded
+from turn_context import TurnContext, turn_scope
+
+
+def test_concurrent_gets_share_one_request():
+    """Threads asking for the same city at once cause one backend call; later callers send a new one"""
+    backend = FakeBackend(SyntheticData(stations=6, slots_per_station=2),
+                          route_faults=parse_route_faults("stations_search=100,user_vehicles=100"))
+    client = backend.client()
+    followers = BACKEND_COALESCED.value(endpoint='stations_search', role='follower')
+
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        responses = list(pool.map(lambda _: client.get('stations_search', "/api/stations/search/Bangalore"), range(20)))
+        assert all(response.json()['stations'] == responses[0].json()['stations'] for response in responses)
+        assert backend.stats()['requests']['stations_search'] == 1
+        assert BACKEND_COALESCED.value(endpoint='stations_search', role='follower') == followers + 19
+
+        # Nothing is cached once the request completes
+        client.get('stations_search', "/api/stations/search/Bangalore")
+        assert backend.stats()['requests']['stations_search'] == 2
+
+        # Different paths and endpoints not configured for coalescing are sent separately
+        list(pool.map(lambda city: client.get('stations_search', f"/api/stations/search/{city}"), ['pune', 'delhi']))
+        assert backend.stats()['requests']['stations_search'] == 4
+        list(pool.map(lambda _: client.get('user_vehicles', "/api/user/vehicles", headers={'Authorization': 'Bearer t'}),
+                      range(5)))
+        assert backend.stats()['requests']['user_vehicles'] == 5
+    print("Sync single-flight tests passed")
+
+
+def test_async_turns_share_requests():
+    """Concurrent async turns for the same city share the search and each station's slot fetch"""
+    backend = FakeBackend(SyntheticData(stations=12, slots_per_station=4),
+                          route_faults=parse_route_faults("stations_search=50,slots_by_station=50"))
+    model = AIModel(backend=backend.client(), async_backend=backend.async_client())
+
+    async def run():
+        results = await asyncio.gather(*(model.get_ai_response_async(f"coalesce{i}", "Show car slots in Chennai")
+                                         for i in range(30)))
+        await model.aclose()
+        return results
+
+    results = asyncio.run(run())
+    assert all(result['data'] == results[0]['data'] for result in results)
+    chennai = [station for station in backend.data.stations if station['city'] == 'chennai']
+    requests = backend.stats()['requests']
+    print(requests)
+    assert requests['stations_search'] == 1
+    assert requests['slots_by_station'] == len(chennai)
+    print("Async single-flight tests passed")
+
+
+def test_each_caller_keeps_its_own_deadline():
+    """A first caller with a short deadline gives up alone; the shared request goes on for the others"""
+    backend = FakeBackend(SyntheticData(stations=3, slots_per_station=2), route_faults=parse_route_faults("stations=150"))
+    client, async_client = backend.client(), backend.async_client()
+
+    def get(deadline):
+        turn = TurnContext()
+        turn.deadline = time.monotonic() + deadline
+        with turn_scope(turn):
+            try:
+                return client.get('stations', "/api/stations").status_code
+            except DeadlineExceeded:
+                return 'deadline'
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first = pool.submit(get, 0.05)
+        time.sleep(0.01)
+        second = pool.submit(get, 1)
+        assert (first.result(), second.result()) == ('deadline', 200)
+
+    async def get_async(deadline):
+        turn = TurnContext()
+        turn.deadline = time.monotonic() + deadline
+        with turn_scope(turn):
+            try:
+                return (await async_client.get('stations', "/api/stations")).status_code
+            except DeadlineExceeded:
+                return 'deadline'
+
+    async def run():
+        results = await asyncio.gather(get_async(0.05), get_async(1))
+        await async_client.aclose()
+        return results
+
+    assert asyncio.run(run()) == ['deadline', 200]
+    assert backend.stats()['requests']['stations'] == 2
+    print("Single-flight deadline tests passed")
+
+
+if __name__ == "__main__":
+    test_concurrent_gets_share_one_request()
+    test_async_turns_share_requests()
+    test_each_caller_keeps_its_own_deadline()
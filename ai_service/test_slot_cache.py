@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Test script for the per-station slot cache: TTL, stale-while-revalidate and booking invalidation
+"""
+
+import os
+import tempfile
+import threading
+import time
+from ai_model import AIModel, SessionContext
+from fake_backend import FakeBackend, SyntheticData, parse_route_faults
+from session_store import SQLiteSessionBackend
+from slot_cache import StationSlotCache
+from slot_index import SlotRecord
+
+BOOKING_SCRIPT = ["Show parking stations in Bangalore", "yes", "car", "tomorrow", "from 2:00pm to 5:00pm",
+                  "book slot 1 tomorrow from 2:00pm to 5:00pm", "yes", "coupon", "yes"]
+
+
+def slot_requests(backend: FakeBackend) -> int:
+    return backend.stats()['requests'].get('slots_by_station', 0)
+
+
+def test_repeat_listings_hit_the_cache():
+    """Slot lists fetched seconds apart come from the cache; expired ones are fetched again"""
+    backend = FakeBackend(SyntheticData(stations=4, slots_per_station=6, cities=('chennai',)))
+    model = AIModel(backend=backend.client())
+    model.slot_cache.ttl, model.slot_cache.stale_ttl = 0.2, 0
+
+    first = model.get_ai_response("cache-1", "Show car slots in Chennai")
+    assert slot_requests(backend) == 4
+    second = model.get_ai_response("cache-2", "Show car slots in Chennai")
+    assert slot_requests(backend) == 4
+    assert second['data'] == first['data']
+
+    time.sleep(0.25)
+    model.get_ai_response("cache-3", "Show car slots in Chennai")
+    assert slot_requests(backend) == 8
+    stats = model.slot_cache.stats()
+    print(stats)
+    assert stats['hits'] == 4 and stats['misses'] == 8 and stats['hit_ratio'] == round(4 / 12, 4)
+    print("Slot cache TTL tests passed")
+
+
+def test_stale_lists_are_refreshed_in_the_background():
+    """A stale list is served right away while one refresh reloads it"""
+    backend = FakeBackend(SyntheticData(stations=1, slots_per_station=3, cities=('pune',)),
+                          route_faults=parse_route_faults("slots_by_station=200"))
+    model = AIModel(backend=backend.client())
+    model.slot_cache.ttl, model.slot_cache.stale_ttl = 0.05, 10
+
+    model.get_ai_response("stale-1", "Show car slots in Pune")
+    time.sleep(0.1)
+    start = time.perf_counter()
+    for i in range(3):
+        model.get_ai_response(f"stale-{i + 2}", "Show car slots in Pune")
+    assert time.perf_counter() - start < 0.15
+    time.sleep(0.3)
+    stats = model.slot_cache.stats()
+    print(stats)
+    assert stats['stale_hits'] == 3 and stats['refreshes'] == 1
+    assert slot_requests(backend) == 2
+    assert stats['max_age_seconds'] < 0.3
+    print("Stale-while-revalidate tests passed")
+
+
+def test_booking_invalidates_the_station():
+    """A successful booking drops its station's cached slots, and a refresh started before is not stored"""
+    backend = FakeBackend(SyntheticData(stations=6, slots_per_station=8))
+    model = AIModel(backend=backend.client())
+    for text in BOOKING_SCRIPT:
+        result = model.get_ai_response("booker@example.com", text, "token-1")
+    assert 'Booking confirmed' in result['response']
+    assert model.slot_cache.stats()['invalidations'] == 1
+
+    before = slot_requests(backend)
+    for text in BOOKING_SCRIPT[:5]:
+        result = model.get_ai_response("viewer@example.com", text, "token-2")
+    assert result['intent'] == 'view_slots_filtered' and result['data']
+    assert slot_requests(backend) == before + 1
+
+    cache = StationSlotCache(ttl=0.01, stale_ttl=10)
+    old, new = [SlotRecord('a1', 'ST1-S1', availability='Free')], [SlotRecord('a1', 'ST1-S1', availability='Free')]
+    cache.get('ST1', lambda: old)
+    time.sleep(0.02)
+    release = threading.Event()
+
+    def slow_load():
+        release.wait(1)
+        return new
+    assert cache.get('ST1', slow_load) is old
+    cache.invalidate_slot('a1')
+    release.set()
+    time.sleep(0.05)
+    # The refresh that raced the booking was dropped: the next lookup loads again
+    fresh = [SlotRecord('a1', 'ST1-S1', availability='Occupied')]
+    assert cache.get('ST1', lambda: fresh) is fresh
+    print("Slot cache invalidation tests passed")
+
+
+def test_booked_slot_hidden_on_other_workers():
+    """A worker whose cache still shows a slot as free leaves it out for the session that booked it"""
+    backend = FakeBackend(SyntheticData(stations=6, slots_per_station=8))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sessions.db')
+        worker_a = AIModel(backend=backend.client(), session_backend=SQLiteSessionBackend(path, SessionContext))
+        worker_b = AIModel(backend=backend.client(), session_backend=SQLiteSessionBackend(path, SessionContext))
+        for text in BOOKING_SCRIPT[:5]:
+            listing = worker_b.get_ai_response("roaming@example.com", text, "token-1")
+        for text in BOOKING_SCRIPT[5:]:
+            result = worker_a.get_ai_response("roaming@example.com", text, "token-1")
+        assert 'Booking confirmed' in result['response']
+
+        booked = listing['data'][0]['slotId']
+        again = worker_b.get_ai_response("roaming@example.com", "Show car slots in Bangalore", "token-1")
+        assert again['data'] and booked not in {slot['slotId'] for slot in again['data']}
+        # Other sessions see worker B's cached list until it expires
+        other = worker_b.get_ai_response("other@example.com", "Show car slots in Bangalore", "token-2")
+        assert booked in {slot['slotId'] for slot in other['data']}
+
+    # Lists allowed to be stale are still bounded in age while refreshes fail
+    cache = StationSlotCache(ttl=0.01, stale_ttl=0, max_age=0.1)
+    old = [SlotRecord('b1', 'ST2-S1', availability='Free')]
+    cache.get('ST2', lambda: old)
+
+    def failing_load():
+        raise ConnectionError("backend down")
+    time.sleep(0.02)
+    assert cache.get('ST2', failing_load, allow_stale=True) is old
+    time.sleep(0.1)
+    try:
+        cache.get('ST2', failing_load, allow_stale=True)
+        assert False, "expected a list past max_age to be loaded again"
+    except ConnectionError:
+        pass
+    print("Booked slot tests passed")
+
+
+if __name__ == "__main__":
+    test_repeat_listings_hit_the_cache()
+    test_stale_lists_are_refreshed_in_the_background()
+    test_booking_invalidates_the_station()
+    test_booked_slot_hidden_on_other_workers()
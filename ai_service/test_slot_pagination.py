@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Test script for paginated slot listings: cursors, "more", slot references across pages
+and compact slot records
+"""
+
+import json
+from ai_model import AIModel
+from backend_client import BackendClient
+from slot_index import SlotRecord
+from slot_listing import SlotListing
+from turn_context import current_turn, time_left
+
+STATIONS = [{'_id': f'oid{i}', 'stationId': f'ST{i:03d}', 'stationName': f'Station {i}',
+             'name': f'Station {i}', 'address': f'Road {i}', 'city': 'bangalore'} for i in range(3)]
+SLOTS_PER_STATION = 15
+
+
+class FakeResponse:
+    def __init__(self, data, status_code=200):
+        self.status_code = status_code
+        self.text = json.dumps(data)
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class FakeSession:
+    """Replaces the client's requests.Session; records booking POSTs"""
+    def __init__(self):
+        self.bookings = []
+
+    def request(self, method, url, **kwargs):
+        path = url.split('://', 1)[1].split('/', 1)[1]
+        if path == 'api/stations':
+            return FakeResponse(STATIONS)
+        if path.startswith('api/stations/search/'):
+            return FakeResponse({'success': True, 'stations': STATIONS})
+        if path.startswith('api/slots/station/'):
+            station_id = path.rsplit('/', 1)[1]
+            return FakeResponse([{'_id': f'{station_id}-oid{i}', 'slotId': f'{station_id}-SL{i}', 'type': 'Car',
+                                  'price': 20 + i, 'availability': 'Free'} for i in range(SLOTS_PER_STATION)])
+        if path == 'api/user/vehicles':
+            return FakeResponse({'vehicles': [{'_id': 'veh1', 'number': 'KA01', 'isPrimary': True}]})
+        if method == 'POST' and path.endswith('/bookings'):
+            self.bookings.append(kwargs['json'])
+            return FakeResponse({'success': True}, status_code=201)
+        return FakeResponse({})
+
+
+def make_model():
+    client = BackendClient(base_url='http://backend.test')
+    client.session = FakeSession()
+    return AIModel(backend=client), client.session
+
+
+def book_position(model, session_id, position):
+    model.sessions[session_id].context['pending_booking'] = {
+        'slot_id': f'slot {position}', 'date': 'tomorrow', 'start_time': '10:00', 'end_time': '11:00',
+        'payment_method': 'coupon', 'awaiting_payment_method': True,
+    }
+    return model.proxy_to_backend_with_token({'intent': 'book_slot'}, 'token', session_id)
+
+
+def test_slot_pages():
+    """The first page comes with a cursor; the session keeps only slotIds"""
+    model, _ = make_model()
+    first = model.get_ai_response("page-1", "Show car slots in Bangalore", page_size=10)
+    print(f"Page 1: {[slot['slotId'] for slot in first['data']]} {first['page']}")
+    assert len(first['data']) == 10
+    assert first['data'][0]['slotId'] == 'ST000-SL0', "station order is kept"
+    assert first['page']['total'] == 3 * SLOTS_PER_STATION
+    assert first['page']['prev_cursor'] is None
+
+    stored = model.sessions["page-1"].context[SlotListing.CONTEXT_KEY]
+    assert 'last_slots' not in model.sessions["page-1"].context
+    assert all(isinstance(slot_id, str) for slot_id in stored['ids'])
+
+    second = model.get_ai_response("page-1", "", cursor=first['page']['next_cursor'])
+    assert [slot['slotId'] for slot in second['data']][:2] == ['ST000-SL10', 'ST000-SL11']
+    assert second['page']['offset'] == 10 and second['response'].startswith("Here are slots 11-20 of 45")
+
+    third = model.get_ai_response("page-1", "show more")
+    assert third['page']['offset'] == 20 and third['data'][0]['slotId'] == 'ST001-SL5'
+    assert third['data'][0]['stationName'] == 'Station 1'
+
+    # A cursor from an older listing is rejected once a new search replaces it
+    old_cursor = third['page']['next_cursor']
+    model.get_ai_response("page-1", "Show car slots in Bangalore", page_size=10)
+    stale = model.get_ai_response("page-1", "", cursor=old_cursor)
+    assert 'data' not in stale and 'no longer available' in stale['response']
+    print("Slot page tests passed")
+
+
+def test_slot_references_across_pages():
+    """'book slot N' counts over the whole listing; 'the first one' means the page being viewed"""
+    model, session = make_model()
+    first = model.get_ai_response("page-2", "Show car slots in Bangalore", page_size=10)
+    model.get_ai_response("page-2", "", cursor=first['page']['next_cursor'])
+
+    assert model._resolve_slot_references("the first one", "page-2") == 'ST000-SL10'
+    assert model._resolve_slot_references("the last one", "page-2") == 'ST001-SL4'
+
+    result = book_position(model, "page-2", 23)
+    assert result['status'] == 'success', result
+    assert session.bookings[-1]['slotId'] == 'ST001-oid7'
+    assert session.bookings[-1]['amountPaid'] == 0
+
+    result = book_position(model, "page-2", 46)
+    assert result['status'] == 'error' and 'Only 45 slots available' in result['message']
+    print("Slot reference tests passed")
+
+
+def test_slot_records():
+    """Slots are held as compact records and serialized with station info only in responses"""
+    model, _ = make_model()
+    first = model.get_ai_response("page-3", "Show car slots in Bangalore", page_size=5)
+    assert first['data'][0] == {'_id': 'ST000-oid0', 'slotId': 'ST000-SL0', 'type': 'Car', 'price': 20,
+                                'availability': 'Free', 'stationName': 'Station 0', 'stationAddress': 'Road 0'}
+
+    records = [model.slot_index.get(f'ST001-SL{i}') for i in range(2)]
+    assert all(isinstance(record, SlotRecord) for record in records)
+    assert not hasattr(records[0], '__dict__')
+    assert records[0].stationId is records[1].stationId, "station refs are interned"
+    print("Slot record tests passed")
+
+
+def test_slot_records_keep_backend_fields():
+    """Serialized slots keep every field of the backend's slot JSON, in its order"""
+    slot = {'_id': 'oid7', 'slotId': 'SL7', 'stationId': 'oid0', 'type': 'Car', 'price': 30,
+            'status': 'Enabled', 'availability': 'Free', 'images': ['a.png'],
+            'createdAt': '2024-01-01T00:00:00.000Z', 'updatedAt': '2024-01-02T00:00:00.000Z'}
+    record = SlotRecord.from_slot(slot, 'ST000')
+    assert record.stationId == 'ST000'
+    data = record.to_dict(STATIONS[0])
+    assert data == dict(slot, stationName='Station 0', stationAddress='Road 0')
+    assert list(data) == list(slot) + ['stationName', 'stationAddress']
+
+    booked = record.with_availability('Booked').to_dict(STATIONS[0])
+    assert booked == dict(data, availability='Booked')
+    print("Slot record backend field tests passed")
+
+
+def test_index_misses_keep_the_turn_context():
+    """Slots missing from the index are looked up in the turn's context, deadline included"""
+    model, _ = make_model()
+    first = model.get_ai_response("page-4", "Show car slots in Bangalore", page_size=5)
+    index, model.slot_index = model.slot_index, type(model.slot_index)()
+    seen = []
+
+    def lookup(slot_id):
+        seen.append((current_turn() is not None, time_left() is not None))
+        return index.get(slot_id)
+    model._lookup_slot = lookup
+    second = model.get_ai_response("page-4", "", cursor=first['page']['next_cursor'])
+    assert len(second['data']) == 5
+    assert seen == [(True, True)] * 5, seen
+    print("Index miss context tests passed")
+
+
+if __name__ == "__main__":
+    test_slot_pages()
+    test_slot_references_across_pages()
+    test_slot_records()
+    test_slot_records_keep_backend_fields()
+    test_index_misses_keep_the_turn_context()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test script for the cached station directory (name, prefix and ID lookups)
+"""
+
+from station_directory import StationDirectory
+
+STATIONS = [
+    {'_id': 'a1', 'stationId': 'ST001', 'stationName': 'MG Road Parking', 'address': 'MG Road'},
+    {'_id': 'a2', 'stationId': 'ST002', 'stationName': 'Koramangala Hub', 'address': 'Koramangala'},
+    {'_id': 'a3', 'stationId': 'ST003', 'stationName': None, 'name': 'Unnamed', 'address': 'Nowhere'},
+    {'_id': 'a4', 'stationId': 'ST004', 'stationName': 'Mg Central', 'address': 'Central'},
+    {'_id': 'a5', 'stationId': 'ST005', 'stationName': 'koramangala hub', 'address': 'Duplicate'},
+]
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return [dict(s) for s in self.data]
+
+
+class FakeBackend:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, endpoint, path, **kwargs):
+        self.calls += 1
+        return FakeResponse(STATIONS)
+
+
+def linear_exact(name):
+    """Reference: the linear scan the directory replaces"""
+    return next((s for s in STATIONS if s.get('stationName') and isinstance(s['stationName'], str) and s['stationName'].lower() == name.lower()), None)
+
+
+def linear_prefix(prefix):
+    return next((s for s in STATIONS if s.get('stationName') and isinstance(s['stationName'], str) and s['stationName'].lower().startswith(prefix)), None)
+
+
+def test_station_directory():
+    """Directory lookups should match the linear scans and hit the backend once"""
+    backend = FakeBackend()
+    directory = StationDirectory(backend, ttl=60)
+
+    for name in ['mg road parking', 'KORAMANGALA HUB', 'mg central', 'unnamed', 'missing']:
+        expected = linear_exact(name)
+        actual = directory.find_by_name(name)
+        print(f"Exact '{name}': {actual and actual['stationId']}")
+        assert (actual and actual['stationId']) == (expected and expected['stationId'])
+
+    for prefix in ['mg', 'kor', 'koramangala', 'm', 'z', 'mg central x']:
+        expected = linear_prefix(prefix)
+        actual = directory.find_by_prefix(prefix)
+        print(f"Prefix '{prefix}': {actual and actual['stationId']}")
+        assert (actual and actual['stationId']) == (expected and expected['stationId'])
+
+    assert directory.get('ST004')['stationName'] == 'Mg Central'
+    assert directory.get('a2')['stationId'] == 'ST002'
+    assert directory.get('ST999') is None
+    assert len(directory.stations()) == len(STATIONS)
+    print(f"Backend calls: {backend.calls}")
+    assert backend.calls == 1
+
+    # Expired entries are reloaded
+    directory.ttl = 0
+    directory.find_by_name('mg road parking')
+    assert backend.calls == 2
+
+
+if __name__ == "__main__":
+    test_station_directory()
+    print("Station directory tests passed")
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Test script for the bundled tokenizer and stopwords used by preprocess_text
+"""
+
+from text_utils import STOP_WORDS, tokenize_words
+from ai_model import AIModel
+
+
+def test_tokenize_words():
+    """Word tokens match what nltk.word_tokenize returns for the same text"""
+    cases = {
+        "show slots in bangalore": ['show', 'slots', 'in', 'bangalore'],
+        "book slot 3. show stations": ['book', 'slot', '3.', 'show', 'stations'],
+        "i'm looking for parking. can you help?": ['i', "'m", 'looking', 'for', 'parking', 'can', 'you', 'help'],
+        "don't book it!!": ['do', "n't", 'book', 'it'],
+        "show slots @ mg road, bangalore.": ['show', 'slots', 'mg', 'road', 'bangalore'],
+        "book slot #5 for 2 hrs...": ['book', 'slot', '5', 'for', '2', 'hrs'],
+        "it's 10:30, 3,500 rs": ['it', "'s", '10:30', '3,500', 'rs'],
+        "cannot find parking": ['can', 'not', 'find', 'parking'],
+        "i wanna park (car)": ['i', 'wan', 'na', 'park', 'car'],
+        "drop-off at 15/12/2024": ['drop-off', 'at', '15/12/2024'],
+        "a. road": ['a.', 'road'],
+        "  \n": [],
+    }
+    for text, expected in cases.items():
+        tokens = tokenize_words(text)
+        print(f"{text!r} -> {tokens}")
+        assert tokens == expected, (text, tokens)
+
+    assert len(STOP_WORDS) == 179 and 'the' in STOP_WORDS and "don't" in STOP_WORDS
+
+    model = AIModel()
+    assert model.preprocess_text("Show me the available car slots in Bangalore!") == \
+        ['show', 'available', 'car', 'slots', 'bangalore']
+    print("Text utils tests passed")
+
+
+if __name__ == "__main__":
+    test_tokenize_words()
@@ -0,0 +1,87 @@
+import re
+from typing import List
+
+# NLTK's English stopword list (nltk_data corpora/stopwords/english), bundled so
+# startup needs neither the NLTK package nor a corpus download
+STOP_WORDS = frozenset("""
+i me my myself we our ours ourselves you you're you've you'll you'd your yours yourself
+yourselves he him his himself she she's her hers herself it it's its itself they them their
+theirs themselves what which who whom this that that'll these those am is are was were be
+been being have has had having do does did doing a an the and but if or because as until
+while of at by for with about against between into through during before after above below
+to from up down in out on off over under again further then once here there when where why
+how all any both each few more most other some such no nor not only own same so than too
+very s t can will just don don't should should've now d ll m o re ve y ain aren aren't
+couldn couldn't didn didn't doesn doesn't hadn hadn't hasn hasn't haven haven't isn isn't
+ma mightn mightn't mustn mustn't needn needn't shan shan't shouldn shouldn't wasn wasn't
+weren weren't won won't wouldn wouldn't
+""".split())
+
+# The splitting rules of NLTK's word_tokenize (Treebank tokenizer plus Punkt
+# sentence ends), reduced to what decides the word tokens. Punctuation is
+# replaced by spaces rather than kept as tokens.
+
+# A period that may end a sentence: followed by whitespace, by one of Punkt's
+# sentence-following characters, or only by closing brackets/quotes
+_PERIOD = re.compile(r"(?<=[^.])\.(?=[?!)\";}\]*:@'({\[]|(\s+\w)|\s|[\]\)}>\"'»”’]*$)")
+# Initials and numbers before a word ("a. road", "1. floor") don't end the sentence
+_INITIAL_OR_NUMBER = re.compile(r"(?:^|\s)(?:[^\W\d]|\d+)$")
+# An opening quote before a one-character word, e.g. 'a
+_OPENING_QUOTE = re.compile(r"(?i)(\')(?!re|ve|ll|m|t|s|d|n)(\w)\b")
+# ',' and ':' split off unless a digit follows (3,500 and 10:30 stay whole)
+_COMMA_COLON = re.compile(r"([:,])([^\d])")
+_FINAL_COMMA_COLON = re.compile(r"[:,]$")
+# Characters and sequences that are always split off
+_SEPARATORS = re.compile(r"""[«“‘„`»”’;@#$%&?!*()\[\]{}<>"]|''|\.{2,}|--""")
+# Closing quote and clitics at the end of a word: cars' don't she's we'll
+_CLOSING_QUOTE = re.compile(r"([^'])' ")
+_CLITICS = re.compile(r"([^' ])('[sS]|'[mM]|'[dD]|') ")
+_CLITICS_2 = re.compile(r"([^' ])('ll|'LL|'re|'RE|'ve|'VE|n't|N'T) ")
+# Words split in two: cannot gonna gotta gimme lemme wanna d'ye more'n 'tis 'twas
+_CONTRACTIONS = re.compile(
+    r"(?i)\b(can|d|gim|gon|got|lem|more)(not|'ye|me|na|ta|me|'n)\b|\b(wan)(na)(?=\s)"
+)
+_CONTRACTIONS_2 = re.compile(r"(?i) ('t)(is|was)\b")
+_CONTRACTION_PAIRS = {
+    ('can', 'not'), ('d', "'ye"), ('gim', 'me'), ('gon', 'na'), ('got', 'ta'), ('lem', 'me'), ('more', "'n"),
+}
+
+
+def _sentence_period(match: re.Match) -> str:
+    if match.group(1) and _INITIAL_OR_NUMBER.search(match.string, 0, match.start()):
+        return '.'
+    return ' '
+
+
+def _split_contraction(match: re.Match) -> str:
+    first, second = match.group(1), match.group(2)
+    if first is not None:
+        if (first.lower(), second.lower()) not in _CONTRACTION_PAIRS:
+            return match.group(0)
+    else:
+        first, second = match.group(3), match.group(4)
+    return f" {first} {second} "
+
+
+def tokenize_words(text: str) -> List[str]:
+    """
+    Split text into word tokens the way nltk.word_tokenize does, without NLTK.
+
+    Alphanumeric tokens come out the same as with word_tokenize, apart from
+    Punkt's abbreviation list (e.g. "st." before another sentence yields "st").
+    Punctuation-only tokens are not returned.
+    """
+    text = _PERIOD.sub(_sentence_period, text.strip())
+    if "'" in text:
+        text = _OPENING_QUOTE.sub(r"\1 \2", text)
+    text = _COMMA_COLON.sub(r" \2", text)
+    text = _FINAL_COMMA_COLON.sub(' ', text)
+    text = _SEPARATORS.sub(' ', text)
+    text = f" {text} "
+    if "'" in text:
+        text = _CLOSING_QUOTE.sub(r"\1 ' ", text)
+        text = _CLITICS.sub(r"\1 \2 ", text)
+        text = _CLITICS_2.sub(r"\1 \2 ", text)
+    text = _CONTRACTIONS.sub(_split_contraction, text)
+    text = _CONTRACTIONS_2.sub(r" \1 \2 ", text)
+    return text.split()
@@ -0,0 +1,102 @@
+from contextlib import contextmanager
+import contextvars
+import copy
+import logging
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from metrics import DEGRADED_TURNS
+
+
+class TurnContext:
+    """
+    State of the chat turn being processed, visible to all code that runs for it,
+    including fan-out tasks started in a copy of the caller's context.
+
+    `sink` receives progress events (name, payload) while the turn runs,
+    e.g. to stream them to the client. `page_size` is the slot listing page
+    size the client asked for, if any. `branch` names the code path that
+    answered the turn, for metrics. `profile` collects the turn's timing
+    breakdown when the client asked for one. `deadline` is the
+    time.monotonic() time by which the turn should be answered, and
+    `degraded` a note for the user when the answer is missing data.
+    """
+    def __init__(self, sink: Optional[Callable[[str, Dict[str, Any]], None]] = None):
+        self.sink = sink
+        self.page_size: Optional[int] = None
+        self.branch: Optional[str] = None
+        self.profile: Optional[Any] = None
+        self.deadline: Optional[float] = None
+        self.degraded: Optional[str] = None
+
+    def emit(self, event: str, data: Dict[str, Any]) -> None:
+        if self.sink is None:
+            return
+        try:
+            self.sink(event, data)
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Dropped '{event}' event: {e}")
+
+
+_current_turn: contextvars.ContextVar[Optional[TurnContext]] = contextvars.ContextVar('current_turn', default=None)
+
+
+def current_turn() -> Optional[TurnContext]:
+    """The turn the current context belongs to, if any."""
+    return _current_turn.get()
+
+
+@contextmanager
+def turn_scope(turn: TurnContext) -> Iterator[TurnContext]:
+    """Make `turn` the current turn inside this block."""
+    token = _current_turn.set(turn)
+    try:
+        yield turn
+    finally:
+        _current_turn.reset(token)
+
+
+def emit(event: str, data: Dict[str, Any]) -> None:
+    """Send a progress event to the current turn's sink, if anyone is listening."""
+    turn = _current_turn.get()
+    if turn is not None:
+        turn.emit(event, data)
+
+
+def mark_branch(branch: str) -> None:
+    """Record which code path is answering the current turn."""
+    turn = _current_turn.get()
+    if turn is not None:
+        turn.branch = branch
+
+
+def time_left() -> Optional[float]:
+    """Seconds until the current turn's deadline (negative once it has passed), or None."""
+    turn = _current_turn.get()
+    if turn is None or turn.deadline is None:
+        return None
+    return turn.deadline - time.monotonic()
+
+
+@contextmanager
+def without_deadline() -> Iterator[None]:
+    """
+    Run the block for the current turn but free of its deadline, for work
+    that other turns share (its profile and event sink still apply).
+    """
+    turn = _current_turn.get()
+    if turn is None or turn.deadline is None:
+        yield
+        return
+    detached = copy.copy(turn)
+    detached.deadline = None
+    with turn_scope(detached):
+        yield
+
+
+def degrade(reason: str, note: str) -> None:
+    """Record that the current turn is answered with partial data; `note` is appended to its reply."""
+    turn = _current_turn.get()
+    if turn is not None:
+        turn.degraded = note
+    DEGRADED_TURNS.inc(reason=reason)
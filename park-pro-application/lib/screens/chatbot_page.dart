@@ -362,6 +362,14 @@ class _ChatbotPageState extends State<ChatbotPage> {
 
       if (response.statusCode == 200) {
         final data = jsonDecode(response.body);
+
+        // The AI service hints how long to show the "thinking" indicator
+        // instead of sleeping on its request thread
+        final typingDelayMs = data['typing_delay_ms'];
+        if (typingDelayMs is int && typingDelayMs > 0) {
+          await Future.delayed(Duration(milliseconds: typingDelayMs));
+        }
+
         final botResponse =
             data['response'] ?? 'Sorry, I couldn\'t understand that.';
         final action = data['action'];